@@ -37,6 +37,7 @@ import java.io.InputStream;
 import java.io.InputStreamReader;
 import java.net.HttpURLConnection;
 import java.net.URL;
+import java.net.URLEncoder;
 import java.util.ArrayList;
 import java.util.List;
 
@@ -44,6 +45,10 @@ public class MainActivity extends AppCompatActivity {
     private static final int PICK_IMAGE = 1;
     private static final String CACHE_FILE_NAME = "blog_posts_cache.json";
     private static final String IMAGE_CACHE_DIR = "blog_images";
+    private static final String POST_LIST_FIELDS =
+            "id,author,title,text,created_date,published_date,image,image_derivatives,video";
+    private static final String SYNC_PREFS = "blog_sync";
+    private static final String PREF_NEXT_SINCE = "next_since";
 
     TextView textView;
     String site_url = "https://namujigi.pythonanywhere.com"; // "http://10.0.2.2:8000";
@@ -86,8 +91,10 @@ public class MainActivity extends AppCompatActivity {
         if (taskDownload != null && taskDownload.getStatus() == AsyncTask.Status.RUNNING) {
             taskDownload.cancel(true);
         }
-        taskDownload = new CloadPosts();
-        taskDownload.execute(site_url + "/api_root/Post/");
+        // 이전 동기화 워터마크가 있으면 그 이후 변경분만 받음
+        String since = getSharedPreferences(SYNC_PREFS, MODE_PRIVATE).getString(PREF_NEXT_SINCE, null);
+        taskDownload = new CloadPosts(since);
+        taskDownload.execute();
         Toast.makeText(getApplicationContext(), "동기화 중...", Toast.LENGTH_LONG).show();
     }
 
@@ -103,8 +110,8 @@ public class MainActivity extends AppCompatActivity {
         }
     }
 
-    // 캐시에서 로드
-    private void loadFromCache() {
+    // 캐시 파일 읽기 (없으면 null)
+    private JSONArray readCache() {
         try {
             FileInputStream fis = openFileInput(CACHE_FILE_NAME);
             InputStreamReader isr = new InputStreamReader(fis);
@@ -115,13 +122,19 @@ public class MainActivity extends AppCompatActivity {
                 sb.append(line);
             }
             br.close();
-
-            if (sb.length() > 0) {
-                JSONArray cachedData = new JSONArray(sb.toString());
-                displayPosts(cachedData);
-                textView.setText("캐시에서 " + cachedData.length() + "개의 게시글을 불러왔습니다.");
-            }
+            return sb.length() > 0 ? new JSONArray(sb.toString()) : null;
         } catch (IOException | JSONException e) {
+            return null;
+        }
+    }
+
+    // 캐시에서 로드
+    private void loadFromCache() {
+        JSONArray cachedData = readCache();
+        if (cachedData != null) {
+            displayPosts(cachedData);
+            textView.setText("캐시에서 " + cachedData.length() + "개의 게시글을 불러왔습니다.");
+        } else {
             textView.setText("저장된 데이터가 없습니다. 동기화 버튼을 눌러주세요.");
         }
     }
@@ -185,60 +198,152 @@ public class MainActivity extends AppCompatActivity {
         }
     }
 
-    private class CloadPosts extends AsyncTask<String, Void, JSONArray> {
-        @Override
-        protected JSONArray doInBackground(String... urls) {
+    private class CloadPosts extends AsyncTask<Void, Void, JSONArray> {
+        private final String since;
+        private String nextSince;
+        private int changedCount;
+
+        CloadPosts(String since) {
+            this.since = since;
+        }
+
+        // GET 요청 후 JSON 응답 반환 (200이 아니면 null)
+        private JSONObject getJson(String apiUrl) throws IOException, JSONException {
+            URL urlAPI = new URL(apiUrl);
+            HttpURLConnection conn = (HttpURLConnection) urlAPI.openConnection();
             try {
-                String apiUrl = urls[0];
-                URL urlAPI = new URL(apiUrl);
-                HttpURLConnection conn = (HttpURLConnection) urlAPI.openConnection();
                 conn.setRequestProperty("Authorization", "Token " + token);
                 conn.setRequestMethod("GET");
                 conn.setConnectTimeout(5000);
                 conn.setReadTimeout(5000);
 
-                int responseCode = conn.getResponseCode();
-                if (responseCode == HttpURLConnection.HTTP_OK) {
-                    InputStream is = conn.getInputStream();
-                    BufferedReader reader = new BufferedReader(new InputStreamReader(is));
-                    StringBuilder result = new StringBuilder();
-                    String line;
-                    while ((line = reader.readLine()) != null) {
-                        result.append(line);
+                if (conn.getResponseCode() != HttpURLConnection.HTTP_OK) {
+                    return null;
+                }
+                InputStream is = conn.getInputStream();
+                BufferedReader reader = new BufferedReader(new InputStreamReader(is));
+                StringBuilder result = new StringBuilder();
+                String line;
+                while ((line = reader.readLine()) != null) {
+                    result.append(line);
+                }
+                is.close();
+                return new JSONObject(result.toString());
+            } finally {
+                conn.disconnect();
+            }
+        }
+
+        private String syncUrl(String since) throws IOException {
+            String url = site_url + "/api_root/Post/sync/?fields=" + POST_LIST_FIELDS;
+            if (since != null) {
+                url += "&since=" + URLEncoder.encode(since, "UTF-8");
+            }
+            return url;
+        }
+
+        // 목록 썸네일 다운로드 및 저장
+        private void downloadImages(JSONArray aryJson) throws JSONException {
+            for (int i = 0; i < aryJson.length(); i++) {
+                JSONObject postJson = aryJson.getJSONObject(i);
+                String imageUrl = postJson.optString("image", "");
+
+                if (imageUrl != null && !imageUrl.isEmpty() && !imageUrl.equals("null")) {
+                    try {
+                        // 목록에는 서버가 만든 썸네일(WebP)만 받음, 없으면 원본
+                        String downloadUrl = imageUrl;
+                        JSONObject derivatives = postJson.optJSONObject("image_derivatives");
+                        if (derivatives != null && derivatives.optJSONObject("thumb") != null) {
+                            downloadUrl = derivatives.getJSONObject("thumb").optString("webp", imageUrl);
+                        }
+                        URL myImageUrl = new URL(downloadUrl);
+                        HttpURLConnection imgConn = (HttpURLConnection) myImageUrl.openConnection();
+                        InputStream imgStream = imgConn.getInputStream();
+                        Bitmap imageBitmap = BitmapFactory.decodeStream(imgStream);
+                        imgStream.close();
+
+                        // 이미지 파일명 추출 및 저장
+                        String imageFileName = imageUrl.substring(imageUrl.lastIndexOf("/") + 1);
+                        saveImageToLocal(imageBitmap, imageFileName);
+
+                    } catch (Exception e) {
+                        e.printStackTrace();
                     }
-                    is.close();
-
-                    // Django REST Framework 페이지네이션 처리
-                    JSONObject responseObj = new JSONObject(result.toString());
-                    JSONArray aryJson = responseObj.getJSONArray("results");
-
-                    // 이미지 다운로드 및 저장
-                    for (int i = 0; i < aryJson.length(); i++) {
-                        JSONObject postJson = aryJson.getJSONObject(i);
-                        String imageUrl = postJson.optString("image", "");
-
-                        if (imageUrl != null && !imageUrl.isEmpty() && !imageUrl.equals("null")) {
-                            try {
-                                URL myImageUrl = new URL(imageUrl);
-                                HttpURLConnection imgConn = (HttpURLConnection) myImageUrl.openConnection();
-                                InputStream imgStream = imgConn.getInputStream();
-                                Bitmap imageBitmap = BitmapFactory.decodeStream(imgStream);
-                                imgStream.close();
-
-                                // 이미지 파일명 추출 및 저장
-                                String imageFileName = imageUrl.substring(imageUrl.lastIndexOf("/") + 1);
-                                saveImageToLocal(imageBitmap, imageFileName);
-
-                            } catch (Exception e) {
-                                e.printStackTrace();
-                            }
+                }
+            }
+        }
+
+        // 캐시 목록에 변경분 반영 (수정된 게시글은 제자리 교체, 새 게시글은 맨 앞, 삭제된 게시글 제거)
+        private JSONArray merge(JSONArray cached, JSONArray changed, JSONArray deleted) throws JSONException {
+            List<JSONObject> posts = new ArrayList<>();
+            for (int i = 0; i < cached.length(); i++) {
+                posts.add(cached.getJSONObject(i));
+            }
+            for (int i = 0; i < changed.length(); i++) {
+                JSONObject post = changed.getJSONObject(i);
+                int index = indexOf(posts, post.optLong("id"));
+                if (index >= 0) {
+                    posts.set(index, post);
+                } else {
+                    posts.add(0, post);
+                }
+            }
+            for (int i = 0; i < deleted.length(); i++) {
+                int index = indexOf(posts, deleted.getLong(i));
+                if (index >= 0) {
+                    posts.remove(index);
+                }
+            }
+            return new JSONArray(posts);
+        }
+
+        private int indexOf(List<JSONObject> posts, long id) {
+            for (int i = 0; i < posts.size(); i++) {
+                if (posts.get(i).optLong("id") == id) {
+                    return i;
+                }
+            }
+            return -1;
+        }
+
+        @Override
+        protected JSONArray doInBackground(Void... params) {
+            try {
+                // 1. 증분 동기화: 워터마크 이후 변경분만 (has_more면 이어서 요청)
+                JSONArray cached = readCache();
+                if (since != null && cached != null) {
+                    String cursor = since;
+                    JSONArray merged = cached;
+                    while (true) {
+                        JSONObject sync = getJson(syncUrl(cursor));
+                        if (sync == null || sync.optBoolean("reset")) {
+                            break;
+                        }
+                        JSONArray changed = sync.getJSONArray("posts");
+                        downloadImages(changed);
+                        merged = merge(merged, changed, sync.getJSONArray("deleted"));
+                        changedCount += changed.length() + sync.getJSONArray("deleted").length();
+                        cursor = sync.getString("next_since");
+                        if (!sync.optBoolean("has_more")) {
+                            nextSince = cursor;
+                            return merged;
                         }
                     }
+                }
 
-                    conn.disconnect();
-                    return aryJson;
+                // 2. 전체 동기화: 워터마크를 먼저 받은 뒤 목록 다운로드 (그 사이 변경분은 다음 증분 동기화에서 받음)
+                JSONObject start = getJson(syncUrl(null));
+                // 목록 기본 응답은 경량 표현이므로 화면에 쓰는 필드만 지정해서 요청
+                JSONObject responseObj = getJson(site_url + "/api_root/Post/?fields=" + POST_LIST_FIELDS);
+                if (responseObj == null) {
+                    return null;
                 }
-                conn.disconnect();
+                // Django REST Framework 페이지네이션 처리
+                JSONArray aryJson = responseObj.getJSONArray("results");
+                downloadImages(aryJson);
+                nextSince = start != null ? start.optString("next_since", null) : null;
+                changedCount = aryJson.length();
+                return aryJson;
             } catch (IOException | JSONException e) {
                 e.printStackTrace();
             }
@@ -250,9 +355,13 @@ public class MainActivity extends AppCompatActivity {
             if (result == null || result.length() == 0) {
                 textView.setText("불러올 게시글이 없습니다.");
             } else {
-                textView.setText(result.length() + "개의 게시글을 동기화했습니다.");
+                textView.setText(changedCount + "개의 변경 사항을 동기화했습니다. (전체 " + result.length() + "개)");
                 saveToCache(result);
                 displayPosts(result);
+                // 캐시와 함께 저장해야 다음 증분 동기화가 캐시 기준으로 맞음
+                getSharedPreferences(SYNC_PREFS, MODE_PRIVATE).edit()
+                        .putString(PREF_NEXT_SINCE, nextSince)
+                        .apply();
             }
         }
     }
@@ -2,8 +2,12 @@
 Django REST API 통신 모듈
 """
 
+import hashlib
+import json
+import os
 import requests
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -19,10 +23,17 @@ class DjangoAPIClient:
         self.api_endpoint = config.API_ENDPOINT
         self.author_id = config.AUTHOR_ID
         self.api_token = getattr(config, 'API_TOKEN', '')  # 토큰 가져오기
+        # 업로드를 시도한 파일 (경로, 크기, 수정 시각), 최근 ATTEMPTED_MEDIA_LIMIT개
+        # 같은 파일을 다시 보낼 때(재전송)만 서버 보유 여부를 먼저 확인하고, 새 파일은 해시/HEAD 없이 바로 업로드
+        self.attempted_media = OrderedDict()
+
+    # 재전송 판단에 기억하는 최근 업로드 파일 수
+    ATTEMPTED_MEDIA_LIMIT = 256
 
     def create_fall_post(self, title: str, description: str,
                         image_path: Optional[str] = None,
-                        video_path: Optional[str] = None) -> bool:
+                        video_path: Optional[str] = None,
+                        fall_event: Optional[dict] = None) -> bool:
         """
         낙상 감지 게시글 생성
 
@@ -31,6 +42,7 @@ class DjangoAPIClient:
             description: 게시글 내용
             image_path: 이미지 파일 경로 (선택)
             video_path: 비디오 파일 경로 (선택)
+            fall_event: 구조화된 낙상 분석 결과 (선택, 서버 FallEvent로 저장)
 
         Returns:
             성공 여부
@@ -43,13 +55,9 @@ class DjangoAPIClient:
                 'text': description,
                 'published_date': datetime.now().isoformat()
             }
-
-            files = {}
-            if image_path and Path(image_path).exists():
-                files['image'] = open(image_path, 'rb')
-
-            if video_path and Path(video_path).exists():
-                files['video'] = open(video_path, 'rb')
+            if fall_event:
+                # multipart 요청이므로 JSON 문자열로 전송 (서버 PostSerializer.fall_event)
+                data['fall_event'] = json.dumps(fall_event)
 
             # 인증 헤더 준비
             headers = {}
@@ -57,9 +65,22 @@ class DjangoAPIClient:
                 headers['Authorization'] = f'Token {self.api_token}'
                 logger.debug("Using token authentication")
 
+            # 재전송하는 파일이 서버에 이미 있으면(이전 요청이 응답 전에 끊긴 경우 등) 내용 대신 SHA-256만 전송
+            files = {}
+            for field, path in (('image', image_path), ('video', video_path)):
+                if not path or not Path(path).exists():
+                    continue
+                if self.is_resend(path):
+                    digest = self.file_sha256(path)
+                    if self.server_has_media(digest, headers):
+                        logger.info(f"Server already has {path}, sending hash only")
+                        data[f'{field}_sha256'] = digest
+                        continue
+                files[field] = open(path, 'rb')
+
             # POST 요청
             logger.info(f"Sending POST request to {self.api_endpoint}")
-            if video_path:
+            if 'video' in files:
                 logger.info(f"Uploading video: {video_path}")
             response = requests.post(
                 self.api_endpoint,
@@ -96,6 +117,36 @@ class DjangoAPIClient:
             logger.error(f"Error creating post: {e}")
             return False
 
+    def is_resend(self, path: str) -> bool:
+        """이전에 업로드를 시도한 같은 파일이면 True (처음 보는 파일은 기록만 하고 False)"""
+        stat = os.stat(path)
+        key = (str(Path(path)), stat.st_size, stat.st_mtime_ns)
+        if key in self.attempted_media:
+            self.attempted_media.move_to_end(key)
+            return True
+        self.attempted_media[key] = True
+        while len(self.attempted_media) > self.ATTEMPTED_MEDIA_LIMIT:
+            self.attempted_media.popitem(last=False)
+        return False
+
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        """파일 SHA-256 (청크 단위로 읽음)"""
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def server_has_media(self, digest: str, headers: dict) -> bool:
+        """HEAD api_root/Media/<sha256>/ 로 서버 보유 여부 확인 (확인 실패 시 False → 파일 전송)"""
+        try:
+            response = requests.head(f"{self.config.MEDIA_ENDPOINT}{digest}/", headers=headers, timeout=5)
+            return response.status_code == 200
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Media preflight failed: {e}")
+            return False
+
     def create_fall_alert(self, fall_info: dict, image_path: Optional[str] = None,
                          video_path: Optional[str] = None) -> bool:
         """
@@ -144,7 +195,83 @@ class DjangoAPIClient:
         즉시 확인이 필요합니다!
         """
 
-        return self.create_fall_post(title, description.strip(), image_path, video_path)
+        return self.create_fall_post(title, description.strip(), image_path, video_path,
+                                     fall_event=self.build_fall_event(fall_info))
+
+    def build_fall_event(self, fall_info: dict) -> dict:
+        """
+        fall_info를 서버 FallEvent 필드 형식으로 변환
+
+        Args:
+            fall_info: 낙상 정보 딕셔너리
+
+        Returns:
+            FallEvent 생성용 딕셔너리
+        """
+        analysis = fall_info['analysis']
+        details = analysis.get('details', analysis)
+
+        fall_event = {
+            'camera_id': str(getattr(self.config, 'CAMERA_ID', 'default')),
+            'detected_at': fall_info['timestamp'].astimezone().isoformat(),
+            'fall_score': round(float(analysis['fall_score']), 4),
+            'confidence': round(float(fall_info.get('confidence', 0.0)), 4),
+            'reason': analysis.get('reason', '')[:255],
+        }
+
+        for field, key in (('aspect_ratio', 'bbox_aspect_ratio'),
+                           ('body_angle', 'body_angle'),
+                           ('head_height_ratio', 'head_height_ratio'),
+                           ('horizontal_ratio', 'horizontal_ratio'),
+                           ('aspect_ratio_delta', 'aspect_ratio_delta'),
+                           ('aspect_score', 'aspect_score'),
+                           ('position_score', 'position_score'),
+                           ('horizontal_score', 'horizontal_score'),
+                           ('angle_score', 'angle_score'),
+                           ('sudden_change_score', 'sudden_change_score')):
+            fall_event[field] = round(float(details.get(key, 0.0)), 4)
+
+        if fall_info.get('bbox') is not None:
+            fall_event['bbox'] = [int(v) for v in fall_info['bbox']]
+
+        keypoints = fall_info.get('keypoints')
+        if keypoints is not None:
+            fall_event['keypoints'] = [[round(float(v), 2) for v in point[:3]] for point in keypoints]
+
+        return fall_event
+
+    def send_telemetry(self, device_id: str, samples: list) -> bool:
+        """
+        텔레메트리 샘플 배치 전송
+
+        Args:
+            device_id: 장치 식별자
+            samples: 샘플 딕셔너리 리스트
+
+        Returns:
+            성공 여부
+        """
+        headers = {}
+        if self.api_token:
+            headers['Authorization'] = f'Token {self.api_token}'
+
+        try:
+            response = requests.post(
+                self.config.TELEMETRY_ENDPOINT,
+                json={'device_id': device_id, 'samples': samples},
+                headers=headers,
+                timeout=10
+            )
+            if response.status_code in [200, 201]:
+                logger.debug(f"Telemetry sent: {len(samples)} samples")
+                return True
+            logger.warning(f"Failed to send telemetry. Status: {response.status_code}, "
+                           f"Response: {response.text[:200]}")
+            return False
+
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Telemetry upload failed: {e}")
+            return False
 
     def test_connection(self) -> bool:
         """API 연결 테스트"""
@@ -0,0 +1,641 @@
+"""
+낙상 감지 파이프라인 오프라인 벤치마크
+
+녹화된 영상(FallDetector 전체 파이프라인), 키포인트 녹화(keypoint_recording.py) 또는
+합성 키포인트 시퀀스(PoseAnalyzer + 상태 머신, OpenCV/torch 불필요)를 최대 속도로 재생하여 처리량, 단계별 지연 백분위수, 최대 메모리와
+라벨 파일 대비 낙상 정밀도/재현율/감지 소요 시간을 JSON으로 출력
+
+사용법:
+    python benchmark.py --video clips/*.mp4 --annotations labels.json --output result.json
+    python benchmark.py --synthetic 20 --output result.json
+    python benchmark.py --synthetic 20 --baseline previous.json
+    python benchmark.py --synthetic 20 --render --baseline headless.json   # 창 모드 화면 처리 비용 비교
+    python benchmark.py --keypoints recordings/ --output result.json
+    python benchmark.py --synthetic 200 --export-keypoints fixtures/
+    python benchmark.py --video clips/*.mp4 --compare-roi --output roi.json
+
+라벨 파일 형식 (시각은 클립 시작 기준 초):
+    {"clips": {"fall_01.mp4": [{"start": 3.2, "end": 8.0}], "walk_02.mp4": []}}
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import config
+from fall_state import FallDecisionPipeline
+from keypoint_recording import KeypointRecorder, find_recordings
+from metrics import REGISTRY, Histogram
+from temporal_window import bbox_iou
+
+logger = logging.getLogger(__name__)
+
+
+# ========== 합성 키포인트 시퀀스 ==========
+
+# 서 있는 자세의 키포인트 위치: (좌우 오프셋, 발에서부터의 높이) / 키 비율 (COCO 순서)
+STANDING_POSE = np.array([
+    [0.00, 0.95], [-0.03, 0.97], [0.03, 0.97], [-0.06, 0.95], [0.06, 0.95],  # 머리
+    [-0.12, 0.82], [0.12, 0.82],  # 어깨
+    [-0.16, 0.64], [0.16, 0.64],  # 팔꿈치
+    [-0.17, 0.48], [0.17, 0.48],  # 손목
+    [-0.08, 0.52], [0.08, 0.52],  # 엉덩이
+    [-0.08, 0.28], [0.08, 0.28],  # 무릎
+    [-0.08, 0.03], [0.08, 0.03],  # 발목
+])
+
+
+def synthetic_pose(center_x: float, floor_y: float, height: float, angle_deg: float,
+                   rng: np.random.Generator, noise: float = 2.0) -> dict:
+    """
+    발목을 축으로 angle_deg 만큼 기울어진 사람의 감지 결과 생성
+
+    Returns:
+        {'bbox': (x1,y1,x2,y2), 'keypoints': (17,3), 'conf': float}
+    """
+    theta = np.radians(angle_deg)
+    offsets = STANDING_POSE * height
+    # 세로 성분을 옆으로 눕힘 (x: 오른쪽, y: 화면 아래 방향)
+    x = center_x + offsets[:, 0] * np.cos(theta) + offsets[:, 1] * np.sin(theta)
+    y = floor_y - offsets[:, 1] * np.cos(theta) + offsets[:, 0] * np.sin(theta)
+    keypoints = np.empty((17, 3), dtype=np.float32)
+    keypoints[:, 0] = x + rng.normal(0, noise, 17)
+    keypoints[:, 1] = y + rng.normal(0, noise, 17)
+    keypoints[:, 2] = rng.uniform(0.75, 0.98, 17)
+
+    margin = height * 0.05
+    bbox = (int(keypoints[:, 0].min() - margin), int(keypoints[:, 1].min() - margin),
+            int(keypoints[:, 0].max() + margin), int(keypoints[:, 1].max() + margin))
+    return {'bbox': bbox, 'keypoints': keypoints, 'conf': float(rng.uniform(0.7, 0.95))}
+
+
+def generate_synthetic_clip(seed: int, fps: float = 30.0, duration: float = 20.0,
+                            frame_height: int = 480) -> dict:
+    """
+    합성 클립 1개 생성: 걷기 + (선택) 허리 숙이기 + (선택) 낙상 후 누워 있기
+
+    같은 seed는 fps와 무관하게 같은 시나리오(사건 시각)를 만들므로
+    프레임레이트만 다른 재생 결과를 비교할 수 있음
+
+    Returns:
+        {'name', 'fps', 'frame_height', 'frames': [(timestamp, detections)], 'events': [{'start', 'end'}]}
+    """
+    scenario = np.random.default_rng(seed)
+    has_fall = scenario.random() < 0.7
+    has_bend = scenario.random() < 0.5
+    height = scenario.uniform(220, 320)
+    floor_y = frame_height - scenario.uniform(20, 60)
+    speed = scenario.uniform(-30, 30)  # px/s
+    start_x = scenario.uniform(200, 440)
+
+    fall_start = scenario.uniform(4.0, duration - 10.0) if has_fall else None
+    fall_time = scenario.uniform(0.4, 0.9)  # 넘어지는 데 걸리는 시간
+    lying_time = scenario.uniform(4.0, 8.0)
+    bend_start = scenario.uniform(1.0, 3.0) if has_bend else None
+    bend_time = 1.5
+
+    noise = np.random.default_rng(seed + 1_000_003)
+    frames = []
+    for index in range(int(duration * fps)):
+        t = index / fps
+        angle = 0.0
+        if bend_start is not None and bend_start <= t < bend_start + bend_time:
+            # 허리 숙이기: 최대 40도까지 기울었다 돌아옴 (낙상 아님)
+            angle = 40.0 * np.sin(np.pi * (t - bend_start) / bend_time)
+        if fall_start is not None and t >= fall_start:
+            elapsed = t - fall_start
+            if elapsed < fall_time:
+                angle = 90.0 * elapsed / fall_time
+            elif elapsed < fall_time + lying_time:
+                angle = 90.0
+            elif elapsed < fall_time + lying_time + 2.0:
+                angle = 90.0 * (1 - (elapsed - fall_time - lying_time) / 2.0)  # 일어남
+
+        center_x = start_x + speed * t
+        frames.append((t, [synthetic_pose(center_x, floor_y, height, angle, noise)]))
+
+    events = []
+    if fall_start is not None:
+        events.append({'start': round(fall_start, 3), 'end': round(fall_start + fall_time + lying_time, 3)})
+
+    return {'name': f'synthetic_{seed:04d}', 'fps': fps, 'frame_height': frame_height,
+            'frames': frames, 'events': events}
+
+
+# ========== 실행 ==========
+
+def replay(frames, frame_height: int, timer=None, params: Optional[dict] = None,
+           renderer=None) -> List[float]:
+    """
+    (timestamp, detections, skipped) 시퀀스를 PoseAnalyzer + 상태 머신으로 재생
+
+    skipped 프레임(녹화 당시 쿨다운으로 추론하지 않음)은 현재 파라미터로도 쿨다운이면 그대로 건너뛰고,
+    아니면 감지 결과가 없으므로 사람이 없는 프레임으로 처리
+
+    Args:
+        params: 판정 파라미터 (없으면 config.FALL_DETECTION_PARAMS)
+        renderer: 프레임마다 renderer(state, analyzed) 호출 (창 모드 화면 처리 비용 측정, WindowRenderer)
+
+    Returns:
+        낙상 확정 시각 목록
+    """
+    pipeline = FallDecisionPipeline(params or config.FALL_DETECTION_PARAMS)
+    detections_at = []
+    for timestamp, detections, skipped in frames:
+        if pipeline.state.in_cooldown(timestamp):
+            if renderer is not None:
+                renderer(pipeline.state, [])
+            continue
+        if timer is not None:
+            with timer:
+                analyzed, confirmed = pipeline.process(detections, frame_height, timestamp)
+        else:
+            analyzed, confirmed = pipeline.process(detections, frame_height, timestamp)
+        if renderer is not None:
+            renderer(pipeline.state, analyzed)
+        if confirmed is not None:
+            detections_at.append(timestamp)
+    return detections_at
+
+
+class WindowRenderer:
+    """
+    창 모드(main.py, HEADLESS=false)의 프레임당 화면 처리 재현 (합성 재생용, 모델 불필요)
+        - draw:   빈 프레임에 감지 결과/낙상 상태 오버레이 + FPS/시스템 정보 텍스트
+        - imshow: cv2.imshow + waitKey(1) (화면이 없거나 GUI 없는 OpenCV 빌드면 제외하고 경고)
+    같은 클립을 --render 없이 재생한 결과(headless)와 처리량을 비교
+    """
+
+    def __init__(self, frame_height: int, frame_width: int = 640):
+        import cv2
+        from fall_detector import draw_detection
+
+        self.cv2 = cv2
+        self.draw_detection = draw_detection
+        self.background = np.full((frame_height, frame_width, 3), 64, dtype=np.uint8)
+        self.frame = np.empty_like(self.background)
+        self.draw_timer = REGISTRY.stage_timer('draw')
+        self.imshow_timer = REGISTRY.stage_timer('imshow')
+        self.display = self.display_available(cv2)
+
+    @staticmethod
+    def display_available(cv2) -> bool:
+        if sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+            logger.warning("No display: measuring overlay drawing only (imshow/waitKey excluded)")
+            return False
+        try:
+            cv2.namedWindow('benchmark')
+        except cv2.error:
+            logger.warning("OpenCV has no GUI support: measuring overlay drawing only (imshow/waitKey excluded)")
+            return False
+        return True
+
+    def __call__(self, state, analyzed):
+        cv2 = self.cv2
+        with self.draw_timer:
+            # 캡처 프레임 대신 배경 복사 (카메라가 매번 새 프레임을 주는 것과 같은 메모리 쓰기)
+            np.copyto(self.frame, self.background)
+            frame = self.frame
+            for detection, analysis in analyzed:
+                frame = self.draw_detection(frame, detection['bbox'], detection['keypoints'],
+                                            detection['conf'], analysis, config)
+            if state.cooldown_until is not None:
+                cv2.putText(frame, state.cooldown_text(), (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            elif state.is_suspicious:
+                cv2.putText(frame, state.suspicion_text(), (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+            bottom = frame.shape[0]
+            cv2.putText(frame, "FPS: 30.0", (10, bottom - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            cv2.putText(frame, f"benchmark - {datetime.now():%H:%M:%S}", (10, bottom - 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            cv2.putText(frame, "Detections: 0 | Falls: 0", (10, bottom - 70),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        if self.display:
+            with self.imshow_timer:
+                cv2.imshow('benchmark', frame)
+                cv2.waitKey(1)
+
+
+def run_synthetic(count: int, fps: float, seed: int, render: bool = False) -> List[dict]:
+    """합성 시퀀스를 PoseAnalyzer + 상태 머신으로 재생 (모델 없음, render=True면 창 모드 화면 처리 포함)"""
+    analyze_timer = REGISTRY.stage_timer('analyze')
+    clips = []
+    renderer = None
+    for offset in range(count):
+        clip = generate_synthetic_clip(seed + offset, fps=fps)
+        frames = [(timestamp, detections, False) for timestamp, detections in clip['frames']]
+        if render and renderer is None:
+            renderer = WindowRenderer(clip['frame_height'], config.CAMERA_WIDTH)
+
+        start = time.perf_counter()
+        detections_at = replay(frames, clip['frame_height'], analyze_timer, renderer=renderer)
+        elapsed = time.perf_counter() - start
+
+        clips.append({'name': clip['name'], 'frames': len(clip['frames']), 'fps': fps,
+                      'wall_seconds': elapsed, 'detections': detections_at, 'events': clip['events']})
+    return clips
+
+
+def run_keypoints(paths: List[str], timed: bool) -> List[dict]:
+    """
+    키포인트 녹화를 PoseAnalyzer + 상태 머신으로 재생 (모델/화면 처리 없음)
+    timed=False 이면 프레임별 타이머도 생략하여 최대 처리량으로 재생
+    """
+    analyze_timer = REGISTRY.stage_timer('analyze') if timed else None
+    clips = []
+    for recording in find_recordings(paths):
+        frames = 0
+
+        def counted(source):
+            nonlocal frames
+            for frame in source:
+                frames += 1
+                yield frame
+
+        # 읽기(세그먼트 로드) 시간도 처리량에 포함
+        start = time.perf_counter()
+        detections_at = replay(counted(recording.frames()), recording.frame_height, analyze_timer)
+        elapsed = time.perf_counter() - start
+
+        clips.append({'name': recording.name, 'frames': frames, 'fps': recording.fps,
+                      'wall_seconds': elapsed, 'detections': detections_at, 'events': recording.events})
+        logger.info(f"{recording.name}: {frames} frames in {elapsed:.2f}s "
+                    f"({frames / max(elapsed, 1e-9):.0f} fps), {len(detections_at)} falls")
+    return clips
+
+
+def export_synthetic(count: int, fps: float, seed: int, directory: str):
+    """합성 클립을 키포인트 녹화 포맷으로 저장 (회귀 테스트용 고정 데이터)"""
+    for offset in range(count):
+        clip = generate_synthetic_clip(seed + offset, fps=fps)
+        recorder = KeypointRecorder(Path(directory) / clip['name'], fps=fps,
+                                    frame_height=clip['frame_height'], max_persons=1,
+                                    segment_frames=len(clip['frames']))
+        for timestamp, detections in clip['frames']:
+            recorder.add(timestamp, detections)
+        for event in clip['events']:
+            recorder.add_event(event['start'], event['end'])
+        recorder.close()
+
+
+def run_video(paths: List[str], render: bool) -> List[dict]:
+    """녹화 영상을 FallDetector 전체 파이프라인(추론 포함)으로 재생"""
+    import cv2
+    from fall_detector import FallDetector
+
+    config.DEBUG_MODE = render
+    config.HEADLESS = not render
+    frame_latency = REGISTRY.histogram('stage_latency_seconds', stage='frame_total')
+
+    clips = []
+    for path in paths:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            logger.error(f"Cannot open video: {path}")
+            continue
+
+        video_fps = cap.get(cv2.CAP_PROP_FPS) or config.FPS
+        detector = FallDetector(config)  # 클립마다 상태 초기화
+
+        detections_at = []
+        frame_index = 0
+        start = time.perf_counter()
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            # 영상 내 시각 기준으로 판정 (처리 속도와 무관)
+            timestamp = frame_index / video_fps
+            frame_start = time.perf_counter()
+            _, is_fall_detected, _ = detector.process_frame(frame, timestamp)
+            frame_latency.observe(time.perf_counter() - frame_start)
+            if is_fall_detected:
+                detections_at.append(timestamp)
+            frame_index += 1
+        elapsed = time.perf_counter() - start
+        cap.release()
+
+        clips.append({'name': Path(path).name, 'frames': frame_index, 'fps': video_fps,
+                      'wall_seconds': elapsed, 'detections': detections_at, 'events': None})
+        logger.info(f"{path}: {frame_index} frames in {elapsed:.1f}s ({frame_index / max(elapsed, 1e-9):.1f} fps), "
+                    f"{len(detections_at)} falls")
+    return clips
+
+
+def compare_roi(paths: List[str]) -> dict:
+    """
+    전체 프레임 추론(IMGSZ)과 ROI 적응형 추론(ROI_IMGSZ + 주기적 전체 검사)을 같은 프레임에 모두 실행하여
+    프레임당 추론 시간과, ROI로 추론한 프레임의 키포인트 오차(전체 프레임 결과 기준)를 비교
+    """
+    import cv2
+    from fall_detector import FallDetector
+
+    config.DEBUG_MODE = False
+    config.HEADLESS = True
+    config.ROI_INFERENCE_ENABLED = True
+    detector = FallDetector(config)
+    threshold = config.KEYPOINT_CONFIDENCE_THRESHOLD
+
+    full_latency = Histogram()
+    adaptive_latency = Histogram()
+    errors_px, errors_normalized = [], []
+    frames = roi_frames = matched = missed = 0
+
+    for path in paths:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            logger.error(f"Cannot open video: {path}")
+            continue
+        video_fps = cap.get(cv2.CAP_PROP_FPS) or config.FPS
+        detector.roi_box = None
+        detector.last_full_scan_time = None
+
+        frame_index = 0
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            timestamp = frame_index / video_fps
+            frame_index += 1
+
+            start = time.perf_counter()
+            reference = detector.run_pose_model(frame, config.IMGSZ)
+            full_latency.observe(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            adaptive = detector.detect_and_estimate_pose(frame, timestamp) or []
+            adaptive_latency.observe(time.perf_counter() - start)
+
+            if detector.last_inference_mode != 'roi':
+                continue
+            roi_frames += 1
+            for expected in reference:
+                best = max(adaptive, key=lambda d: bbox_iou(d['bbox'], expected['bbox']), default=None)
+                if best is None or bbox_iou(best['bbox'], expected['bbox']) < 0.5:
+                    missed += 1
+                    continue
+                matched += 1
+                visible = (expected['keypoints'][:, 2] > threshold) & (best['keypoints'][:, 2] > threshold)
+                distances = np.linalg.norm(expected['keypoints'][visible, :2] - best['keypoints'][visible, :2], axis=1)
+                height = max(1, expected['bbox'][3] - expected['bbox'][1])
+                errors_px.extend(distances.tolist())
+                errors_normalized.extend((distances / height).tolist())
+        cap.release()
+        frames += frame_index
+        logger.info(f"{path}: {frame_index} frames compared")
+
+    def latency_summary(histogram: Histogram) -> dict:
+        return {
+            'mean_ms': histogram.total / histogram.count * 1000 if histogram.count else None,
+            'p50_ms': histogram.percentile(50) * 1000,
+            'p95_ms': histogram.percentile(95) * 1000,
+        }
+
+    full = latency_summary(full_latency)
+    adaptive = latency_summary(adaptive_latency)
+    return {
+        'frames': frames,
+        'roi_frames': roi_frames,
+        'roi_imgsz': config.ROI_IMGSZ,
+        'full_imgsz': config.IMGSZ,
+        'full_scan_seconds': config.ROI_FULL_SCAN_SECONDS,
+        'latency': {'full': full, 'adaptive': adaptive},
+        'speedup': full['mean_ms'] / adaptive['mean_ms'] if full['mean_ms'] and adaptive['mean_ms'] else None,
+        'persons': {'matched': matched, 'missed': missed},
+        'keypoint_error': {
+            'mean_px': float(np.mean(errors_px)) if errors_px else None,
+            'p95_px': float(np.percentile(errors_px, 95)) if errors_px else None,
+            'mean_of_bbox_height': float(np.mean(errors_normalized)) if errors_normalized else None,
+        },
+    }
+
+
+# ========== 평가 ==========
+
+def evaluate(clips: List[dict], tolerance: float) -> Optional[dict]:
+    """
+    라벨이 있는 클립에 대해 낙상 감지 품질 계산
+
+    - 감지 시각이 [start, end + tolerance] 안이면 해당 낙상의 정탐 (낙상당 최초 1회)
+    - 이미 정탐된 낙상 구간 안의 추가 감지는 중복(duplicates)으로 별도 집계
+    - 어느 구간에도 속하지 않는 감지는 오탐
+    """
+    labeled = [clip for clip in clips if clip['events'] is not None]
+    if not labeled:
+        return None
+
+    events = true_positives = false_positives = duplicates = 0
+    delays = []
+    total_hours = 0.0
+    for clip in labeled:
+        events += len(clip['events'])
+        total_hours += clip['frames'] / clip['fps'] / 3600
+        matched = [False] * len(clip['events'])
+        for detected_at in clip['detections']:
+            for index, event in enumerate(clip['events']):
+                if event['start'] <= detected_at <= event['end'] + tolerance:
+                    if matched[index]:
+                        duplicates += 1
+                    else:
+                        matched[index] = True
+                        true_positives += 1
+                        delays.append(detected_at - event['start'])
+                    break
+            else:
+                false_positives += 1
+
+    detections = true_positives + false_positives
+    result = {
+        'clips': len(labeled),
+        'events': events,
+        'detections': detections,
+        'true_positives': true_positives,
+        'false_positives': false_positives,
+        'duplicates': duplicates,
+        'precision': true_positives / detections if detections else None,
+        'recall': true_positives / events if events else None,
+        'false_alarms_per_hour': false_positives / total_hours if total_hours else None,
+        'time_to_detect': None,
+    }
+    if delays:
+        result['time_to_detect'] = {
+            'mean': float(np.mean(delays)),
+            'p50': float(np.percentile(delays, 50)),
+            'p95': float(np.percentile(delays, 95)),
+            'max': float(np.max(delays)),
+        }
+    return result
+
+
+def load_annotations(path: str) -> Dict[str, list]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get('clips', {})
+
+
+def peak_memory_mb() -> Optional[float]:
+    """프로세스 최대 RSS (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(mode: str, clips: List[dict], args) -> dict:
+    frames = sum(clip['frames'] for clip in clips)
+    wall_seconds = sum(clip['wall_seconds'] for clip in clips)
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'mode': mode,
+            'model': config.YOLO_POSE_MODEL if mode == 'video' else None,
+            'imgsz': config.IMGSZ if mode == 'video' else None,
+            'render': bool(args.render) if mode in ('video', 'synthetic') else False,
+            'params': config.FALL_DETECTION_PARAMS,
+        },
+        'throughput': {
+            'frames': frames,
+            'wall_seconds': wall_seconds,
+            'fps': frames / wall_seconds if wall_seconds else None,
+        },
+        'latency_ms': REGISTRY.stage_summary(),
+        'memory': {'peak_rss_mb': peak_memory_mb()},
+        'quality': evaluate(clips, args.tolerance),
+        'clips': [{key: clip[key] for key in ('name', 'frames', 'fps', 'wall_seconds', 'detections')}
+                  for clip in clips],
+    }
+
+
+def print_report(report: dict, baseline: Optional[dict] = None):
+    """주요 지표 출력 (baseline이 있으면 변화량 함께 출력)"""
+    def lookup(data, path):
+        for key in path:
+            if not isinstance(data, dict) or data.get(key) is None:
+                return None
+            data = data[key]
+        return data
+
+    rows = [
+        ('FPS', ('throughput', 'fps')),
+        ('Peak RSS (MB)', ('memory', 'peak_rss_mb')),
+        ('Precision', ('quality', 'precision')),
+        ('Recall', ('quality', 'recall')),
+        ('False alarms / hour', ('quality', 'false_alarms_per_hour')),
+        ('Time to detect mean (s)', ('quality', 'time_to_detect', 'mean')),
+    ]
+    for name in report['latency_ms']:
+        rows.append((f'{name} p95 (ms)', ('latency_ms', name, 'p95_ms')))
+
+    print('=' * 60)
+    for label, path in rows:
+        value = lookup(report, path)
+        if value is None:
+            continue
+        line = f'{label:<45} {value:10.3f}'
+        previous = lookup(baseline, path) if baseline else None
+        if previous is not None:
+            line += f'  (baseline {previous:.3f}, {value - previous:+.3f})'
+        print(line)
+    print('=' * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fall detection offline benchmark')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--video', nargs='+', help='Recorded video files to replay through FallDetector')
+    source.add_argument('--synthetic', type=int, help='Number of synthetic keypoint clips to replay (model-free)')
+    source.add_argument('--keypoints', nargs='+',
+                        help='Keypoint recordings (or directories of recordings) to replay (model-free)')
+    parser.add_argument('--annotations', help='Labeled fall intervals (JSON, see module docstring)')
+    parser.add_argument('--fps', type=float, default=30.0, help='Frame rate of synthetic clips')
+    parser.add_argument('--seed', type=int, default=0, help='First seed of synthetic clips')
+    parser.add_argument('--tolerance', type=float, default=2.0,
+                        help='Seconds after an event end during which a detection still counts')
+    parser.add_argument('--render', action='store_true',
+                        help='Video/synthetic mode: include windowed-mode drawing (and imshow if a display exists)')
+    parser.add_argument('--compare-roi', action='store_true',
+                        help='Video mode: compare full-frame and adaptive ROI inference latency and keypoint error')
+    parser.add_argument('--no-timing', action='store_true',
+                        help='Keypoints mode: skip per-frame latency histograms for maximum throughput')
+    parser.add_argument('--export-keypoints', metavar='DIR',
+                        help='Synthetic mode: write the clips as keypoint recordings instead of replaying them')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='Previous JSON report to compare against')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # 프레임 단위 디버그 로그는 측정을 왜곡하므로 끔
+    logging.getLogger('pose_analyzer').setLevel(logging.INFO)
+
+    if args.compare_roi:
+        if not args.video:
+            parser.error('--compare-roi requires --video')
+        result = compare_roi(args.video)
+        print(json.dumps(result, indent=2))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+        return 0
+
+    if args.synthetic and args.export_keypoints:
+        export_synthetic(args.synthetic, args.fps, args.seed, args.export_keypoints)
+        logger.info(f"{args.synthetic} synthetic recordings written to {args.export_keypoints}")
+        return 0
+
+    if args.synthetic:
+        mode = 'synthetic'
+        clips = run_synthetic(args.synthetic, args.fps, args.seed, args.render)
+    elif args.keypoints:
+        mode = 'keypoints'
+        clips = run_keypoints(args.keypoints, timed=not args.no_timing)
+        if args.annotations:
+            annotations = load_annotations(args.annotations)
+            for clip in clips:
+                clip['events'] = annotations.get(clip['name'], clip['events'])
+    else:
+        mode = 'video'
+        clips = run_video(args.video, args.render)
+        if args.annotations:
+            annotations = load_annotations(args.annotations)
+            for clip in clips:
+                clip['events'] = annotations.get(clip['name'])
+
+    report = build_report(mode, clips, args)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Report written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,7 @@ else:
 # Django 서버 설정 (.env에서 로드)
 DJANGO_SERVER_URL = os.getenv('DJANGO_SERVER_URL', 'http://localhost:8000')
 API_ENDPOINT = f"{DJANGO_SERVER_URL}/api_root/Post/"
+MEDIA_ENDPOINT = f"{DJANGO_SERVER_URL}/api_root/Media/"  # 재전송 전 SHA-256으로 서버 보유 여부 확인
 AUTHOR_ID = int(os.getenv('AUTHOR_ID', '1'))
 
 # API 인증 토큰 (.env에서 로드)
@@ -30,9 +31,12 @@ if not API_TOKEN:
 
 # 카메라 설정
 CAMERA_SOURCE = 0 # USB 웹캠 사용
-CAMERA_WIDTH = 640
-CAMERA_HEIGHT = 480
+CAMERA_ID = os.getenv('CAMERA_ID', 'default')  # 서버에서 카메라별 필터링/통계에 사용하는 식별자
+CAMERA_WIDTH = int(os.getenv('CAMERA_WIDTH', '640'))  # 캡처(녹화) 해상도
+CAMERA_HEIGHT = int(os.getenv('CAMERA_HEIGHT', '480'))
 FPS = 30
+# 분석 해상도: 캡처 가로가 이보다 크면 한 번만 축소한 프레임으로 추론/분석하고 원본 해상도는 녹화에만 사용
+ANALYSIS_WIDTH = int(os.getenv('ANALYSIS_WIDTH', '640'))
 
 # YOLO 모델 경로 (YOLOv11n-pose 단독 사용)
 YOLO_POSE_MODEL = "yolov11n-pose.pt"  # YOLOv11-pose 모델
@@ -52,9 +56,15 @@ FALL_DETECTION_PARAMS = {
     'horizontal_threshold': 0.3,  # 머리-엉덩이 수직 거리 비율
     'body_angle_threshold': 45,  # 몸통 각도 임계값 (도)
 
-    # 시간 기반 필터링
-    'fall_duration_frames': 15,  # 낙상 확정 최소 프레임 수 (약 0.5초 (30fps 기준))
-    'cooldown_frames': 150,  # 낙상 감지 후 쿨다운 (약 5초 (30fps 기준))
+    # 시간 기반 필터링 (프레임 시각 기준이므로 처리 FPS와 무관)
+    'fall_duration_seconds': 0.5,  # 낙상 자세가 이 시간 이상 지속되면 낙상 확정 (초)
+    'cooldown_seconds': 5.0,  # 낙상 감지 후 쿨다운 (초)
+
+    # 시간 창 특징 (사람별 추적, 아래 가중치 중 하나라도 0보다 크면 계산)
+    'temporal_window_seconds': 1.0,  # 속도/가속도/추세를 계산할 최근 구간 (초)
+    'descent_velocity_threshold': 0.6,  # 머리/엉덩이 하강 속도 (프레임 높이 / 초)
+    'descent_acceleration_threshold': 3.0,  # 머리/엉덩이 하강 가속도 (프레임 높이 / 초²)
+    'aspect_trend_threshold': 1.5,  # 가로/세로 비율 증가 속도 (초당)
 
     # 낙상 점수 가중치 (합계 = 1.0)
     'weights': {
@@ -62,7 +72,10 @@ FALL_DETECTION_PARAMS = {
         'low_position': 0.15,      # 낮은 위치 가중치
         'horizontal_body': 0.20,   # 수평 자세 가중치
         'body_angle': 0.15,        # 몸통 각도 가중치
-        'sudden_change': 0.25      # 갑작스러운 변화 가중치 (가장 중요)
+        'sudden_change': 0.25,     # 갑작스러운 변화 가중치 (가장 중요)
+        'descent_velocity': 0.0,   # 하강 속도 가중치 (시간 창)
+        'descent_acceleration': 0.0,  # 하강 가속도 가중치 (시간 창)
+        'aspect_trend': 0.0        # 비율 추세 가중치 (시간 창)
     },
 
     # 낙상 점수 임계값
@@ -75,14 +88,50 @@ FALL_IMAGES_DIR = "fall_detections"  # 낙상 이미지 저장 디렉토리
 SAVE_FALL_VIDEOS = True  # 낙상 비디오 저장 여부
 FALL_VIDEOS_DIR = "fall_videos"  # 낙상 비디오 저장 디렉토리
 
+# 로컬 낙상 미디어 정리 (media_janitor.py, 위 두 디렉토리 대상)
+MEDIA_JANITOR_ENABLED = os.getenv('MEDIA_JANITOR_ENABLED', 'true').lower() == 'true'
+MEDIA_JANITOR_INTERVAL_SECONDS = 300  # 정리 주기 (초)
+MEDIA_KEEP_ACKED_HOURS = float(os.getenv('MEDIA_KEEP_ACKED_HOURS', '24'))  # 서버 업로드 확인 후 로컬 보관 시간
+MEDIA_UNACKED_RETENTION_DAYS = int(os.getenv('MEDIA_UNACKED_RETENTION_DAYS', '30'))  # 업로드 못 한 파일 보관 기간 (0: 용량 초과 전까지 보관)
+MEDIA_QUOTA_MB = int(os.getenv('MEDIA_QUOTA_MB', '2048'))  # 낙상 미디어 최대 사용량 (0: 제한 없음)
+MEDIA_MIN_FREE_MB = int(os.getenv('MEDIA_MIN_FREE_MB', '512'))  # 디스크 최소 여유 공간 (0: 확인 안 함)
+MEDIA_ACK_LEDGER = 'media_ack.json'  # 업로드 확인 기록 파일 (FALL_VIDEOS_DIR 안)
+
 # 비디오 녹화 설정
 VIDEO_BUFFER_SECONDS = 7  # 낙상 감지 전 버퍼 시간 (초)
 VIDEO_RECORD_AFTER_SECONDS = 5  # 낙상 감지 후 녹화 시간 (초)
 VIDEO_CODEC = 'H264'  # 비디오 코덱 (mp4v, H264, XVID)
 VIDEO_FPS = 30  # 비디오 FPS
+VIDEO_ENCODER = os.getenv('VIDEO_ENCODER', 'auto')  # auto(VAAPI → libx264 → OpenCV), vaapi, ffmpeg, opencv
+FFMPEG_PATH = os.getenv('FFMPEG_PATH', 'ffmpeg')
+VIDEO_CRF = 23  # libx264 품질 (VAAPI는 QP로 사용, 낮을수록 고화질)
+VIDEO_ENCODER_QUEUE_FRAMES = 90  # 인코딩 대기 프레임 최소 상한 (낙상 후 녹화 구간 프레임 수보다 작으면 그 수 사용)
+# 분석/녹화 해상도가 다를 때 낙상 전 버퍼 프레임을 JPEG로 압축 보관 (0: 원본 그대로, 1~100: 품질)
+VIDEO_BUFFER_JPEG_QUALITY = int(os.getenv('VIDEO_BUFFER_JPEG_QUALITY', '85'))
+# RTSP 카메라: 원본 인코딩 스트림을 세그먼트로 보관했다가 낙상 구간만 remux (재인코딩/원본 프레임 버퍼 없음)
+VIDEO_PASSTHROUGH = os.getenv('VIDEO_PASSTHROUGH', 'false').lower() == 'true'
+VIDEO_PASSTHROUGH_DIR = os.getenv('VIDEO_PASSTHROUGH_DIR', 'passthrough_buffer')
+VIDEO_PASSTHROUGH_SEGMENT_SECONDS = 2  # 세그먼트 길이 (실제 경계는 키프레임)
+
+# 텔레메트리 설정 (서버 api_root/Telemetry/ 로 성능 지표 전송)
+TELEMETRY_ENABLED = os.getenv('TELEMETRY_ENABLED', 'true').lower() == 'true'
+DEVICE_ID = os.getenv('DEVICE_ID', '')  # 비어 있으면 CAMERA_ID 사용
+TELEMETRY_ENDPOINT = f"{DJANGO_SERVER_URL}/api_root/Telemetry/"
+TELEMETRY_SAMPLE_SECONDS = 10  # 샘플 1개가 요약하는 구간 (초)
+TELEMETRY_FLUSH_SECONDS = 60  # 서버 전송 주기 (초)
+TELEMETRY_MAX_PENDING = 360  # 전송 대기 샘플 최대 개수 (서버 장애 시 약 1시간 분량)
+
+# 계측 설정 (로컬 Prometheus /metrics 엔드포인트)
+METRICS_ENABLED = True
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+
+# 키포인트 녹화 (비어 있지 않으면 감지 결과를 이 디렉토리에 기록, keypoint_recording.py 참고)
+KEYPOINT_RECORDING_DIR = os.getenv('KEYPOINT_RECORDING_DIR', '')
 
 # 디버그 설정
 DEBUG_MODE = True  # True: 화면에 바운딩 박스와 스켈레톤 표시
+HEADLESS = os.getenv('HEADLESS', 'false').lower() == 'true'  # True: 창/실시간 오버레이 없이 실행 (저장 영상/썸네일에만 표시)
 SHOW_FPS = True  # FPS 표시 여부
 SHOW_FALL_SCORE = True  # 낙상 점수 실시간 표시
 LOG_LEVEL = "DEBUG"  # DEBUG, INFO, WARNING, ERROR
@@ -91,6 +140,22 @@ LOG_LEVEL = "DEBUG"  # DEBUG, INFO, WARNING, ERROR
 USE_HALF_PRECISION = False  # FP16 사용 (GPU 메모리 절약, 속도 향상)
 IMGSZ = 640  # 입력 이미지 크기 (640, 480, 320 등)
 
+# ROI 추론: 추적 중인 사람 주변만 잘라 작은 입력 크기로 추론 (주기적으로 전체 프레임 검사)
+ROI_INFERENCE_ENABLED = os.getenv('ROI_INFERENCE_ENABLED', 'false').lower() == 'true'
+ROI_IMGSZ = 320  # ROI 추론 입력 크기
+ROI_FULL_SCAN_SECONDS = 1.0  # 새로 들어온 사람을 찾기 위한 전체 프레임 검사 주기 (초)
+ROI_MARGIN = 0.3  # 감지 영역 긴 변 대비 사방 여유 비율
+ROI_MIN_SIZE = 160  # ROI 최소 크기 (픽셀)
+ROI_MAX_AREA_RATIO = 0.6  # ROI가 프레임 면적의 이 비율을 넘으면 전체 프레임으로 추론
+
+# 다중 카메라 supervisor (supervisor.py): 카메라별 캡처 프로세스 + 공유 추론 프로세스
+SUPERVISOR_CAMERAS = os.getenv('SUPERVISOR_CAMERAS', '')  # 쉼표 구분 "카메라ID=소스" 목록
+SUPERVISOR_RING_SLOTS = 4  # 카메라별 공유 메모리 프레임 슬롯 수
+SUPERVISOR_INFERENCE_TIMEOUT = 5.0  # 추론 응답 대기 시간 (초, 초과 시 감지 없음으로 처리)
+SUPERVISOR_STALL_SECONDS = 15.0  # 이 시간 동안 하트비트가 없으면 프로세스 재시작
+SUPERVISOR_STARTUP_GRACE_SECONDS = 60.0  # 시작 직후(카메라 연결/모델 로드) 하트비트 유예 시간
+SUPERVISOR_STATS_SECONDS = 30.0  # 통합 통계 출력 주기 (초)
+
 # 디렉토리 생성
 if SAVE_FALL_IMAGES and not os.path.exists(FALL_IMAGES_DIR):
     os.makedirs(FALL_IMAGES_DIR)
@@ -4,43 +4,101 @@ YOLOv11-pose만으로 사람 감지 + 포즈 추정 + 낙상 감지
 """
 
 import cv2
-import torch
+import time
 import numpy as np
 from datetime import datetime
 import logging
 from typing import Optional, Tuple, List
 from pathlib import Path
 
+from fall_state import FallDecisionPipeline
+from metrics import REGISTRY
 from pose_analyzer import PoseAnalyzer
 
 logger = logging.getLogger(__name__)
 
 
+def draw_detection(frame: np.ndarray, bbox: tuple, keypoints: np.ndarray,
+                   conf: float, analysis: dict, config) -> np.ndarray:
+    """
+    바운딩 박스, 신뢰도, 스켈레톤, 낙상 점수 그리기
+    (모델 없이 쓸 수 있도록 모듈 함수로 둠, benchmark.py --render 의 합성 재생에서도 사용)
+    """
+    color = (0, 0, 255) if analysis['is_fall'] else (0, 255, 0)
+    x1, y1, x2, y2 = bbox
+
+    # 바운딩 박스
+    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+
+    # 감지 신뢰도 표시
+    cv2.putText(frame, f"Conf: {conf:.2f}",
+              (x1, y1 - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+    # 스켈레톤
+    frame = PoseAnalyzer.draw_skeleton(frame, keypoints, config.KEYPOINT_CONFIDENCE_THRESHOLD)
+
+    # 낙상 점수 표시
+    if config.SHOW_FALL_SCORE:
+        score_text = f"Fall Score: {analysis['fall_score']:.2f}"
+        cv2.putText(frame, score_text, (x1, y1 - 10),
+                  cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+    return frame
+
+
 class FallDetector:
     """YOLOv11-pose 단독 사용 낙상 감지 클래스"""
 
     def __init__(self, config):
         self.config = config
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        logger.info(f"Using device: {self.device}")
 
         # YOLO-pose 모델 로드 (사람 감지 + 포즈 추정 동시 수행)
+        self.device = None  # load_model()에서 결정
         self.pose_model = None
         self.load_model()
 
-        # 포즈 분석기 초기화
-        self.pose_analyzer = PoseAnalyzer(config.FALL_DETECTION_PARAMS)
-
-        # 낙상 감지 상태
-        self.fall_frame_count = 0
-        self.cooldown_count = 0
+        # 포즈 분석기 + 낙상 확정 상태 머신 초기화
+        self.decision = FallDecisionPipeline(config.FALL_DETECTION_PARAMS)
+        self.pose_analyzer = self.decision.analyzer
+        self.fall_state = self.decision.state
+
+        # 화면 오버레이: headless 모드에서는 실시간 프레임에 그리지 않고,
+        # 감지 결과만 보관했다가 저장되는 썸네일/영상에만 그림
+        # (분석/녹화 해상도가 다르면 main.py에서 defer_overlays를 켜서 녹화 프레임에 다시 그림)
+        headless = getattr(config, 'HEADLESS', False)
+        self.draw_overlays = config.DEBUG_MODE and not headless
+        self.defer_overlays = config.DEBUG_MODE and headless
+        self.last_overlays = []  # 마지막 프레임의 (bbox, keypoints, conf, analysis) 목록
+        self.last_detections = None  # 마지막 프레임의 감지 결과 (키포인트 녹화용)
+        self.last_skipped = False  # 마지막 프레임에서 추론을 건너뛰었는지 (쿨다운)
+
+        # 마지막 낙상 확정 시각
         self.last_fall_time = None
 
+        # 단계별 계측 (타이머는 재사용하여 프레임당 할당 없음)
+        self.metrics = REGISTRY
+        self.timers = {stage: self.metrics.stage_timer(stage)
+                       for stage in ('inference', 'inference_roi', 'transfer', 'analyze', 'draw', 'copy')}
+        self.detections_counter = self.metrics.counter('detections_total', 'Persons detected')
+        self.falls_counter = self.metrics.counter('falls_confirmed_total', 'Confirmed falls')
+        self.roi_frames_counter = self.metrics.counter('roi_inference_frames_total',
+                                                       'Frames inferred on a cropped region of interest')
+
+        # ROI 추론 (추적 중인 사람 주변만 작은 입력 크기로 추론, 주기적으로 전체 프레임 검사)
+        self.roi_enabled = getattr(config, 'ROI_INFERENCE_ENABLED', False)
+        self.roi_box = None  # 다음 프레임에 사용할 ROI (x1, y1, x2, y2)
+        self.last_full_scan_time = None
+        self.last_inference_mode = None  # 'full' 또는 'roi'
+
     def load_model(self):
         """YOLO-pose 모델 로드"""
         try:
+            import torch
             from ultralytics import YOLO
 
+            self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+            logger.info(f"Using device: {self.device}")
+
             logger.info(f"Loading {self.config.YOLO_POSE_MODEL}")
             self.pose_model = YOLO(self.config.YOLO_POSE_MODEL)
             self.pose_model.to(self.device)
@@ -56,7 +114,7 @@ class FallDetector:
             logger.error(f"Error loading model: {e}")
             raise
 
-    def detect_and_estimate_pose(self, frame: np.ndarray) -> Optional[List[dict]]:
+    def detect_and_estimate_pose(self, frame: np.ndarray, timestamp: Optional[float] = None) -> Optional[List[dict]]:
         """
         YOLO-pose로 사람 감지 + 포즈 추정 동시 수행
 
@@ -64,143 +122,254 @@ class FallDetector:
         1. 프레임에서 사람 감지 (바운딩 박스)
         2. 각 사람의 17개 키포인트 추정
 
+        ROI 모드(ROI_INFERENCE_ENABLED)에서는 ROI_FULL_SCAN_SECONDS 마다 전체 프레임을 IMGSZ로 검사하고,
+        그 사이에는 직전 감지 영역만 잘라 ROI_IMGSZ로 추론 (ROI에서 아무도 못 찾으면 바로 전체 프레임 검사)
+
+        Args:
+            frame: 입력 프레임
+            timestamp: 프레임 시각 (초, 전체 검사 주기 계산용), 없으면 현재 시각
+
         Returns:
             List of dict: [{'bbox': (x1,y1,x2,y2), 'keypoints': (17,3), 'conf': float}, ...]
         """
-        try:
-            # YOLO-pose 추론
-            results = self.pose_model(
-                frame,
-                conf=self.config.POSE_CONFIDENCE_THRESHOLD,
-                imgsz=self.config.IMGSZ,
-                half=self.config.USE_HALF_PRECISION,
-                verbose=False
-            )
-
-            detections = []
-
-            for result in results:
-                # 사람이 감지되고 키포인트가 있는 경우
-                if result.keypoints is not None and len(result.keypoints) > 0:
-                    boxes = result.boxes.xyxy.cpu().numpy()
-                    keypoints = result.keypoints.data.cpu().numpy()
-                    confidences = result.boxes.conf.cpu().numpy()
-
-                    for box, kpts, conf in zip(boxes, keypoints, confidences):
-                        x1, y1, x2, y2 = box[:4]
-                        detections.append({
-                            'bbox': (int(x1), int(y1), int(x2), int(y2)),
-                            'keypoints': kpts,  # (17, 3) [x, y, confidence]
-                            'conf': float(conf)
-                        })
+        if timestamp is None:
+            timestamp = time.monotonic()
 
+        try:
+            detections = None
+            roi = self.current_roi(frame, timestamp)
+            if roi is not None:
+                x1, y1, x2, y2 = roi
+                with self.timers['inference_roi']:
+                    detections = self.run_pose_model(frame[y1:y2, x1:x2], self.config.ROI_IMGSZ, offset=(x1, y1))
+                self.last_inference_mode = 'roi'
+                self.roi_frames_counter.inc()
+
+            if not detections:
+                with self.timers['inference']:
+                    detections = self.run_pose_model(frame, self.config.IMGSZ)
+                self.last_inference_mode = 'full'
+                self.last_full_scan_time = timestamp
+
+            self.update_roi(detections, frame.shape)
             return detections if detections else None
 
         except Exception as e:
             logger.error(f"Error in detection: {e}")
             return None
 
-    def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, bool, dict]:
+    def run_pose_model(self, image: np.ndarray, imgsz: int, offset: Tuple[int, int] = (0, 0)) -> List[dict]:
+        """
+        YOLO-pose 추론 1회
+
+        Args:
+            image: 전체 프레임 또는 잘라낸 ROI
+            imgsz: 모델 입력 크기
+            offset: image 좌상단의 프레임 좌표 (ROI 결과를 프레임 좌표로 되돌릴 때 사용)
+        """
+        return self.run_pose_batch([image], imgsz, [offset])[0]
+
+    def run_pose_batch(self, images: List[np.ndarray], imgsz: int,
+                       offsets: Optional[List[Tuple[int, int]]] = None) -> List[List[dict]]:
+        """
+        여러 이미지를 한 번의 모델 호출로 추론 (supervisor.py의 공유 추론 프로세스에서 카메라별 프레임을 묶어 처리)
+
+        Returns:
+            이미지별 감지 결과 목록 (run_pose_model()과 같은 형식)
+        """
+        results = self.pose_model(
+            images,
+            conf=self.config.POSE_CONFIDENCE_THRESHOLD,
+            imgsz=imgsz,
+            half=self.config.USE_HALF_PRECISION,
+            verbose=False
+        )
+        offsets = offsets or [(0, 0)] * len(images)
+        return [self.parse_pose_result(result, offset) for result, offset in zip(results, offsets)]
+
+    def parse_pose_result(self, result, offset: Tuple[int, int] = (0, 0)) -> List[dict]:
+        """ultralytics 결과 1개(이미지 1장)를 감지 결과 목록으로 변환"""
+        offset_x, offset_y = offset
+        detections = []
+
+        # 사람이 감지되고 키포인트가 있는 경우
+        if result.keypoints is not None and len(result.keypoints) > 0:
+            # GPU -> CPU 전송
+            with self.timers['transfer']:
+                boxes = result.boxes.xyxy.cpu().numpy()
+                keypoints = result.keypoints.data.cpu().numpy()
+                confidences = result.boxes.conf.cpu().numpy()
+
+            if offset_x or offset_y:
+                keypoints[:, :, 0] += offset_x
+                keypoints[:, :, 1] += offset_y
+
+            for box, kpts, conf in zip(boxes, keypoints, confidences):
+                x1, y1, x2, y2 = box[:4]
+                detections.append({
+                    'bbox': (int(x1) + offset_x, int(y1) + offset_y, int(x2) + offset_x, int(y2) + offset_y),
+                    'keypoints': kpts,  # (17, 3) [x, y, confidence]
+                    'conf': float(conf)
+                })
+
+        return detections
+
+    def current_roi(self, frame: np.ndarray, timestamp: float) -> Optional[Tuple[int, int, int, int]]:
+        """이번 프레임에 사용할 ROI (전체 검사가 필요하면 None)"""
+        if not self.roi_enabled or self.roi_box is None:
+            return None
+        if self.last_full_scan_time is None or timestamp - self.last_full_scan_time >= self.config.ROI_FULL_SCAN_SECONDS:
+            return None
+
+        # ROI가 프레임 대부분을 차지하면 잘라도 이득이 없음
+        frame_height, frame_width = frame.shape[:2]
+        x1, y1, x2, y2 = self.roi_box
+        if (x2 - x1) * (y2 - y1) > self.config.ROI_MAX_AREA_RATIO * frame_width * frame_height:
+            return None
+        return self.roi_box
+
+    def update_roi(self, detections: Optional[List[dict]], frame_shape: tuple):
+        """감지된 사람들을 모두 포함하도록 여유(ROI_MARGIN)를 둔 ROI 갱신"""
+        if not self.roi_enabled:
+            return
+        if not detections:
+            self.roi_box = None
+            return
+
+        frame_height, frame_width = frame_shape[:2]
+        x1 = min(d['bbox'][0] for d in detections)
+        y1 = min(d['bbox'][1] for d in detections)
+        x2 = max(d['bbox'][2] for d in detections)
+        y2 = max(d['bbox'][3] for d in detections)
+
+        # 넘어지는 방향을 알 수 없으므로 긴 변 기준으로 사방에 여유를 둠
+        margin = int(max(x2 - x1, y2 - y1) * self.config.ROI_MARGIN)
+        x1, y1, x2, y2 = x1 - margin, y1 - margin, x2 + margin, y2 + margin
+
+        # 최소 크기 보장 (너무 작은 ROI는 업스케일로 정확도가 떨어짐)
+        min_size = self.config.ROI_MIN_SIZE
+        if x2 - x1 < min_size:
+            center = (x1 + x2) // 2
+            x1, x2 = center - min_size // 2, center + min_size // 2
+        if y2 - y1 < min_size:
+            center = (y1 + y2) // 2
+            y1, y2 = center - min_size // 2, center + min_size // 2
+
+        self.roi_box = (max(0, x1), max(0, y1), min(frame_width, x2), min(frame_height, y2))
+
+    def process_frame(self, frame: np.ndarray, timestamp: Optional[float] = None) -> Tuple[np.ndarray, bool, dict]:
         """
         프레임 처리 및 낙상 감지
 
+        Args:
+            frame: 입력 프레임
+            timestamp: 프레임 시각 (초, 실시간은 캡처 시 time.monotonic(), 재생은 영상 내 시각)
+                       없으면 현재 시각
+
         Returns:
             (processed_frame, is_fall_detected, fall_info)
         """
+        if timestamp is None:
+            timestamp = time.monotonic()
         frame_height, frame_width = frame.shape[:2]
         is_fall_detected = False
         fall_info = {}
+        self.last_overlays = []
+        self.last_detections = None
+        self.last_skipped = False
 
         # Cooldown 체크
-        if self.cooldown_count > 0:
-            self.cooldown_count -= 1
-            if self.config.DEBUG_MODE:
-                cv2.putText(frame, f"Cooldown: {self.cooldown_count}",
+        if self.fall_state.in_cooldown(timestamp):
+            self.last_skipped = True
+            if self.draw_overlays:
+                cv2.putText(frame, self.fall_state.cooldown_text(),
                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
             return frame, False, {}
 
         # 사람 감지 + 포즈 추정 (단일 모델에서 동시 수행!)
-        detections = self.detect_and_estimate_pose(frame)
-
+        detections = self.detect_and_estimate_pose(frame, timestamp)
+        self.last_detections = detections
         if detections:
-            for detection in detections:
-                bbox = detection['bbox']
-                keypoints = detection['keypoints']
-                conf = detection['conf']
-
-                # 포즈 분석 (낙상 여부 판단)
-                analysis = self.pose_analyzer.analyze_pose(keypoints, bbox, frame_height)
-
-                # 디버그 모드: 시각화
-                if self.config.DEBUG_MODE:
-                    color = (0, 0, 255) if analysis['is_fall'] else (0, 255, 0)
-                    x1, y1, x2, y2 = bbox
-
-                    # 바운딩 박스
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-
-                    # 감지 신뢰도 표시
-                    cv2.putText(frame, f"Conf: {conf:.2f}",
-                              (x1, y1 - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-
-                    # 스켈레톤
-                    frame = self.pose_analyzer.draw_skeleton(
-                        frame, keypoints, self.config.KEYPOINT_CONFIDENCE_THRESHOLD
-                    )
-
-                    # 낙상 점수 표시
-                    if self.config.SHOW_FALL_SCORE:
-                        score_text = f"Fall Score: {analysis['fall_score']:.2f}"
-                        cv2.putText(frame, score_text, (x1, y1 - 10),
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-
-                # 낙상 감지 로직
-                if analysis['is_fall']:
-                    self.fall_frame_count += 1
-
-                    # 연속 프레임 검증
-                    if self.fall_frame_count >= self.config.FALL_DETECTION_PARAMS['fall_duration_frames']:
-                        # 낙상 확정!
-                        is_fall_detected = True
-                        fall_info = {
-                            'timestamp': datetime.now(),
-                            'bbox': bbox,
-                            'confidence': conf,
-                            'analysis': analysis,
-                            'frame': frame.copy(),
-                            'keypoints': keypoints
-                        }
-
-                        # 상태 초기화
-                        self.fall_frame_count = 0
-                        self.cooldown_count = self.config.FALL_DETECTION_PARAMS['cooldown_frames']
-                        self.last_fall_time = datetime.now()
-
-                        logger.warning(f"FALL DETECTED! Confidence: {conf:.2f}, "
-                                     f"Fall Score: {analysis['fall_score']:.2f}, "
-                                     f"Reason: {analysis['reason']}")
-
-                        if self.config.DEBUG_MODE:
-                            cv2.putText(frame, "!!! FALL DETECTED !!!",
-                                      (50, 50), cv2.FONT_HERSHEY_SIMPLEX,
-                                      1.5, (0, 0, 255), 3)
-                        break
-                else:
-                    # 낙상이 아니면 카운트 리셋
-                    self.fall_frame_count = max(0, self.fall_frame_count - 1)
-
-        else:
-            # 사람이 감지되지 않으면 카운트 리셋
-            self.fall_frame_count = 0
+            self.detections_counter.inc(len(detections))
+
+        # 포즈 분석 + 연속 프레임 검증 (낙상 여부 판단)
+        with self.timers['analyze']:
+            analyzed, confirmed = self.decision.process(detections, frame_height, timestamp)
+
+        for detection, analysis in analyzed:
+            # 디버그 모드: 시각화
+            if self.draw_overlays:
+                with self.timers['draw']:
+                    frame = self.draw_detection(frame, detection['bbox'], detection['keypoints'],
+                                                detection['conf'], analysis)
+            if self.defer_overlays:
+                self.last_overlays.append((detection['bbox'], detection['keypoints'],
+                                           detection['conf'], analysis))
+
+        if confirmed is not None:
+            # 낙상 확정!
+            detection, analysis = confirmed
+            conf = detection['conf']
+            is_fall_detected = True
+            with self.timers['copy']:
+                fall_frame = frame.copy()
+            fall_info = {
+                'timestamp': datetime.now(),
+                'bbox': detection['bbox'],
+                'confidence': conf,
+                'analysis': analysis,
+                'frame': fall_frame,
+                'keypoints': detection['keypoints'],
+                # 실시간 프레임에 그리지 않은 경우 저장 시 그릴 감지 결과
+                'overlays': list(self.last_overlays),
+                # 종단 간 지연 측정용 (프레임 시각 기준)
+                'suspect_start_time': self.fall_state.confirmed_onset_time,
+                'capture_time': timestamp
+            }
+            self.falls_counter.inc()
+            self.metrics.observe_e2e('onset_to_confirm', timestamp - self.fall_state.confirmed_onset_time)
+            self.last_fall_time = datetime.now()
+
+            logger.warning(f"FALL DETECTED! Confidence: {conf:.2f}, "
+                         f"Fall Score: {analysis['fall_score']:.2f}, "
+                         f"Reason: {analysis['reason']}")
+
+            if self.draw_overlays:
+                cv2.putText(frame, "!!! FALL DETECTED !!!",
+                          (50, 50), cv2.FONT_HERSHEY_SIMPLEX,
+                          1.5, (0, 0, 255), 3)
 
         # 현재 낙상 의심 상태 표시
-        if self.config.DEBUG_MODE and self.fall_frame_count > 0:
-            threshold = self.config.FALL_DETECTION_PARAMS['fall_duration_frames']
-            cv2.putText(frame, f"Fall Suspicion: {self.fall_frame_count}/{threshold}",
+        if self.draw_overlays and self.fall_state.is_suspicious:
+            cv2.putText(frame, self.fall_state.suspicion_text(),
                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
 
         return frame, is_fall_detected, fall_info
 
+    def draw_detection(self, frame: np.ndarray, bbox: tuple, keypoints: np.ndarray,
+                       conf: float, analysis: dict) -> np.ndarray:
+        """바운딩 박스, 신뢰도, 스켈레톤, 낙상 점수 그리기"""
+        return draw_detection(frame, bbox, keypoints, conf, analysis, self.config)
+
+    def annotate_frame(self, frame: np.ndarray, overlays: list) -> np.ndarray:
+        """보관해 둔 감지 결과를 프레임에 그리기 (headless 모드의 저장용 썸네일/영상)"""
+        for bbox, keypoints, conf, analysis in overlays:
+            frame = self.draw_detection(frame, bbox, keypoints, conf, analysis)
+        return frame
+
+    @staticmethod
+    def scale_overlays(overlays: list, scale_x: float, scale_y: float) -> list:
+        """분석 해상도 기준 감지 결과를 녹화 해상도 좌표로 변환"""
+        scaled = []
+        for bbox, keypoints, conf, analysis in overlays:
+            x1, y1, x2, y2 = bbox
+            bbox = (int(x1 * scale_x), int(y1 * scale_y), int(x2 * scale_x), int(y2 * scale_y))
+            keypoints = np.array(keypoints, dtype=np.float32, copy=True)
+            keypoints[:, 0] *= scale_x
+            keypoints[:, 1] *= scale_y
+            scaled.append((bbox, keypoints, conf, analysis))
+        return scaled
+
     def save_fall_image(self, fall_info: dict) -> str:
         """낙상 이미지 저장"""
         if not self.config.SAVE_FALL_IMAGES:
@@ -210,7 +379,11 @@ class FallDetector:
         filename = f"fall_{timestamp}.jpg"
         filepath = Path(self.config.FALL_IMAGES_DIR) / filename
 
-        cv2.imwrite(str(filepath), fall_info['frame'])
+        image = fall_info['frame']
+        if fall_info.get('overlays'):
+            image = self.annotate_frame(image.copy(), fall_info['overlays'])
+
+        cv2.imwrite(str(filepath), image)
         logger.info(f"Fall image saved: {filepath}")
 
         return str(filepath)
@@ -262,5 +435,6 @@ class FallDetector:
             'device': str(self.device),
             'half_precision': self.config.USE_HALF_PRECISION,
             'input_size': self.config.IMGSZ,
+            'roi_input_size': self.config.ROI_IMGSZ if self.roi_enabled else None,
             'capabilities': ['person_detection', 'pose_estimation', 'fall_detection']
         }
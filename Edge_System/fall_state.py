@@ -0,0 +1,171 @@
+"""
+낙상 확정 상태 머신
+모델/화면 처리 없이 감지 결과(bbox + 키포인트)만으로 낙상을 판정하므로
+FallDetector(실시간)와 벤치마크/재생 도구가 같은 판정 로직을 공유
+"""
+
+from typing import List, Optional, Tuple
+import logging
+
+from pose_analyzer import PoseAnalyzer
+from temporal_window import TrackManager
+
+# 시간 창 특징을 사용하는 가중치 (하나라도 0보다 크면 사람별 추적 활성화)
+TEMPORAL_WEIGHT_KEYS = ('descent_velocity', 'descent_acceleration', 'aspect_trend')
+
+logger = logging.getLogger(__name__)
+
+
+class FallStateMachine:
+    """
+    연속 프레임 검증 + 쿨다운 상태 머신 (프레임 시각 기준, 처리 FPS와 무관)
+
+    - 낙상 자세 프레임이면 직전 판정 이후 경과 시간만큼 의심 시간 증가, 정상 자세면 같은 만큼 감소,
+      사람이 없으면 0으로 리셋
+    - 의심 시간이 fall_duration_seconds 에 도달하면 낙상 확정 후 cooldown_seconds 동안 판정 중지
+    """
+
+    # 프레임 간격이 이보다 길면 (카메라 끊김 등) 이 값만큼만 반영
+    MAX_STEP_SECONDS = 1.0
+    # 의심 시작 프레임 이후 최소 이만큼의 프레임이 더 있어야 확정되도록 한 프레임 반영량을
+    # fall_duration_seconds / MIN_FALL_STEPS 로 제한 (끊김 직후 프레임 두 장만으로 확정되는 것 방지)
+    MIN_FALL_STEPS = 2
+    # 누적 부동소수 오차로 경계 프레임이 밀리지 않도록 하는 여유
+    EPSILON = 1e-6
+
+    def __init__(self, params: dict):
+        # 이전 프레임 단위 설정(30fps 기준)도 받아들임
+        self.fall_duration_seconds = params.get('fall_duration_seconds',
+                                                params.get('fall_duration_frames', 15) / 30.0)
+        self.cooldown_seconds = params.get('cooldown_seconds', params.get('cooldown_frames', 150) / 30.0)
+        self.max_step_seconds = min(self.MAX_STEP_SECONDS, self.fall_duration_seconds / self.MIN_FALL_STEPS)
+
+        self.suspicion_seconds = 0.0  # 누적 의심 시간
+        self.last_update_time = None  # 마지막으로 판정을 반영한 프레임 시각
+        self.cooldown_until = None  # 쿨다운 종료 시각
+        self.cooldown_remaining = 0.0
+        self.suspect_start_time = None  # 낙상 의심이 시작된 프레임 시각
+        self.confirmed_onset_time = None  # 마지막으로 확정된 낙상의 의심 시작 시각
+
+    def in_cooldown(self, timestamp: float) -> bool:
+        """쿨다운 중이면 True"""
+        if self.cooldown_until is None:
+            return False
+        self.cooldown_remaining = self.cooldown_until - timestamp
+        if self.cooldown_remaining > self.EPSILON:
+            return True
+        self.cooldown_until = None
+        self.cooldown_remaining = 0.0
+        return False
+
+    def update(self, is_fall: bool, timestamp: float) -> bool:
+        """
+        프레임 한 장의 판정 반영 (프레임에 낙상 자세인 사람이 있으면 is_fall=True)
+
+        Returns:
+            낙상 확정 여부
+        """
+        step = 0.0
+        if self.last_update_time is not None:
+            step = min(max(0.0, timestamp - self.last_update_time), self.max_step_seconds)
+        self.last_update_time = timestamp
+
+        if not is_fall:
+            # 낙상이 아니면 경과 시간만큼 감소
+            self.suspicion_seconds = max(0.0, self.suspicion_seconds - step)
+            if self.suspicion_seconds == 0.0:
+                self.suspect_start_time = None
+            return False
+
+        if self.suspect_start_time is None:
+            # 의심 시작 프레임: 이 시각부터 시간을 잼
+            self.suspect_start_time = timestamp
+        else:
+            self.suspicion_seconds += step
+
+        if self.suspicion_seconds + self.EPSILON < self.fall_duration_seconds:
+            return False
+
+        # 낙상 확정: 상태 초기화 후 쿨다운 시작
+        self.confirmed_onset_time = self.suspect_start_time
+        self.suspicion_seconds = 0.0
+        self.suspect_start_time = None
+        self.last_update_time = None
+        self.cooldown_until = timestamp + self.cooldown_seconds
+        self.cooldown_remaining = self.cooldown_seconds
+        return True
+
+    def no_person(self, timestamp: float):
+        """사람이 감지되지 않은 프레임"""
+        self.suspicion_seconds = 0.0
+        self.suspect_start_time = None
+        self.last_update_time = None
+
+    @property
+    def is_suspicious(self) -> bool:
+        return self.suspect_start_time is not None
+
+    def cooldown_text(self) -> str:
+        return f"Cooldown: {self.cooldown_remaining:.1f}s"
+
+    def suspicion_text(self) -> str:
+        return f"Fall Suspicion: {self.suspicion_seconds:.1f}/{self.fall_duration_seconds:.1f}s"
+
+
+class FallDecisionPipeline:
+    """PoseAnalyzer + FallStateMachine: 프레임 하나의 감지 결과 목록으로 낙상 판정"""
+
+    def __init__(self, params: dict):
+        self.analyzer = PoseAnalyzer(params)
+        self.state = FallStateMachine(params)
+
+        weights = params.get('weights', {})
+        self.tracker = None
+        if any(weights.get(key, 0) > 0 for key in TEMPORAL_WEIGHT_KEYS):
+            window_seconds = params.get('temporal_window_seconds', 1.0)
+            self.tracker = TrackManager(window_seconds=window_seconds, max_age_seconds=window_seconds)
+
+    def temporal_features(self, track, detection: dict, frame_height: int, timestamp: float) -> dict:
+        """사람별 시간 창에 현재 감지 결과를 추가하고 특징 반환 (높이는 프레임 높이로 정규화)"""
+        head_y, hip_y = self.analyzer.vertical_centroids(detection['keypoints'])
+        x1, y1, x2, y2 = detection['bbox']
+        return track.window.push(
+            timestamp,
+            head_y / frame_height if head_y is not None else None,
+            hip_y / frame_height if hip_y is not None else None,
+            (x2 - x1) / (y2 - y1) if y2 > y1 else None,
+        )
+
+    def process(self, detections: Optional[List[dict]], frame_height: int,
+                timestamp: float) -> Tuple[List[Tuple[dict, dict]], Optional[Tuple[dict, dict]]]:
+        """
+        감지 결과 처리
+
+        Args:
+            detections: [{'bbox': (x1,y1,x2,y2), 'keypoints': (17,3), 'conf': float}, ...] 또는 None
+            frame_height: 프레임 높이
+            timestamp: 프레임 시각 (초)
+
+        Returns:
+            (분석한 (detection, analysis) 목록, 낙상을 확정한 (detection, analysis) 또는 None)
+            프레임 안에 낙상 자세인 사람이 여럿이면 점수가 가장 높은 사람으로 확정
+        """
+        analyzed = []
+        if not detections:
+            self.state.no_person(timestamp)
+            return analyzed, None
+
+        tracks = self.tracker.update(detections, timestamp) if self.tracker is not None else None
+        for index, detection in enumerate(detections):
+            temporal = None
+            if tracks is not None:
+                temporal = self.temporal_features(tracks[index], detection, frame_height, timestamp)
+            analysis = self.analyzer.analyze_pose(detection['keypoints'], detection['bbox'], frame_height, temporal)
+            analyzed.append((detection, analysis))
+
+        # 상태 머신은 프레임 단위로 한 번만 갱신 (사람 수만큼 시간이 중복 누적되지 않도록)
+        falling = [item for item in analyzed if item[1]['is_fall']]
+        if self.state.update(bool(falling), timestamp):
+            return analyzed, max(falling, key=lambda item: item[1]['fall_score'])
+
+        return analyzed, None
@@ -0,0 +1,169 @@
+"""
+키포인트 시퀀스 녹화 포맷
+
+영상 대신 YOLO-pose 감지 결과만 저장하여, 카메라/모델 없이
+PoseAnalyzer와 낙상 상태 머신을 재생/튜닝할 수 있게 함 (OpenCV, torch 불필요)
+
+녹화 디렉토리 구조:
+    <recording>/meta.json          fps, frame_height, camera_id, max_persons, 라벨(events)
+    <recording>/segment_00000.npz  SEGMENT_FRAMES 프레임 단위 배열 묶음
+
+세그먼트 배열 (F = 프레임 수, P = max_persons):
+    timestamps    float64 [F]            프레임 시각 (초, 녹화 시작 기준)
+    person_count  uint8   [F]            감지된 사람 수 (P 초과분은 버림)
+    skipped       bool    [F]            쿨다운 등으로 추론하지 않은 프레임
+    keypoints     float32 [F, P, 17, 3]  [x, y, confidence]
+    bboxes        float32 [F, P, 4]      (x1, y1, x2, y2)
+    conf          float32 [F, P]         사람 감지 신뢰도
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_FRAMES = 9000  # 30fps 기준 5분
+META_FILENAME = 'meta.json'
+
+
+class KeypointRecorder:
+    """감지 결과를 세그먼트 단위로 디스크에 기록 (메모리는 세그먼트 1개 분량만 사용)"""
+
+    def __init__(self, directory: str, fps: float, frame_height: int, camera_id: str = 'default',
+                 max_persons: int = 4, segment_frames: int = SEGMENT_FRAMES, compress: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_persons = max_persons
+        self.segment_frames = segment_frames
+        self.compress = compress
+        self.meta = {
+            'fps': fps,
+            'frame_height': frame_height,
+            'camera_id': camera_id,
+            'max_persons': max_persons,
+            'frames': 0,
+            'segments': 0,
+            'events': [],
+        }
+        self.start_time = None
+        self._allocate()
+
+    def _allocate(self):
+        n, p = self.segment_frames, self.max_persons
+        self.timestamps = np.zeros(n, dtype=np.float64)
+        self.person_count = np.zeros(n, dtype=np.uint8)
+        self.skipped = np.zeros(n, dtype=bool)
+        self.keypoints = np.zeros((n, p, 17, 3), dtype=np.float32)
+        self.bboxes = np.zeros((n, p, 4), dtype=np.float32)
+        self.conf = np.zeros((n, p), dtype=np.float32)
+        self.index = 0
+
+    def add(self, timestamp: float, detections: Optional[List[dict]], skipped: bool = False):
+        """
+        프레임 1개 기록
+
+        Args:
+            timestamp: 프레임 시각 (초)
+            detections: FallDetector.detect_and_estimate_pose() 결과 또는 None
+            skipped: 추론을 건너뛴 프레임 여부
+        """
+        if self.start_time is None:
+            self.start_time = timestamp
+
+        i = self.index
+        self.timestamps[i] = timestamp - self.start_time
+        self.skipped[i] = skipped
+        count = 0
+        for detection in (detections or [])[:self.max_persons]:
+            self.keypoints[i, count] = detection['keypoints'][:17, :3]
+            self.bboxes[i, count] = detection['bbox']
+            self.conf[i, count] = detection['conf']
+            count += 1
+        self.person_count[i] = count
+
+        self.index += 1
+        if self.index == self.segment_frames:
+            self._write_segment()
+
+    def add_event(self, start: float, end: float):
+        """라벨 추가 (녹화 시작 기준 초)"""
+        self.meta['events'].append({'start': start, 'end': end})
+
+    def _write_segment(self):
+        if self.index == 0:
+            return
+        n = self.index
+        path = self.directory / f"segment_{self.meta['segments']:05d}.npz"
+        save = np.savez_compressed if self.compress else np.savez
+        save(path,
+             timestamps=self.timestamps[:n], person_count=self.person_count[:n], skipped=self.skipped[:n],
+             keypoints=self.keypoints[:n], bboxes=self.bboxes[:n], conf=self.conf[:n])
+        self.meta['frames'] += n
+        self.meta['segments'] += 1
+        self.index = 0
+        self._write_meta()
+        logger.debug(f"Keypoint segment written: {path} ({n} frames)")
+
+    def _write_meta(self):
+        with open(self.directory / META_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+
+    def close(self):
+        self._write_segment()
+        self._write_meta()
+        logger.info(f"Keypoint recording saved: {self.directory} ({self.meta['frames']} frames)")
+
+
+class KeypointRecording:
+    """녹화 디렉토리 읽기 (세그먼트를 하나씩 로드하여 스트리밍)"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        with open(self.directory / META_FILENAME, encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.name = self.directory.name
+        self.fps = self.meta['fps']
+        self.frame_height = self.meta['frame_height']
+        self.events = self.meta.get('events')
+
+    def segments(self) -> Iterator[dict]:
+        """세그먼트별 배열 딕셔너리"""
+        for path in sorted(self.directory.glob('segment_*.npz')):
+            with np.load(path) as data:
+                yield {key: data[key] for key in data.files}
+
+    def frames(self) -> Iterator[Tuple[float, Optional[List[dict]], bool]]:
+        """
+        프레임 단위 재생: (timestamp, detections, skipped)
+        detections 형식은 FallDetector.detect_and_estimate_pose()와 동일 (사람이 없으면 None)
+        """
+        for segment in self.segments():
+            timestamps = segment['timestamps'].tolist()
+            counts = segment['person_count'].tolist()
+            skipped = segment['skipped'].tolist()
+            keypoints = segment['keypoints']
+            bboxes = segment['bboxes'].astype(np.int32).tolist()
+            conf = segment['conf'].tolist()
+            for i, timestamp in enumerate(timestamps):
+                if counts[i] == 0:
+                    yield timestamp, None, skipped[i]
+                    continue
+                yield timestamp, [
+                    {'bbox': tuple(bboxes[i][p]), 'keypoints': keypoints[i, p], 'conf': conf[i][p]}
+                    for p in range(counts[i])
+                ], skipped[i]
+
+
+def find_recordings(paths: List[str]) -> List[KeypointRecording]:
+    """녹화 디렉토리 또는 녹화 디렉토리들을 담은 상위 디렉토리 목록에서 녹화 찾기"""
+    recordings = []
+    for path in map(Path, paths):
+        if (path / META_FILENAME).exists():
+            recordings.append(KeypointRecording(path))
+        else:
+            recordings.extend(KeypointRecording(meta.parent) for meta in sorted(path.glob(f'*/{META_FILENAME}')))
+    return recordings
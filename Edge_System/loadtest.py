@@ -0,0 +1,548 @@
+"""
+Service System 부하 테스트 (Edge/모바일 클라이언트 시뮬레이터)
+
+로컬에 daphne를 띄우고(별도 DB/미디어, mysite.settings_loadtest) 가상의 Edge 장치와 모바일 앱을 동시에 실행하여
+서버 한 대가 감당하는 장치 수를 측정
+    - Edge: DjangoAPIClient로 합성 이미지/영상이 첨부된 낙상 알림을 장치당 분당 --edge-rate 건 전송 (포아송 간격)
+    - 모바일: api_root/Post/ 를 --poll-interval 초마다 조회(If-None-Match)하고 ws/notifications/ 소켓을 계속 유지
+
+출력: 알림 업로드/목록 조회 처리량, 지연 p50/p99, 오류율, WebSocket 연결 실패/끊김,
+      알림 전달 지연(Edge 요청 시작 → 모든 모바일 소켓 수신)과 누락률 (JSON: --output)
+
+사용법:
+    python loadtest.py --edge-clients 10 --edge-rate 6 --mobile-clients 50 --duration 60
+    python loadtest.py --edge-clients 20 --api-path api_async --output result.json
+    python loadtest.py --url http://127.0.0.1:8000 --token <토큰>    # 이미 실행 중인 서버 (데이터가 쌓임)
+
+WebSocket 클라이언트 라이브러리 없이 동작하도록 최소 RFC 6455 클라이언트(텍스트/ping/close)를 포함
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import shutil
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import cv2
+import numpy as np
+import requests
+
+from api_client import DjangoAPIClient
+from metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent / 'Service_System'
+
+
+# ========== 통계 ==========
+
+class RequestStats:
+    """스레드 안전한 요청 지연/성공 집계"""
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.ok = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool):
+        with self._lock:
+            self.histogram.observe(seconds)
+            if ok:
+                self.ok += 1
+            else:
+                self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        total = self.ok + self.errors
+        return {
+            'requests': total,
+            'errors': self.errors,
+            'error_rate': self.errors / total if total else 0.0,
+            'per_second': total / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': self.histogram.percentile(50) * 1000,
+            'p99_ms': self.histogram.percentile(99) * 1000,
+        }
+
+
+# ========== 최소 WebSocket 클라이언트 ==========
+
+class WebSocketClient:
+    """RFC 6455 클라이언트 (텍스트 메시지 송수신, ping 응답, close만 지원)"""
+
+    GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parsed = urlparse(url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        self.reader = self.sock.makefile('rb')
+        self._send_lock = threading.Lock()
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall((
+            f"GET {parsed.path or '/'} HTTP/1.1\r\n"
+            f"Host: {parsed.netloc}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            f"Origin: http://{parsed.netloc}\r\n\r\n"
+        ).encode())
+
+        status = self.reader.readline()
+        headers = {}
+        while True:
+            line = self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        accept = base64.b64encode(hashlib.sha1((key + self.GUID).encode()).digest()).decode()
+        if b' 101 ' not in status or headers.get('sec-websocket-accept') != accept:
+            self.sock.close()
+            raise ConnectionError(f"WebSocket handshake failed: {status.decode('latin-1').strip()}")
+        self.sock.settimeout(None)
+
+    def _read_exact(self, size: int) -> bytes:
+        data = self.reader.read(size)
+        if len(data) < size:
+            raise ConnectionError('WebSocket closed')
+        return data
+
+    def _send_frame(self, opcode: int, payload: bytes):
+        # 클라이언트 → 서버 프레임은 반드시 마스킹
+        mask = os.urandom(4)
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('!BB', 0x80 | opcode, 0x80 | length)
+        elif length < 65536:
+            header = struct.pack('!BBH', 0x80 | opcode, 0x80 | 126, length)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 0x80 | 127, length)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        with self._send_lock:
+            self.sock.sendall(header + mask + masked)
+
+    def send_text(self, text: str):
+        self._send_frame(0x1, text.encode('utf-8'))
+
+    def recv(self) -> Optional[str]:
+        """다음 텍스트 메시지 (서버가 닫으면 None)"""
+        message = b''
+        while True:
+            first, second = self._read_exact(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', self._read_exact(8))[0]
+            mask = self._read_exact(4) if second & 0x80 else None
+            payload = self._read_exact(length) if length else b''
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+            if opcode == 0x8:  # close
+                return None
+            if opcode == 0x9:  # ping
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:  # pong
+                continue
+            message += payload
+            if first & 0x80:  # 마지막 조각
+                return message.decode('utf-8')
+
+    def close(self):
+        try:
+            self._send_frame(0x8, struct.pack('!H', 1000))
+        except OSError:
+            pass
+        try:
+            # 다른 스레드의 recv()를 깨우기 위해 shutdown 후 close
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+# ========== 서버 ==========
+
+class LocalServer:
+    """별도 DB/미디어 디렉토리로 마이그레이션 후 daphne 실행 (mysite.settings_loadtest)"""
+
+    def __init__(self, service_dir: Path, workdir: Path, port: int):
+        self.service_dir = service_dir
+        self.workdir = workdir
+        self.url = f'http://127.0.0.1:{port}'
+        self.port = port
+        self.process = None
+        self.env = dict(os.environ, DJANGO_SETTINGS_MODULE='mysite.settings_loadtest', LOADTEST_DIR=str(workdir))
+
+    def manage(self, *args) -> str:
+        result = subprocess.run([sys.executable, 'manage.py', *args], cwd=self.service_dir, env=self.env,
+                                capture_output=True, text=True, check=True)
+        return result.stdout
+
+    def start(self, timeout: float = 30.0) -> dict:
+        """
+        서버 시작
+
+        Returns:
+            {'token': 부하 테스트 Admin 사용자 토큰, 'author_id': 사용자 ID}
+        """
+        self.manage('migrate', '--noinput', '-v', '0')
+        output = self.manage('shell', '-v', '0', '-c', (
+            "from django.contrib.auth.models import User\n"
+            "from rest_framework.authtoken.models import Token\n"
+            "user, _ = User.objects.get_or_create(username='loadtest', defaults={'is_staff': True})\n"
+            "print(Token.objects.get_or_create(user=user)[0].key, user.pk)\n"
+        ))
+        token, author_id = output.split()[-2:]
+
+        self.log = open(self.workdir / 'daphne.log', 'w')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'daphne', '-b', '127.0.0.1', '-p', str(self.port), 'mysite.asgi:application'],
+            cwd=self.service_dir, env=self.env, stdout=self.log, stderr=subprocess.STDOUT)
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'daphne exited (see {self.workdir / "daphne.log"})')
+            try:
+                requests.get(f'{self.url}/api_root/', timeout=1)
+                break
+            except requests.exceptions.RequestException:
+                time.sleep(0.2)
+        else:
+            self.stop()
+            raise RuntimeError(f'daphne did not start within {timeout:.0f}s')
+        logger.info(f"daphne started at {self.url} (data: {self.workdir})")
+        return {'token': token, 'author_id': int(author_id)}
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.process is not None:
+            self.log.close()
+
+
+# ========== 시뮬레이터 ==========
+
+def synthetic_image(path: Path, label: str, rng: np.random.Generator):
+    """카메라 프레임 크기의 합성 JPEG (내용이 매번 달라 서버 중복 제거에 걸리지 않음)"""
+    frame = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    cv2.putText(frame, label, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    cv2.imwrite(str(path), frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+
+
+def synthetic_fall_info(rng: random.Random) -> dict:
+    """DjangoAPIClient.build_fall_event 입력 형식의 낙상 정보"""
+    return {
+        'timestamp': datetime.now(),
+        'confidence': rng.uniform(0.6, 0.95),
+        'bbox': [rng.randint(0, 300), rng.randint(0, 200), rng.randint(340, 640), rng.randint(260, 480)],
+        'keypoints': [[rng.uniform(0, 640), rng.uniform(0, 480), rng.uniform(0.5, 1.0)] for _ in range(17)],
+        'analysis': {
+            'fall_score': rng.uniform(0.5, 1.0),
+            'reason': 'load test',
+            'details': {'bbox_aspect_ratio': rng.uniform(1.0, 2.5), 'body_angle': rng.uniform(40, 90)},
+        },
+    }
+
+
+class EdgeSimulator(threading.Thread):
+    """가상의 Edge 장치: 분당 rate건(포아송 간격)의 낙상 알림 업로드"""
+
+    def __init__(self, name: str, api_config: SimpleNamespace, rate_per_minute: float, video_kb: int,
+                 reuse_media: bool, workdir: Path, stats: RequestStats, sent: Dict[str, float],
+                 stop_event: threading.Event, seed: int):
+        super().__init__(name=name, daemon=True)
+        self.client = DjangoAPIClient(SimpleNamespace(**vars(api_config), CAMERA_ID=name))
+        self.rate = rate_per_minute / 60.0
+        self.video_bytes = video_kb * 1024
+        self.reuse_media = reuse_media
+        self.workdir = workdir / name
+        self.stats = stats
+        self.sent = sent
+        self.stop_event = stop_event
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+
+    def prepare_media(self, sequence: int):
+        image_path = self.workdir / f'{sequence}.jpg'
+        video_path = self.workdir / f'{sequence}.mp4'
+        if self.reuse_media and sequence > 0:
+            # 재전송/중복 업로드 시나리오: 첫 파일 재사용 → HEAD 사전 확인 후 해시만 전송
+            return self.workdir / '0.jpg', self.workdir / '0.mp4'
+        synthetic_image(image_path, f'{self.name} #{sequence}', self.np_rng)
+        video_path.write_bytes(os.urandom(self.video_bytes))
+        return image_path, video_path
+
+    def run(self):
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        sequence = 0
+        next_time = time.monotonic() + self.rng.expovariate(self.rate)
+        while not self.stop_event.wait(max(0.0, next_time - time.monotonic())):
+            image_path, video_path = self.prepare_media(sequence)
+            title = f'[부하 테스트] {self.name} #{sequence}'
+            started = time.monotonic()
+            ok = self.client.create_fall_post(title, '부하 테스트 알림', str(image_path), str(video_path),
+                                              fall_event=self.client.build_fall_event(synthetic_fall_info(self.rng)))
+            self.stats.record(time.monotonic() - started, ok)
+            if ok:
+                self.sent[title] = started
+            if not self.reuse_media:
+                image_path.unlink(missing_ok=True)
+                video_path.unlink(missing_ok=True)
+            sequence += 1
+            next_time += self.rng.expovariate(self.rate)
+
+
+class MobileSimulator(threading.Thread):
+    """가상의 모바일 앱: 알림 소켓 유지 + 게시글 목록 주기 조회 (ETag)"""
+
+    def __init__(self, name: str, base_url: str, token: str, poll_interval: float, poll_stats: RequestStats,
+                 connect_stats: RequestStats, stop_event: threading.Event, seed: int):
+        super().__init__(name=name, daemon=True)
+        self.base_url = base_url
+        self.token = token
+        self.poll_interval = poll_interval
+        self.poll_stats = poll_stats
+        self.connect_stats = connect_stats
+        self.stop_event = stop_event
+        self.rng = random.Random(seed)
+        self.socket = None
+        self.received = {}  # 알림 제목 → 수신 시각 (monotonic)
+        self.disconnected = False
+        self.closing = False
+
+    def connect(self) -> bool:
+        ws_url = 'ws' + self.base_url[len('http'):] + '/ws/notifications/'
+        started = time.monotonic()
+        try:
+            self.socket = WebSocketClient(ws_url)
+        except (OSError, ConnectionError) as e:
+            logger.warning(f"{self.name}: WebSocket connect failed: {e}")
+            self.connect_stats.record(time.monotonic() - started, False)
+            return False
+        self.connect_stats.record(time.monotonic() - started, True)
+        threading.Thread(target=self.read_notifications, name=f'{self.name}-ws', daemon=True).start()
+        return True
+
+    def read_notifications(self):
+        try:
+            while True:
+                text = self.socket.recv()
+                if text is None:
+                    break
+                message = json.loads(text)
+                if message.get('type') == 'fall_detected':
+                    self.received.setdefault(message['title'], time.monotonic())
+        except (OSError, ConnectionError, ValueError):
+            pass
+        if not self.closing:
+            logger.warning(f"{self.name}: WebSocket closed by server")
+            self.disconnected = True
+
+    def run(self):
+        self.connect()
+        session = requests.Session()
+        session.headers['Authorization'] = f'Token {self.token}'
+        etag = None
+        # 모든 앱이 같은 순간에 조회하지 않도록 시작 시점 분산
+        delay = self.rng.uniform(0, self.poll_interval)
+        while not self.stop_event.wait(delay):
+            headers = {'If-None-Match': etag} if etag else {}
+            started = time.monotonic()
+            try:
+                response = session.get(f'{self.base_url}/api_root/Post/', headers=headers, timeout=30)
+                ok = response.status_code in (200, 304)
+                if response.status_code == 200:
+                    etag = response.headers.get('ETag')
+            except requests.exceptions.RequestException:
+                ok = False
+            self.poll_stats.record(time.monotonic() - started, ok)
+            delay = self.poll_interval
+
+    def close(self):
+        self.closing = True
+        if self.socket is not None:
+            self.socket.close()
+
+
+# ========== 실행/보고 ==========
+
+def run_load(args, base_url: str, token: str, author_id: int, workdir: Path) -> dict:
+    api_config = SimpleNamespace(
+        API_ENDPOINT=f'{base_url}/{args.api_path}/Post/',
+        MEDIA_ENDPOINT=f'{base_url}/api_root/Media/',
+        AUTHOR_ID=author_id,
+        API_TOKEN=token,
+    )
+    stop_event = threading.Event()
+    edge_stats, poll_stats, connect_stats = RequestStats(), RequestStats(), RequestStats()
+    sent = {}
+
+    mobiles = [MobileSimulator(f'mobile-{i}', base_url, token, args.poll_interval, poll_stats, connect_stats,
+                               stop_event, args.seed + i)
+               for i in range(args.mobile_clients)]
+    edges = [EdgeSimulator(f'edge-{i}', api_config, args.edge_rate, args.video_kb, args.reuse_media,
+                           workdir / 'edge_media', edge_stats, sent, stop_event, args.seed + 10000 + i)
+             for i in range(args.edge_clients)]
+
+    logger.info(f"{len(mobiles)} mobile clients, {len(edges)} edge clients "
+                f"({args.edge_rate:g} alerts/min each) for {args.duration:g}s")
+    for mobile in mobiles:
+        mobile.start()
+    time.sleep(1.0)  # 소켓 연결 후 Edge 시작
+    started = time.monotonic()
+    for edge in edges:
+        edge.start()
+    stop_event.wait(args.duration)
+    stop_event.set()
+    for thread in edges + mobiles:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    # 마지막 알림이 전달될 시간
+    time.sleep(args.grace)
+    for mobile in mobiles:
+        mobile.close()
+
+    delivery = Histogram()
+    connected = [mobile for mobile in mobiles if mobile.socket is not None]
+    expected = len(sent) * len(connected)
+    delivered = 0
+    for mobile in connected:
+        for title, sent_at in sent.items():
+            received_at = mobile.received.get(title)
+            if received_at is not None:
+                delivered += 1
+                delivery.observe(max(0.0, received_at - sent_at))
+
+    return {
+        'config': {
+            'edge_clients': args.edge_clients,
+            'edge_rate_per_minute': args.edge_rate,
+            'video_kb': args.video_kb,
+            'reuse_media': args.reuse_media,
+            'api_path': args.api_path,
+            'mobile_clients': args.mobile_clients,
+            'poll_interval_s': args.poll_interval,
+            'duration_s': args.duration,
+        },
+        'elapsed_s': elapsed,
+        'alert_upload': edge_stats.summary(elapsed),
+        'post_list_poll': poll_stats.summary(elapsed),
+        'websocket': {
+            'connected': len(connected),
+            'connect_failures': connect_stats.errors,
+            'connect_p99_ms': connect_stats.histogram.percentile(99) * 1000,
+            'disconnects': sum(mobile.disconnected for mobile in connected),
+        },
+        'notification': {
+            'expected': expected,
+            'delivered': delivered,
+            'loss_rate': (expected - delivered) / expected if expected else 0.0,
+            'p50_ms': delivery.percentile(50) * 1000,
+            'p99_ms': delivery.percentile(99) * 1000,
+        },
+    }
+
+
+def print_report(report: dict):
+    """주요 지표 출력"""
+    print('=' * 60)
+    for section, label in (('alert_upload', 'Alert upload (edge)'), ('post_list_poll', 'Post list poll (mobile)')):
+        data = report[section]
+        print(f"{label:<25} {data['requests']:6d} req  {data['per_second']:7.2f}/s  "
+              f"p50 {data['p50_ms']:8.1f}ms  p99 {data['p99_ms']:8.1f}ms  errors {data['error_rate']:6.1%}")
+    ws = report['websocket']
+    print(f"{'WebSocket':<25} {ws['connected']:6d} connected  {ws['connect_failures']} failed  "
+          f"{ws['disconnects']} dropped")
+    notification = report['notification']
+    print(f"{'Notification delivery':<25} {notification['delivered']:6d}/{notification['expected']}  "
+          f"p50 {notification['p50_ms']:8.1f}ms  p99 {notification['p99_ms']:8.1f}ms  "
+          f"lost {notification['loss_rate']:6.1%}")
+    print('=' * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Service System load test with simulated edge and mobile clients')
+    parser.add_argument('--edge-clients', type=int, default=5, help='Number of simulated edge devices')
+    parser.add_argument('--edge-rate', type=float, default=6.0, help='Fall alerts per minute per edge device')
+    parser.add_argument('--video-kb', type=int, default=512, help='Synthetic video size per alert (KB)')
+    parser.add_argument('--reuse-media', action='store_true',
+                        help='Re-send the same media per device (exercises the SHA-256 preflight)')
+    parser.add_argument('--api-path', choices=('api_root', 'api_async'), default='api_root',
+                        help='Endpoint the edge clients post alerts to')
+    parser.add_argument('--mobile-clients', type=int, default=20,
+                        help='Number of simulated phones (one WebSocket each)')
+    parser.add_argument('--poll-interval', type=float, default=5.0, help='Post list poll interval per phone (s)')
+    parser.add_argument('--duration', type=float, default=60.0, help='Load duration (s)')
+    parser.add_argument('--grace', type=float, default=3.0,
+                        help='Seconds to wait for in-flight notifications after the load stops')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--url', help='Use an already running server instead of starting daphne')
+    parser.add_argument('--token', help='API token of a staff user (required with --url)')
+    parser.add_argument('--author-id', type=int, default=1, help='Post author ID (with --url)')
+    parser.add_argument('--service-dir', default=str(SERVICE_DIR), help='Service_System directory')
+    parser.add_argument('--port', type=int, default=8765, help='Port of the local daphne server')
+    parser.add_argument('--workdir', help='Keep the local server DB/media/logs here (default: temporary)')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+    if args.url and not args.token:
+        parser.error('--url requires --token')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # 업로드마다 남는 성공 로그는 생략
+    logging.getLogger('api_client').setLevel(logging.WARNING)
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix='loadtest_'))
+    workdir.mkdir(parents=True, exist_ok=True)
+    server = None
+    try:
+        if args.url:
+            base_url, token, author_id = args.url.rstrip('/'), args.token, args.author_id
+        else:
+            server = LocalServer(Path(args.service_dir), workdir, args.port)
+            credentials = server.start()
+            base_url, token, author_id = server.url, credentials['token'], credentials['author_id']
+        report = run_load(args, base_url, token, author_id, workdir)
+    finally:
+        if server is not None:
+            server.stop()
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,16 +4,26 @@ YOLOv11n-pose 단독 사용 버전
 """
 
 import cv2
+import functools
 import logging
+import signal
+import threading
 import time
 import argparse
 from datetime import datetime
 from collections import deque
 from pathlib import Path
+from typing import Callable, Optional
 
 import config
 from fall_detector import FallDetector
 from api_client import DjangoAPIClient
+from telemetry import TelemetryReporter
+from metrics import REGISTRY, MetricsServer
+from keypoint_recording import KeypointRecorder
+from video_encoder import FallClipRecorder, pack_frame
+from passthrough import create_passthrough
+from media_janitor import MediaJanitor
 
 # 로깅 설정
 logging.basicConfig(
@@ -26,7 +36,7 @@ logger = logging.getLogger(__name__)
 class FallDetectionSystem:
     """낙상 감지 시스템 메인 클래스"""
 
-    def __init__(self, camera_source=None):
+    def __init__(self, camera_source=None, detector=None):
         logger.info("="*60)
         logger.info("Fall Detection System - YOLOv11n-pose Single Model")
         logger.info("="*60)
@@ -34,8 +44,8 @@ class FallDetectionSystem:
         # 카메라 소스 설정
         self.camera_source = camera_source if camera_source is not None else config.CAMERA_SOURCE
 
-        # 낙상 감지기 초기화
-        self.detector = FallDetector(config)
+        # 낙상 감지기 초기화 (supervisor.py는 공유 추론 프로세스를 쓰는 감지기를 전달)
+        self.detector = detector if detector is not None else FallDetector(config)
 
         # 모델 정보 출력
         model_info = self.detector.get_model_info()
@@ -46,6 +56,36 @@ class FallDetectionSystem:
         # API 클라이언트 초기화
         self.api_client = DjangoAPIClient(config)
 
+        # 텔레메트리 (FPS/지연/큐 깊이 등을 서버로 주기 전송)
+        self.telemetry = TelemetryReporter(config, self.api_client) if config.TELEMETRY_ENABLED else None
+
+        # 계측 (단계별 지연 히스토그램, /metrics 엔드포인트)
+        self.metrics = REGISTRY
+        self.timers = {stage: self.metrics.stage_timer(stage)
+                       for stage in ('capture', 'resize', 'buffer_copy', 'imshow')}
+        self.frame_latency = self.metrics.histogram('stage_latency_seconds', stage='frame_total')
+        self.frames_counter = self.metrics.counter('frames_total', 'Frames processed')
+        self.alerts_counter = {
+            result: self.metrics.counter('alerts_total', 'Fall alerts sent to the server', result=result)
+            for result in ('success', 'failure')
+        }
+        self.metrics_server = MetricsServer(self.metrics, config.METRICS_HOST, config.METRICS_PORT) \
+            if config.METRICS_ENABLED else None
+
+        # 로컬 낙상 미디어 정리 (서버 업로드 확인 후 삭제, 용량 제한)
+        self.media_janitor = MediaJanitor(config) if config.MEDIA_JANITOR_ENABLED else None
+
+        # 키포인트 녹화 (카메라/모델 없이 파라미터 튜닝용, benchmark.py --keypoints 로 재생)
+        self.keypoint_recorder = None
+
+        # RTSP 원본 스트림 보관 (설정 시 낙상 영상을 재인코딩 없이 remux)
+        self.passthrough = None
+
+        # 분석 해상도 (None: 캡처 해상도 그대로 분석), 녹화 좌표 변환 비율, 버퍼 JPEG 품질
+        self.analysis_size = None
+        self.record_scale = None
+        self.buffer_jpeg_quality = 0
+
         # 카메라 초기화
         self.cap = None
         self.init_camera()
@@ -67,15 +107,21 @@ class FallDetectionSystem:
         buffer_size = int(config.VIDEO_FPS * config.VIDEO_BUFFER_SECONDS)
         self.frame_buffer = deque(maxlen=buffer_size)
 
-        # 낙상 감지 후 녹화 상태
+        # 낙상 감지 후 녹화 상태 (프레임은 모으지 않고 녹화하는 동안 바로 인코딩)
         self.recording_fall = False
-        self.fall_video_frames = []
-        self.fall_video_timestamps = []  # 프레임 타임스탬프 저장
+        self.clip_recorder = None
+        self.finish_threads = []  # 인코딩 마무리/업로드 중인 스레드
         self.frames_after_fall = 0
         self.frames_to_record_after = int(config.VIDEO_FPS * config.VIDEO_RECORD_AFTER_SECONDS)
         self.current_fall_info = None
         self.recording_start_time = None
 
+        # 실행 상태 (headless 모드에서는 키 입력 대신 시그널로 종료/통계 출력)
+        self.headless = config.HEADLESS
+        self.running = False
+        self.statistics_requested = False
+        self.run_start_time = None
+
         logger.info("System initialized successfully")
 
     def init_camera(self):
@@ -99,6 +145,28 @@ class FallDetectionSystem:
 
         logger.info(f"Camera resolution: {actual_width}x{actual_height} @ {actual_fps}fps")
 
+        # 분석/녹화 해상도 분리: 추론은 축소 프레임, 녹화는 원본 해상도 (버퍼는 JPEG 압축)
+        analysis_height = actual_height
+        if 0 < config.ANALYSIS_WIDTH < actual_width:
+            analysis_width = config.ANALYSIS_WIDTH
+            analysis_height = round(actual_height * analysis_width / actual_width / 2) * 2
+            self.analysis_size = (analysis_width, analysis_height)
+            self.record_scale = (actual_width / analysis_width, actual_height / analysis_height)
+            self.buffer_jpeg_quality = config.VIDEO_BUFFER_JPEG_QUALITY
+            # 실시간 프레임(분석 해상도)에 그린 결과는 녹화 프레임에 남지 않으므로 감지 결과를 보관했다가 다시 그림
+            self.detector.defer_overlays = config.DEBUG_MODE
+            logger.info(f"Analysis resolution: {analysis_width}x{analysis_height} "
+                        f"(recording at {actual_width}x{actual_height}, buffer JPEG quality "
+                        f"{self.buffer_jpeg_quality or 'off'})")
+
+        if config.KEYPOINT_RECORDING_DIR:
+            directory = Path(config.KEYPOINT_RECORDING_DIR) / datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.keypoint_recorder = KeypointRecorder(directory, fps=actual_fps or config.FPS,
+                                                      frame_height=analysis_height, camera_id=config.CAMERA_ID)
+            logger.info(f"Recording keypoints to {directory}")
+
+        self.passthrough = create_passthrough(config, self.camera_source)
+
     def calculate_fps(self):
         """FPS 계산"""
         self.frame_count += 1
@@ -111,34 +179,98 @@ class FallDetectionSystem:
 
         return self.fps
 
+    def install_signal_handlers(self):
+        """SIGTERM/SIGINT: 종료, SIGUSR1: 통계 출력 (headless 모드의 'q'/'s' 키 대체)"""
+        def request_stop(signum, frame):
+            logger.info(f"Received signal {signum}, shutting down")
+            self.running = False
+
+        def request_statistics(signum, frame):
+            self.statistics_requested = True
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+        if hasattr(signal, 'SIGUSR1'):  # Windows에는 없음
+            signal.signal(signal.SIGUSR1, request_statistics)
+
     def run(self):
         """메인 루프 실행"""
         logger.info("Starting fall detection system...")
-        logger.info("Press 'q' to quit, 's' to show statistics")
+        if self.headless:
+            logger.info("Headless mode: send SIGTERM/SIGINT to quit, SIGUSR1 to show statistics")
+            self.install_signal_handlers()
+        else:
+            logger.info("Press 'q' to quit, 's' to show statistics")
 
         # API 연결 테스트
         if not self.api_client.test_connection():
             logger.warning("Cannot connect to Django server. System will run in offline mode.")
 
+        if self.telemetry is not None:
+            self.telemetry.start()
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+        if self.media_janitor is not None:
+            self.media_janitor.start()
+
+        self.running = True
+        self.run_start_time = time.monotonic()
+
         try:
-            while True:
-                ret, frame = self.cap.read()
+            while self.running:
+                with self.timers['capture']:
+                    ret, frame = self.cap.read()
 
                 if not ret:
                     logger.error("Failed to read frame from camera")
                     break
 
                 self.stats['total_frames'] += 1
+                self.frames_counter.inc()
 
-                # 현재 시간 저장
+                # 현재 시간 저장 (current_time: epoch, passthrough 세그먼트 이름과 맞춤 /
+                # capture_time: monotonic, 영상 프레임 간격과 지연 측정용이라 시계 조정(NTP)의 영향을 받지 않음)
                 current_time = time.time()
+                capture_time = time.monotonic()
+
+                # 분석용 축소 프레임 (한 번만 축소하여 추론/ROI/화면 표시에 재사용)
+                analysis_frame = frame
+                if self.analysis_size is not None:
+                    with self.timers['resize']:
+                        analysis_frame = cv2.resize(frame, self.analysis_size, interpolation=cv2.INTER_AREA)
 
                 # 낙상 감지 처리
-                processed_frame, is_fall_detected, fall_info = self.detector.process_frame(frame)
+                processed_frame, is_fall_detected, fall_info = self.detector.process_frame(analysis_frame,
+                                                                                           capture_time)
+                if is_fall_detected:
+                    # 캡처 -> 낙상 확정 지연 (capture_time과 같은 monotonic 시계)
+                    fall_info['confirmed_time'] = time.monotonic()
+                    self.metrics.observe_e2e('capture_to_confirm', fall_info['confirmed_time'] - capture_time)
+                    if self.record_scale is not None:
+                        # 썸네일도 원본 해상도로 저장
+                        fall_info['frame'] = frame.copy()
+                        fall_info['overlays'] = self.detector.scale_overlays(fall_info['overlays'],
+                                                                             *self.record_scale)
+
+                if self.keypoint_recorder is not None:
+                    self.keypoint_recorder.add(capture_time, self.detector.last_detections,
+                                               skipped=self.detector.last_skipped)
+
+                if self.telemetry is not None:
+                    self.telemetry.record_frame(capture_time, time.monotonic() - capture_time,
+                                                len(self.frame_buffer) +
+                                                (self.clip_recorder.backlog if self.clip_recorder else 0),
+                                                sum(thread.is_alive() for thread in self.finish_threads))
 
                 # 프레임 버퍼에 원본 프레임과 타임스탬프 저장 (낙상 감지 전 7초 보관)
-                if not self.recording_fall:
-                    self.frame_buffer.append((frame.copy(), current_time))
+                # (headless 모드에서는 영상 저장 시 그릴 감지 결과도 함께 보관)
+                overlays = self.detector.last_overlays if self.detector.defer_overlays else None
+                # (passthrough 모드에서는 카메라 스트림 세그먼트가 버퍼 역할)
+                if self.passthrough is not None:
+                    self.passthrough.poll(current_time)
+                elif not self.recording_fall:
+                    with self.timers['buffer_copy']:
+                        self.frame_buffer.append((pack_frame(frame, self.buffer_jpeg_quality), capture_time, overlays))
 
                 # 낙상 감지 시 처리
                 if is_fall_detected and not self.recording_fall:
@@ -147,31 +279,48 @@ class FallDetectionSystem:
                     self.current_fall_info = fall_info
                     self.frames_after_fall = 0
                     self.recording_start_time = current_time
-                    # 버퍼의 프레임들과 타임스탬프를 비디오 리스트로 복사 (낙상 전 7초)
-                    self.fall_video_frames = [f[0] for f in self.frame_buffer]  # 프레임만 추출
-                    self.fall_video_timestamps = [f[1] for f in self.frame_buffer]  # 타임스탬프만 추출
-                    logger.info(f"Started recording fall video. Buffer frames: {len(self.fall_video_frames)}")
+                    # 버퍼의 프레임(낙상 전 7초)부터 인코딩 시작
+                    if config.SAVE_FALL_VIDEOS and self.frame_buffer:
+                        self.clip_recorder = self.start_fall_video(fall_info)
+                    logger.info(f"Started recording fall video. Buffer frames: {len(self.frame_buffer)}")
 
                 # 낙상 감지 후 추가 녹화
                 if self.recording_fall:
-                    self.fall_video_frames.append(frame.copy())
-                    self.fall_video_timestamps.append(current_time)
+                    if self.clip_recorder is not None:
+                        with self.timers['buffer_copy']:
+                            self.clip_recorder.add(frame.copy(), overlays, capture_time)
                     self.frames_after_fall += 1
 
                     # 낙상 후 5초 녹화 완료
                     if self.frames_after_fall >= self.frames_to_record_after:
-                        logger.info(f"Finished recording fall video. Total frames: {len(self.fall_video_frames)}")
-                        self.handle_fall_detection(self.current_fall_info, self.fall_video_frames, self.fall_video_timestamps)
+                        logger.info("Finished recording fall video")
+                        # 남은 인코딩 대기(최대 60초) 또는 세그먼트 대기/remux와 업로드는 캡처 루프 밖에서
+                        if self.clip_recorder is not None:
+                            self.finish_fall_video(self.current_fall_info, self.clip_recorder.finish)
+                        elif self.passthrough is not None:
+                            start_time = self.recording_start_time - config.VIDEO_BUFFER_SECONDS
+                            self.finish_fall_video(self.current_fall_info, functools.partial(
+                                self.save_passthrough_video, self.current_fall_info, start_time, current_time))
+                        else:
+                            self.handle_fall_detection(self.current_fall_info)
                         # 녹화 상태 초기화
                         self.recording_fall = False
-                        self.fall_video_frames = []
-                        self.fall_video_timestamps = []
+                        self.clip_recorder = None
                         self.current_fall_info = None
                         self.recording_start_time = None
 
+                fps = self.calculate_fps()
+
+                if self.headless:
+                    # 창/오버레이 없이 다음 프레임으로 (키 입력 대신 시그널 처리)
+                    self.frame_latency.observe(time.monotonic() - capture_time)
+                    if self.statistics_requested:
+                        self.statistics_requested = False
+                        self.print_statistics()
+                    continue
+
                 # FPS 표시
                 if config.SHOW_FPS:
-                    fps = self.calculate_fps()
                     cv2.putText(processed_frame, f"FPS: {fps:.1f}",
                               (10, processed_frame.shape[0] - 10),
                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
@@ -191,10 +340,14 @@ class FallDetectionSystem:
                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
 
                 # 화면 표시
-                cv2.imshow('Fall Detection System', processed_frame)
+                with self.timers['imshow']:
+                    cv2.imshow('Fall Detection System', processed_frame)
+
+                    # 키보드 입력 처리
+                    key = cv2.waitKey(1) & 0xFF
+
+                self.frame_latency.observe(time.monotonic() - capture_time)
 
-                # 키보드 입력 처리
-                key = cv2.waitKey(1) & 0xFF
                 if key == ord('q'):
                     logger.info("User requested quit")
                     break
@@ -207,8 +360,8 @@ class FallDetectionSystem:
         finally:
             self.cleanup()
 
-    def handle_fall_detection(self, fall_info: dict, video_frames: list = None, video_timestamps: list = None):
-        """낙상 감지 처리"""
+    def handle_fall_detection(self, fall_info: dict, video_path: str = None):
+        """낙상 감지 처리 (video_path: 녹화가 끝난 낙상 영상)"""
         logger.warning("=" * 60)
         logger.warning("FALL DETECTED!")
         logger.warning(f"Time: {fall_info['timestamp']}")
@@ -220,64 +373,77 @@ class FallDetectionSystem:
         # 낙상 이미지 저장 (썸네일용)
         image_path = self.detector.save_fall_image(fall_info)
 
-        # 낙상 비디오 저장 (12초)
-        video_path = None
-        if video_frames and config.SAVE_FALL_VIDEOS:
-            video_path = self.save_fall_video(fall_info, video_frames, video_timestamps)
-
         # Django 서버로 알림 전송 (이미지 + 비디오)
         try:
             success = self.api_client.create_fall_alert(fall_info, image_path, video_path)
 
             if success:
                 logger.info("Fall alert sent to Django server successfully")
+                self.alerts_counter['success'].inc()
+                self.record_alert_latency(fall_info)
+                if self.media_janitor is not None:
+                    self.media_janitor.acknowledge(image_path, video_path)
             else:
                 logger.error("Failed to send fall alert to Django server")
+                self.alerts_counter['failure'].inc()
 
         except Exception as e:
             logger.error(f"Error sending fall alert: {e}")
 
-    def save_fall_video(self, fall_info: dict, video_frames: list, video_timestamps: list = None) -> str:
-        """낙상 비디오 저장 (12초)"""
+    def record_alert_latency(self, fall_info: dict):
+        """서버 응답(알림 확인) 시점까지의 종단 간 지연 기록"""
+        acked_time = time.monotonic()
+        if 'confirmed_time' in fall_info:
+            self.metrics.observe_e2e('confirm_to_ack', acked_time - fall_info['confirmed_time'])
+        if 'capture_time' in fall_info:
+            self.metrics.observe_e2e('capture_to_ack', acked_time - fall_info['capture_time'])
+            logger.info(f"End-to-end latency (frame captured -> alert acknowledged): "
+                        f"{acked_time - fall_info['capture_time']:.2f}s")
+
+    def start_fall_video(self, fall_info: dict) -> FallClipRecorder:
+        """낙상 비디오 녹화 시작 (12초, 낙상 전 버퍼부터 백그라운드 인코딩)"""
         timestamp = fall_info['timestamp'].strftime("%Y%m%d_%H%M%S")
-        video_filename = f"fall_{timestamp}.mp4"
-        video_path = Path(config.FALL_VIDEOS_DIR) / video_filename
-
-        try:
-            # 실제 FPS 계산 (타임스탬프가 있는 경우)
-            actual_fps = config.VIDEO_FPS  # 기본값
-            if video_timestamps and len(video_timestamps) > 1:
-                # 실제 경과 시간 계산
-                total_duration = video_timestamps[-1] - video_timestamps[0]
-                if total_duration > 0:
-                    actual_fps = (len(video_frames) - 1) / total_duration
-                    logger.info(f"Calculated actual FPS: {actual_fps:.2f} (from {len(video_frames)} frames over {total_duration:.2f}s)")
-                else:
-                    logger.warning("Video duration is 0, using config FPS")
-            else:
-                logger.warning("No timestamps available, using config FPS")
-
-            # 비디오 작성기 초기화
-            height, width = video_frames[0].shape[:2]
-            fourcc = cv2.VideoWriter_fourcc(*config.VIDEO_CODEC)
-            video_writer = cv2.VideoWriter(
-                str(video_path),
-                fourcc,
-                actual_fps,  # 실제 FPS 사용
-                (width, height)
-            )
-
-            # 프레임 쓰기
-            for frame in video_frames:
-                video_writer.write(frame)
-
-            video_writer.release()
-            logger.info(f"Fall video saved: {video_path} ({len(video_frames)} frames @ {actual_fps:.2f}fps)")
-            return str(video_path)
-
-        except Exception as e:
-            logger.error(f"Error saving fall video: {e}")
-            return None
+        video_path = Path(config.FALL_VIDEOS_DIR) / f"fall_{timestamp}.mp4"
+
+        # 인코더는 시작할 때 FPS가 필요하므로 버퍼 타임스탬프로 실제 FPS 추정
+        actual_fps = config.VIDEO_FPS  # 기본값
+        buffer_duration = self.frame_buffer[-1][1] - self.frame_buffer[0][1]
+        if len(self.frame_buffer) > 1 and buffer_duration > 0:
+            actual_fps = (len(self.frame_buffer) - 1) / buffer_duration
+            logger.info(f"Calculated actual FPS: {actual_fps:.2f} "
+                        f"(from {len(self.frame_buffer)} frames over {buffer_duration:.2f}s)")
+        else:
+            logger.warning("Cannot estimate FPS from buffer, using config FPS")
+
+        recorder = FallClipRecorder(config, video_path, actual_fps, annotate=self.annotate_record_frame)
+        recorder.start((frame, overlays, timestamp) for frame, timestamp, overlays in self.frame_buffer)
+        return recorder
+
+    def finish_fall_video(self, fall_info: dict, produce_video: Callable[[], Optional[str]]):
+        """
+        백그라운드 스레드에서 영상 완성을 기다린 뒤 알림 전송
+
+        Args:
+            produce_video: 영상 경로(실패 시 None)를 반환 (FallClipRecorder.finish 또는 passthrough 저장)
+        """
+        def finish():
+            self.handle_fall_detection(fall_info, produce_video())
+
+        thread = threading.Thread(target=finish, name='clip-finish', daemon=True)
+        self.finish_threads = [t for t in self.finish_threads if t.is_alive()] + [thread]
+        thread.start()
+
+    def annotate_record_frame(self, frame, overlays: list):
+        """녹화 프레임에 감지 결과 그리기 (분석 해상도 좌표를 녹화 해상도로 변환)"""
+        if self.record_scale is not None:
+            overlays = self.detector.scale_overlays(overlays, *self.record_scale)
+        return self.detector.annotate_frame(frame, overlays)
+
+    def save_passthrough_video(self, fall_info: dict, start_time: float, end_time: float) -> Optional[str]:
+        """카메라 원본 스트림에서 낙상 전후 구간(epoch 초)을 잘라 저장 (재인코딩 없음, clip-finish 스레드에서 실행)"""
+        timestamp = fall_info['timestamp'].strftime("%Y%m%d_%H%M%S")
+        video_path = Path(config.FALL_VIDEOS_DIR) / f"fall_{timestamp}.mp4"
+        return self.passthrough.save_clip(start_time, end_time, video_path)
 
     def print_statistics(self):
         """통계 출력"""
@@ -288,6 +454,14 @@ class FallDetectionSystem:
         logger.info(f"Total detections: {self.stats['total_detections']}")
         logger.info(f"Total falls detected: {self.stats['total_falls']}")
         logger.info(f"Average FPS: {self.fps:.1f}")
+        if self.run_start_time is not None:
+            elapsed = time.monotonic() - self.run_start_time
+            if elapsed > 0:
+                mode = 'headless' if self.headless else 'windowed'
+                logger.info(f"Overall FPS ({mode}): {self.stats['total_frames'] / elapsed:.1f}")
+        for name, summary in self.metrics.stage_summary().items():
+            logger.info(f"{name}: n={summary['count']} p50={summary['p50_ms']:.1f}ms "
+                        f"p95={summary['p95_ms']:.1f}ms p99={summary['p99_ms']:.1f}ms")
         logger.info("=" * 60)
 
     def cleanup(self):
@@ -297,10 +471,26 @@ class FallDetectionSystem:
         # 최종 통계 출력
         self.print_statistics()
 
+        if self.telemetry is not None:
+            self.telemetry.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.media_janitor is not None:
+            self.media_janitor.stop()
+        if self.keypoint_recorder is not None:
+            self.keypoint_recorder.close()
+        if self.clip_recorder is not None:
+            self.clip_recorder.finish()
+        for thread in self.finish_threads:  # 녹화를 마친 영상의 인코딩/업로드 완료 대기
+            thread.join()
+        if self.passthrough is not None:
+            self.passthrough.stop()
+
         if self.cap is not None:
             self.cap.release()
 
-        cv2.destroyAllWindows()
+        if not self.headless:
+            cv2.destroyAllWindows()
         logger.info("System shutdown complete")
 
 
@@ -311,6 +501,12 @@ def main():
                        help='Camera source (0 for webcam, or RTSP URL)')
     parser.add_argument('--debug', action='store_true',
                        help='Enable debug mode')
+    parser.add_argument('--headless', action='store_true',
+                       help='Run without display windows or live overlays (stop with SIGTERM/SIGINT)')
+    parser.add_argument('--record-keypoints', type=str, default=None, metavar='DIR',
+                       help='Dump per-frame detections to DIR for model-free replay (benchmark.py --keypoints)')
+    parser.add_argument('--passthrough', action='store_true',
+                       help='Save fall videos by remuxing the RTSP stream instead of re-encoding decoded frames')
     parser.add_argument('--model', type=str, default='yolov11n-pose.pt',
                        choices=['yolov11n-pose.pt', 'yolov8n-pose.pt'],
                        help='YOLO-pose model to use')
@@ -322,6 +518,16 @@ def main():
         config.DEBUG_MODE = True
         logging.getLogger().setLevel(logging.DEBUG)
 
+    # headless 모드 설정
+    if args.headless:
+        config.HEADLESS = True
+
+    if args.record_keypoints:
+        config.KEYPOINT_RECORDING_DIR = args.record_keypoints
+
+    if args.passthrough:
+        config.VIDEO_PASSTHROUGH = True
+
     # 모델 설정
     config.YOLO_POSE_MODEL = args.model
     logger.info(f"Using model: {config.YOLO_POSE_MODEL}")
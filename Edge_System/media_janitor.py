@@ -0,0 +1,198 @@
+"""
+낙상 이미지/영상 로컬 보관 정리 모듈
+
+Edge 장치(SD 카드)의 fall_detections/, fall_videos/ 가 계속 쌓이지 않도록
+백그라운드 스레드에서 주기적으로 정리
+    1. 서버 업로드가 확인된(ack) 파일은 MEDIA_KEEP_ACKED_HOURS 후 삭제
+    2. 업로드되지 못한 파일도 MEDIA_UNACKED_RETENTION_DAYS 후 삭제 (0: 보관)
+    3. 디렉토리 합계가 MEDIA_QUOTA_MB를 넘으면 오래된 파일부터 삭제
+       (업로드된 파일 먼저, 그래도 넘으면 업로드 안 된 파일)
+    4. 디스크 여유 공간이 MEDIA_MIN_FREE_MB보다 작으면 업로드된 파일만 오래된 것부터 삭제
+       (디스크는 다른 데이터와 공유하므로 업로드 안 된 증거 파일은 지우지 않고 오류만 기록)
+
+업로드 확인 기록(ack ledger)은 FALL_VIDEOS_DIR/MEDIA_ACK_LEDGER JSON 파일에 저장하므로 재시작해도 유지
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MediaJanitor:
+    """서버 업로드 확인 기록 + 보관 기간/용량 제한에 따른 로컬 미디어 정리"""
+
+    # 녹화/저장 중인 파일을 지우지 않도록 최근 수정된 파일은 제외 (초)
+    ACTIVE_GRACE_SECONDS = 60
+
+    def __init__(self, config, directories=None):
+        self.directories = [Path(d) for d in (directories or (config.FALL_IMAGES_DIR, config.FALL_VIDEOS_DIR))]
+        self.ledger_path = Path(config.FALL_VIDEOS_DIR) / config.MEDIA_ACK_LEDGER
+        self.interval = config.MEDIA_JANITOR_INTERVAL_SECONDS
+        self.keep_acked = config.MEDIA_KEEP_ACKED_HOURS * 3600
+        self.unacked_retention = config.MEDIA_UNACKED_RETENTION_DAYS * 86400
+        self.quota_bytes = config.MEDIA_QUOTA_MB * 1024 * 1024
+        self.min_free_bytes = config.MEDIA_MIN_FREE_MB * 1024 * 1024
+
+        self.lock = threading.Lock()
+        self.acked = self._load_ledger()  # 파일 경로 -> 업로드 확인 시각 (epoch)
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._loop, name='media-janitor', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        logger.info(f"Media janitor enabled for {', '.join(str(d) for d in self.directories)} "
+                    f"(keep acked {self.keep_acked / 3600:g}h, quota {self.quota_bytes // (1024 * 1024)}MB)")
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout=5)
+
+    def acknowledge(self, *paths: Optional[str]):
+        """서버가 업로드를 확인한 파일 기록 (None은 무시)"""
+        now = time.time()
+        with self.lock:
+            for path in paths:
+                if path:
+                    self.acked[str(Path(path))] = now
+            self._save_ledger()
+
+    def _loop(self):
+        # 시작 직후 한 번 정리 (오프라인 동안 쌓인 파일)
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Media janitor sweep failed: {e}")
+            if self.stop_event.wait(self.interval):
+                break
+
+    def sweep(self, now: Optional[float] = None) -> dict:
+        """
+        정리 1회 실행
+
+        Returns:
+            dict: 삭제한 파일 수/바이트와 정리 후 사용량
+        """
+        now = time.time() if now is None else now
+        files = self._scan(now)
+        result = {'deleted_files': 0, 'deleted_bytes': 0}
+
+        with self.lock:
+            acked = dict(self.acked)
+
+        # 1~2. 보관 기간 지난 파일
+        remaining = []
+        for path, size, mtime in files:
+            acked_at = acked.get(path)
+            if acked_at is not None:
+                expired = now - acked_at >= self.keep_acked
+            else:
+                expired = self.unacked_retention > 0 and now - mtime >= self.unacked_retention
+            if expired and self._delete(path, size, result):
+                continue
+            remaining.append((path, size, mtime))
+
+        # 3. 용량 제한: 업로드된 파일 → 업로드 안 된 파일 순서로, 각각 오래된 것부터
+        used = sum(size for _, size, _ in remaining)
+        remaining.sort(key=lambda item: (item[0] not in acked, item[2]))
+        kept = []
+        for path, size, mtime in remaining:
+            if self.quota_bytes and used > self.quota_bytes and self._delete(path, size, result):
+                used -= size
+                if path not in acked:
+                    logger.warning(f"Deleted unuploaded media over quota: {path}")
+                continue
+            kept.append((path, size, mtime))
+
+        # 4. 디스크 여유 공간: 업로드된 파일만 오래된 것부터
+        free = self._disk_free()
+        if free is not None and free < self.min_free_bytes:
+            for path, size, _ in kept:
+                if free >= self.min_free_bytes:
+                    break
+                if path in acked and self._delete(path, size, result):
+                    used -= size
+                    free += size
+            if free < self.min_free_bytes:
+                logger.error(f"Disk free space {free / (1024 * 1024):.0f}MB is below MEDIA_MIN_FREE_MB "
+                             f"({self.min_free_bytes // (1024 * 1024)}MB) and no uploaded media is left to delete")
+
+        # 없어진 파일은 기록에서 제거
+        with self.lock:
+            stale = [path for path in self.acked if not os.path.exists(path)]
+            for path in stale:
+                del self.acked[path]
+            if stale:
+                self._save_ledger()
+
+        result['used_bytes'] = used
+        if result['deleted_files']:
+            logger.info(f"Media janitor: deleted {result['deleted_files']} files "
+                        f"({result['deleted_bytes'] / (1024 * 1024):.1f}MB), "
+                        f"{used / (1024 * 1024):.1f}MB in use")
+        return result
+
+    def _scan(self, now: float) -> list:
+        """정리 대상 파일 목록 [(경로, 크기, 수정 시각)] (최근 수정된 파일과 ack 기록 파일 제외)"""
+        files = []
+        ledger_names = (self.ledger_path.name, self.ledger_path.with_suffix('.tmp').name)
+        for directory in self.directories:
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory):
+                if not entry.is_file() or entry.name in ledger_names:
+                    continue
+                stat = entry.stat()
+                if now - stat.st_mtime < self.ACTIVE_GRACE_SECONDS:
+                    continue
+                files.append((str(Path(directory) / entry.name), stat.st_size, stat.st_mtime))
+        return files
+
+    def _disk_free(self) -> Optional[int]:
+        """첫 번째 디렉토리가 있는 디스크의 여유 공간 (확인 안 하거나 실패하면 None)"""
+        if not self.min_free_bytes or not self.directories:
+            return None
+        try:
+            return shutil.disk_usage(self.directories[0]).free
+        except OSError:
+            return None
+
+    @staticmethod
+    def _delete(path: str, size: int, result: dict) -> bool:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.error(f"Failed to delete {path}: {e}")
+            return False
+        result['deleted_files'] += 1
+        result['deleted_bytes'] += size
+        return True
+
+    def _load_ledger(self) -> dict:
+        try:
+            with open(self.ledger_path) as f:
+                return {str(path): float(acked_at) for path, acked_at in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable media ack ledger {self.ledger_path}: {e}")
+            return {}
+
+    def _save_ledger(self):
+        """기록 저장 (임시 파일에 쓰고 교체하여 중간에 꺼져도 깨지지 않음)"""
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.ledger_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(self.acked, f)
+        os.replace(temp_path, self.ledger_path)
@@ -0,0 +1,296 @@
+"""
+Edge 성능 계측 모듈
+단조 시계 기반 타이머, HDR 스타일 히스토그램, 카운터와
+Prometheus 텍스트 포맷(/metrics) HTTP 엔드포인트 제공
+"""
+
+import math
+import threading
+import time
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """
+    HDR 스타일 로그-선형 버킷 히스토그램
+
+    마이크로초 단위 정수로 기록하며, 2^SUB_BUCKET_BITS 미만은 1us 단위,
+    그 이상은 2배 구간마다 2^(SUB_BUCKET_BITS-1)개 버킷으로 나눔 (상대 오차 약 3%)
+    메모리는 고정 크기, 기록은 O(1)
+    """
+
+    SUB_BUCKET_BITS = 6
+    SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS  # 64
+    HALF_COUNT = SUB_BUCKET_COUNT >> 1  # 32
+
+    # /metrics 로 내보내는 누적 버킷 경계 (초)
+    EXPORT_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    __slots__ = ('counts', 'count', 'total', 'max_value', 'max_index')
+
+    def __init__(self, max_seconds: float = 3600.0):
+        self.max_value = int(max_seconds * 1e6)
+        self.max_index = self._index(self.max_value)
+        self.counts = [0] * (self.max_index + 1)
+        self.count = 0
+        self.total = 0.0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        if value < cls.SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        return cls.SUB_BUCKET_COUNT + (shift - 1) * cls.HALF_COUNT + ((value >> shift) - cls.HALF_COUNT)
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        """버킷 index에 속하는 가장 큰 값 (us)"""
+        if index < cls.SUB_BUCKET_COUNT:
+            return index
+        shift = (index - cls.SUB_BUCKET_COUNT) // cls.HALF_COUNT + 1
+        sub = (index - cls.SUB_BUCKET_COUNT) % cls.HALF_COUNT + cls.HALF_COUNT
+        return ((sub + 1) << shift) - 1
+
+    def observe(self, seconds: float):
+        """값 기록 (초)"""
+        value = int(seconds * 1e6)
+        if value < 0:
+            value = 0
+        elif value > self.max_value:
+            value = self.max_value
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q: float) -> float:
+        """q 백분위수 (0-100) 근사값 (초)"""
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(self.count * q / 100.0))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return self._upper_bound(index) / 1e6
+        return self.max_value / 1e6
+
+    def cumulative_counts(self, bounds) -> list:
+        """bounds(초) 각각 이하인 관측 수 (버킷 상한 기준 근사)"""
+        result = []
+        cumulative = 0
+        index = 0
+        for bound in bounds:
+            limit = int(bound * 1e6)
+            while index < len(self.counts) and self._upper_bound(index) <= limit:
+                cumulative += self.counts[index]
+                index += 1
+            result.append(cumulative)
+        return result
+
+    def reset(self):
+        self.counts = [0] * (self.max_index + 1)
+        self.count = 0
+        self.total = 0.0
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Timer:
+    """
+    재사용 가능한 구간 타이머 (with 블록 시간을 히스토그램에 기록)
+    매 프레임 객체를 만들지 않도록 단계별로 하나씩 만들어 재사용 (재진입 불가)
+    """
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """이름 + 레이블로 구분되는 히스토그램/카운터 저장소"""
+
+    def __init__(self, prefix: str = 'edge'):
+        self.prefix = prefix
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple], Counter] = {}
+        self.help: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Optional[dict]) -> Tuple[str, Tuple]:
+        return name, tuple(sorted(labels.items())) if labels else ()
+
+    def histogram(self, name: str, help_text: str = '', **labels) -> Histogram:
+        key = self._key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+                self.help.setdefault(name, help_text)
+        return histogram
+
+    def counter(self, name: str, help_text: str = '', **labels) -> Counter:
+        key = self._key(name, labels)
+        counter = self.counters.get(key)
+        if counter is None:
+            with self.lock:
+                counter = self.counters.setdefault(key, Counter())
+                self.help.setdefault(name, help_text)
+        return counter
+
+    def timer(self, name: str, help_text: str = '', **labels) -> Timer:
+        return Timer(self.histogram(name, help_text, **labels))
+
+    def stage_timer(self, stage: str) -> Timer:
+        """프레임 처리 단계별 지연 타이머"""
+        return self.timer('stage_latency_seconds', 'Per-stage frame processing latency', stage=stage)
+
+    def observe_e2e(self, span: str, seconds: float):
+        """종단 간(캡처 -> 낙상 확정 -> 서버 응답) 지연 기록"""
+        self.histogram('e2e_latency_seconds', 'End-to-end fall alert latency', span=span).observe(seconds)
+
+    def stage_summary(self) -> Dict[str, dict]:
+        """단계별 p50/p95/p99 (ms) 요약 (통계 출력/벤치마크용)"""
+        summary = {}
+        with self.lock:
+            histograms = list(self.histograms.items())
+        for (name, labels), histogram in sorted(histograms):
+            if histogram.count == 0:
+                continue
+            label = ','.join(f'{k}={v}' for k, v in labels)
+            summary[f'{name}{{{label}}}' if label else name] = {
+                'count': histogram.count,
+                'mean_ms': histogram.total / histogram.count * 1000,
+                'p50_ms': histogram.percentile(50) * 1000,
+                'p95_ms': histogram.percentile(95) * 1000,
+                'p99_ms': histogram.percentile(99) * 1000,
+            }
+        return summary
+
+    @staticmethod
+    def _format_labels(labels: Tuple, extra: Optional[Tuple] = None) -> str:
+        items = list(labels) + list(extra or ())
+        if not items:
+            return ''
+        return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+    def render(self) -> str:
+        """Prometheus 텍스트 포맷 (version 0.0.4)"""
+        lines = []
+        # 다른 스레드가 새 지표를 등록해도 순회 중 dict 크기가 바뀌지 않도록 잠금 안에서 복사
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+            help_texts = dict(self.help)
+
+        counter_names = sorted({name for (name, _), _ in counters})
+        for name in counter_names:
+            full_name = f'{self.prefix}_{name}'
+            lines.append(f'# HELP {full_name} {help_texts.get(name, "")}')
+            lines.append(f'# TYPE {full_name} counter')
+            for (counter_name, labels), counter in counters:
+                if counter_name == name:
+                    lines.append(f'{full_name}{self._format_labels(labels)} {counter.value}')
+
+        histogram_names = sorted({name for (name, _), _ in histograms})
+        for name in histogram_names:
+            full_name = f'{self.prefix}_{name}'
+            lines.append(f'# HELP {full_name} {help_texts.get(name, "")}')
+            lines.append(f'# TYPE {full_name} histogram')
+            for (histogram_name, labels), histogram in histograms:
+                if histogram_name != name:
+                    continue
+                cumulative = histogram.cumulative_counts(Histogram.EXPORT_BOUNDS)
+                for bound, value in zip(Histogram.EXPORT_BOUNDS, cumulative):
+                    lines.append(f'{full_name}_bucket{self._format_labels(labels, (("le", bound),))} {value}')
+                lines.append(f'{full_name}_bucket{self._format_labels(labels, (("le", "+Inf"),))} {histogram.count}')
+                lines.append(f'{full_name}_sum{self._format_labels(labels)} {histogram.total:.6f}')
+                lines.append(f'{full_name}_count{self._format_labels(labels)} {histogram.count}')
+
+            # HDR 히스토그램의 정밀 백분위수는 별도 gauge로 노출
+            quantile_name = f'{full_name}_quantile'
+            lines.append(f'# HELP {quantile_name} {help_texts.get(name, "")} (HDR percentile)')
+            lines.append(f'# TYPE {quantile_name} gauge')
+            for (histogram_name, labels), histogram in histograms:
+                if histogram_name != name:
+                    continue
+                for q in (50, 95, 99):
+                    extra = (('quantile', q / 100),)
+                    lines.append(f'{quantile_name}{self._format_labels(labels, extra)} '
+                                 f'{histogram.percentile(q):.6f}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# 프로세스 전역 레지스트리
+REGISTRY = MetricsRegistry()
+
+
+class MetricsServer:
+    """로컬 /metrics HTTP 엔드포인트 (데몬 스레드)"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = '127.0.0.1', port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 스크레이프마다 로그를 남기지 않음
+
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.error(f"Cannot start metrics server on {self.host}:{self.port}: {e}")
+            return False
+
+        self.thread = threading.Thread(target=self.server.serve_forever, name='metrics', daemon=True)
+        self.thread.start()
+        logger.info(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,191 @@
+"""
+카메라 인코딩 스트림 그대로 저장 (passthrough)
+
+RTSP 카메라는 이미 H.264/H.265로 인코딩된 스트림을 보내므로, 분석용으로 디코딩하는 것과 별도로
+ffmpeg(-c copy)가 원본 패킷을 키프레임 단위 세그먼트 파일로 디스크에 계속 기록하고,
+낙상 시에는 해당 구간의 세그먼트만 이어 붙여(remux) MP4를 만듦
+
+    - 재인코딩 CPU 없음, 원본 화질 유지
+    - 원본 프레임 버퍼(해상도 x FPS x 7초 분량의 BGR 배열)가 필요 없음
+    - 세그먼트 경계가 키프레임이므로 영상 앞뒤가 최대 세그먼트 길이만큼 더 길어질 수 있음
+    - 감지 결과(스켈레톤)는 그려지지 않음 (원본 영상 그대로)
+
+세그먼트 파일명은 시작 시각(epoch 초): <directory>/seg_<epoch>.ts
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = 'seg_'
+RESTART_BACKOFF_SECONDS = (1, 2, 5, 10, 30)
+
+
+def is_stream_url(source) -> bool:
+    """ffmpeg가 직접 열 수 있는 네트워크 스트림인지 (웹캠 인덱스/로컬 장치 제외)"""
+    return isinstance(source, str) and '://' in source
+
+
+class PassthroughRecorder:
+    """ffmpeg 세그먼트 링 버퍼 + 낙상 구간 remux"""
+
+    def __init__(self, source: str, directory: str, keep_seconds: float,
+                 segment_seconds: float = 2.0, ffmpeg: str = 'ffmpeg'):
+        self.source = source
+        self.directory = Path(directory)
+        self.keep_seconds = keep_seconds
+        self.segment_seconds = segment_seconds
+        self.ffmpeg = ffmpeg
+        self.process = None
+        self.restarts = 0
+        self.next_restart_time = 0.0
+        self.last_prune_time = 0.0
+        # 저장(remux) 중인 세그먼트: clip-finish 스레드가 쓰는 동안 poll()이 삭제하지 않음
+        self.in_use = set()
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # 이전 실행에서 남은 세그먼트는 시각이 맞지 않으므로 삭제
+        for _, path in self.segments():
+            path.unlink(missing_ok=True)
+        self._spawn()
+
+    def _spawn(self):
+        command = [self.ffmpeg, '-hide_banner', '-loglevel', 'error', '-nostdin']
+        if self.source.startswith('rtsp://'):
+            command += ['-rtsp_transport', 'tcp']
+        command += ['-i', self.source, '-map', '0:v:0', '-c', 'copy',
+                    '-f', 'segment', '-segment_time', str(self.segment_seconds), '-reset_timestamps', '1',
+                    '-strftime', '1', str(self.directory / f'{SEGMENT_PREFIX}%s.ts')]
+        self.process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+        logger.info(f"Passthrough recording started: {self.source} -> {self.directory} "
+                    f"({self.segment_seconds}s segments)")
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+    def segments(self) -> List[Tuple[int, Path]]:
+        """(시작 epoch 초, 경로) 목록, 시간순"""
+        segments = []
+        for path in self.directory.glob(f'{SEGMENT_PREFIX}*.ts'):
+            try:
+                segments.append((int(path.stem[len(SEGMENT_PREFIX):]), path))
+            except ValueError:
+                continue
+        segments.sort()
+        return segments
+
+    def poll(self, now: Optional[float] = None):
+        """
+        메인 루프에서 매 프레임 호출 (세그먼트 길이마다 한 번만 실제 작업)
+        ffmpeg가 죽었으면 백오프 후 재시작, 보관 시간이 지난 세그먼트 삭제
+        """
+        now = time.time() if now is None else now
+        if now - self.last_prune_time < self.segment_seconds:
+            return
+        self.last_prune_time = now
+
+        if self.process is not None and self.process.poll() is not None and now >= self.next_restart_time:
+            backoff = RESTART_BACKOFF_SECONDS[min(self.restarts, len(RESTART_BACKOFF_SECONDS) - 1)]
+            logger.warning(f"Passthrough ffmpeg exited with {self.process.returncode}, "
+                           f"restarting (next retry in {backoff}s)")
+            self.restarts += 1
+            self.next_restart_time = now + backoff
+            self._spawn()
+
+        segments = self.segments()
+        # 다음 세그먼트가 시작된 시각(= 이 세그먼트의 끝)이 보관 시간보다 오래된 것만 삭제
+        with self.lock:
+            for (_, path), (next_start, _) in zip(segments, segments[1:]):
+                if next_start < now - self.keep_seconds and path not in self.in_use:
+                    path.unlink(missing_ok=True)
+
+    def save_clip(self, start_time: float, end_time: float, output_path: str,
+                  timeout: Optional[float] = None) -> Optional[str]:
+        """
+        [start_time, end_time] (epoch 초) 구간을 덮는 세그먼트를 재인코딩 없이 MP4로 이어 붙임
+
+        end_time을 포함하는 세그먼트가 닫힐 때까지(다음 세그먼트가 생길 때까지) 최대 timeout초 대기
+        """
+        timeout = self.segment_seconds * 2 + 1 if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        segments = self.segments()
+        while not any(start > end_time for start, _ in segments) and time.monotonic() < deadline:
+            time.sleep(0.1)
+            segments = self.segments()
+
+        # 마지막(기록 중인) 세그먼트는 제외, 구간과 겹치는 세그먼트 선택
+        with self.lock:
+            selected = [path for (start, path), (next_start, _) in zip(segments, segments[1:])
+                        if start <= end_time and next_start > start_time and path.exists()]
+            self.in_use.update(selected)
+        if not selected:
+            logger.error(f"No passthrough segments cover {start_time:.0f}-{end_time:.0f}")
+            return None
+        try:
+            return self._remux(selected, output_path)
+        finally:
+            with self.lock:
+                self.in_use.difference_update(selected)
+
+    def _remux(self, selected: List[Path], output_path: str) -> Optional[str]:
+        """선택한 세그먼트를 concat demuxer로 이어 붙여 MP4로 저장 (스트림 복사)"""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', dir=self.directory, delete=False) as f:
+            for path in selected:
+                f.write(f"file '{path.resolve()}'\n")
+            list_path = f.name
+        try:
+            result = subprocess.run([self.ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+                                     '-f', 'concat', '-safe', '0', '-i', list_path,
+                                     '-c', 'copy', '-movflags', '+faststart', str(output_path)],
+                                    capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.error(f"Error remuxing fall video: {e}")
+            return None
+        finally:
+            os.unlink(list_path)
+
+        if result.returncode != 0:
+            logger.error(f"ffmpeg remux failed: {result.stderr.strip()[-500:]}")
+            return None
+        logger.info(f"Fall video saved (passthrough): {output_path} ({len(selected)} segments, "
+                    f"{os.path.getsize(output_path) / 1024 / 1024:.2f} MB)")
+        return str(output_path)
+
+
+def create_passthrough(config, source) -> Optional[PassthroughRecorder]:
+    """설정과 카메라 소스가 passthrough를 지원하면 시작된 PassthroughRecorder, 아니면 None"""
+    if not config.VIDEO_PASSTHROUGH or not config.SAVE_FALL_VIDEOS:
+        return None
+    if not is_stream_url(source):
+        logger.warning(f"Passthrough needs a network stream (e.g. rtsp://), got {source!r}; re-encoding instead")
+        return None
+    ffmpeg = shutil.which(config.FFMPEG_PATH)
+    if ffmpeg is None:
+        logger.warning("Passthrough needs ffmpeg, which was not found; re-encoding instead")
+        return None
+
+    segment_seconds = config.VIDEO_PASSTHROUGH_SEGMENT_SECONDS
+    # 낙상 전/후 구간 + 세그먼트 경계 여유 + remux 대기 시간
+    keep_seconds = config.VIDEO_BUFFER_SECONDS + config.VIDEO_RECORD_AFTER_SECONDS + segment_seconds * 4 + 5
+    recorder = PassthroughRecorder(source, config.VIDEO_PASSTHROUGH_DIR, keep_seconds,
+                                   segment_seconds=segment_seconds, ffmpeg=ffmpeg)
+    recorder.start()
+    return recorder
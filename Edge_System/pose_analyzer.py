@@ -4,8 +4,8 @@ YOLOv8/YOLOv11-pose의 17개 키포인트를 분석하여 낙상 여부 판단
 가중치 기반 점수 계산 시스템 사용
 """
 
+import math
 import numpy as np
-import cv2
 from typing import Tuple, Optional, Dict
 import logging
 
@@ -62,6 +62,11 @@ class PoseAnalyzer:
             'sudden_change': 0.25  # 갑작스러운 변화 가중치
         })
 
+        # 시간 창 특징 임계값 (가중치 기본값 0: temporal_window.py 참고)
+        self.descent_velocity_threshold = config.get('descent_velocity_threshold', 0.6)
+        self.descent_acceleration_threshold = config.get('descent_acceleration_threshold', 3.0)
+        self.aspect_trend_threshold = config.get('aspect_trend_threshold', 1.5)
+
         # 낙상 점수 임계값
         self.fall_score_threshold = config.get('fall_score_threshold', 0.6)
 
@@ -69,10 +74,10 @@ class PoseAnalyzer:
         self.previous_aspect_ratio = None
         self.aspect_ratio_change_threshold = 0.8  # 변화율 임계값
 
-        logger.debug(f"PoseAnalyzer initialized with threshold: {self.fall_score_threshold}")
+        logger.debug("PoseAnalyzer initialized with threshold: %s", self.fall_score_threshold)
 
     def analyze_pose(self, keypoints: np.ndarray, bbox: Tuple[int, int, int, int],
-                     frame_height: int) -> Dict:
+                     frame_height: int, temporal: Optional[Dict] = None) -> Dict:
         """
         포즈 분석하여 낙상 여부 판단 (가중치 기반)
 
@@ -80,6 +85,7 @@ class PoseAnalyzer:
             keypoints: (17, 3) 배열 [x, y, confidence]
             bbox: (x1, y1, x2, y2) 바운딩 박스
             frame_height: 프레임 높이
+            temporal: 같은 사람의 시간 창 특징 (FeatureWindow.features(), 없으면 시간 창 점수 0)
 
         Returns:
             분석 결과 딕셔너리 {
@@ -89,9 +95,7 @@ class PoseAnalyzer:
                 'details': dict
             }
         """
-        x1, y1, x2, y2 = bbox
-        bbox_width = x2 - x1
-        bbox_height = y2 - y1
+        aspect_ratio, height_ratio, horizontal_ratio, angle = self.measure_pose(keypoints, bbox, frame_height)
 
         # 결과 초기화
         result = {
@@ -108,7 +112,13 @@ class PoseAnalyzer:
                 'horizontal_score': 0.0,
                 'angle_score': 0.0,
                 'sudden_change_score': 0.0,
-                'aspect_ratio_delta': 0.0
+                'aspect_ratio_delta': 0.0,
+                'descent_velocity': 0.0,
+                'descent_acceleration': 0.0,
+                'aspect_trend': 0.0,
+                'velocity_score': 0.0,
+                'acceleration_score': 0.0,
+                'trend_score': 0.0
             }
         }
 
@@ -118,10 +128,12 @@ class PoseAnalyzer:
         horizontal_score = 0.0
         angle_score = 0.0
         sudden_change_score = 0.0
+        velocity_score = 0.0
+        acceleration_score = 0.0
+        trend_score = 0.0
 
         # ========== 1. 바운딩 박스 가로/세로 비율 분석 + 갑작스러운 변화 감지 ==========
-        if bbox_height > 0:
-            aspect_ratio = bbox_width / bbox_height
+        if aspect_ratio is not None:
             result['details']['bbox_aspect_ratio'] = aspect_ratio
 
             # 가로가 세로보다 긴 경우 (누운 자세)
@@ -141,7 +153,8 @@ class PoseAnalyzer:
                     # 변화가 클수록 점수 증가
                     sudden_change_score = min(1.0, aspect_ratio_delta / 1.5)
                     result['reason'] += f'Sudden change(Δ={aspect_ratio_delta:.2f}); '
-                    logger.debug(f"Sudden aspect ratio change detected: {self.previous_aspect_ratio:.2f} -> {aspect_ratio:.2f} (Δ={aspect_ratio_delta:.2f})")
+                    logger.debug("Sudden aspect ratio change detected: %.2f -> %.2f (Δ=%.2f)",
+                                 self.previous_aspect_ratio, aspect_ratio, aspect_ratio_delta)
 
             # 현재 aspect_ratio를 다음 프레임을 위해 저장
             self.previous_aspect_ratio = aspect_ratio
@@ -150,8 +163,6 @@ class PoseAnalyzer:
         result['details']['sudden_change_score'] = sudden_change_score
 
         # ========== 2. 바운딩 박스 위치 분석 (낮은 위치) ==========
-        bbox_center_y = (y1 + y2) / 2
-        height_ratio = bbox_center_y / frame_height
         result['details']['head_height_ratio'] = height_ratio
 
         # 화면 하단에 가까울수록 낙상 가능성 증가
@@ -164,52 +175,60 @@ class PoseAnalyzer:
         result['details']['position_score'] = position_score
 
         # ========== 3. 키포인트 기반 분석 ==========
-        if keypoints is not None and len(keypoints) > 0:
-            # 3-1. 머리와 엉덩이의 수평 거리 분석
-            head_y = self._get_average_keypoint_y(keypoints, self.HEAD_KEYPOINTS)
-            hip_y = self._get_average_keypoint_y(keypoints, self.HIP_KEYPOINTS)
+        # 3-1. 머리와 엉덩이의 수평 거리 분석
+        if horizontal_ratio is not None:
+            result['details']['horizontal_ratio'] = horizontal_ratio
 
-            if head_y is not None and hip_y is not None and bbox_height > 0:
-                # 수직 거리를 바운딩 박스 높이로 정규화
-                vertical_distance = abs(hip_y - head_y)
-                horizontal_ratio = vertical_distance / bbox_height
-                result['details']['horizontal_ratio'] = horizontal_ratio
+            # 머리와 엉덩이가 비슷한 높이 (수평 자세)
+            if horizontal_ratio < self.horizontal_threshold:
+                horizontal_score = 1.0 - (horizontal_ratio / self.horizontal_threshold)
+                result['reason'] += f'Horizontal body({horizontal_ratio:.2f}); '
 
-                # 머리와 엉덩이가 비슷한 높이 (수평 자세)
-                if horizontal_ratio < self.horizontal_threshold:
-                    horizontal_score = 1.0 - (horizontal_ratio / self.horizontal_threshold)
-                    result['reason'] += f'Horizontal body({horizontal_ratio:.2f}); '
+        # 3-2. 몸통 각도 분석
+        if angle is not None:
+            result['details']['body_angle'] = angle
 
-            # 3-2. 몸통 각도 분석
-            shoulder_y = self._get_average_keypoint_y(keypoints, self.SHOULDER_KEYPOINTS)
-            shoulder_x = self._get_average_keypoint_x(keypoints, self.SHOULDER_KEYPOINTS)
-            hip_x = self._get_average_keypoint_x(keypoints, self.HIP_KEYPOINTS)
-
-            if shoulder_y is not None and hip_y is not None and shoulder_x is not None and hip_x is not None:
-                dx = abs(shoulder_x - hip_x)
-                dy = abs(shoulder_y - hip_y)
-
-                # 각도 계산 (수직에서 벗어난 정도)
-                if dy > 0:
-                    angle = np.degrees(np.arctan(dx / dy))
-                    result['details']['body_angle'] = angle
-
-                    # 각도가 임계값보다 크면 (수평에 가까움)
-                    if angle > self.body_angle_threshold:
-                        # 각도가 클수록 점수 증가
-                        angle_score = min(1.0, (angle - self.body_angle_threshold) / 30.0)
-                        result['reason'] += f'Horizontal angle({angle:.1f}°); '
+            # 각도가 임계값보다 크면 (수평에 가까움)
+            if angle > self.body_angle_threshold:
+                # 각도가 클수록 점수 증가
+                angle_score = min(1.0, (angle - self.body_angle_threshold) / 30.0)
+                result['reason'] += f'Horizontal angle({angle:.1f}°); '
 
         result['details']['horizontal_score'] = horizontal_score
         result['details']['angle_score'] = angle_score
 
+        # 3-3. 시간 창 특징 (머리/엉덩이 하강 속도, 가속도, 비율 추세)
+        if temporal is not None:
+            descent_velocity = self._max_defined(temporal['head_velocity'], temporal['hip_velocity'])
+            descent_acceleration = self._max_defined(temporal['head_acceleration'], temporal['hip_acceleration'])
+            aspect_trend = temporal['aspect_trend']
+
+            if descent_velocity is not None:
+                result['details']['descent_velocity'] = descent_velocity
+                velocity_score = self._excess_score(descent_velocity, self.descent_velocity_threshold)
+                if velocity_score > 0:
+                    result['reason'] += f'Fast descent({descent_velocity:.2f}/s); '
+            if descent_acceleration is not None:
+                result['details']['descent_acceleration'] = descent_acceleration
+                acceleration_score = self._excess_score(descent_acceleration, self.descent_acceleration_threshold)
+            if aspect_trend is not None:
+                result['details']['aspect_trend'] = aspect_trend
+                trend_score = self._excess_score(aspect_trend, self.aspect_trend_threshold)
+
+        result['details']['velocity_score'] = velocity_score
+        result['details']['acceleration_score'] = acceleration_score
+        result['details']['trend_score'] = trend_score
+
         # ========== 4. 가중치 적용 최종 점수 계산 ==========
         weighted_score = (
             aspect_score * self.weights.get('aspect_ratio', 0.25) +
             position_score * self.weights.get('low_position', 0.15) +
             horizontal_score * self.weights.get('horizontal_body', 0.20) +
             angle_score * self.weights.get('body_angle', 0.15) +
-            sudden_change_score * self.weights.get('sudden_change', 0.25)
+            sudden_change_score * self.weights.get('sudden_change', 0.25) +
+            velocity_score * self.weights.get('descent_velocity', 0.0) +
+            acceleration_score * self.weights.get('descent_acceleration', 0.0) +
+            trend_score * self.weights.get('aspect_trend', 0.0)
         )
 
         result['fall_score'] = weighted_score
@@ -217,47 +236,116 @@ class PoseAnalyzer:
         # ========== 5. 낙상 판단 ==========
         if weighted_score >= self.fall_score_threshold:
             result['is_fall'] = True
-            logger.debug(f"Fall detected! Score: {weighted_score:.3f} (threshold: {self.fall_score_threshold})")
+            logger.debug("Fall detected! Score: %.3f (threshold: %s)", weighted_score, self.fall_score_threshold)
         else:
-            logger.debug(f"Normal pose. Score: {weighted_score:.3f}")
+            logger.debug("Normal pose. Score: %.3f", weighted_score)
 
         return result
 
-    def _get_average_keypoint_y(self, keypoints: np.ndarray, indices: list) -> Optional[float]:
+    def measure_pose(self, keypoints: np.ndarray, bbox: Tuple[int, int, int, int],
+                     frame_height: int) -> Tuple[Optional[float], float, Optional[float], Optional[float]]:
+        """
+        임계값/가중치와 무관한 원시 측정값 계산 (파라미터 튜닝 시 한 번만 계산하여 재사용)
+
+        Args:
+            keypoints: (17, 3) 배열 [x, y, confidence]
+            bbox: (x1, y1, x2, y2) 바운딩 박스
+            frame_height: 프레임 높이
+
+        Returns:
+            (가로/세로 비율, 바운딩 박스 중심 높이 비율, 머리-엉덩이 수직 거리 비율, 몸통 각도)
+            계산할 수 없는 값은 None
+        """
+        x1, y1, x2, y2 = bbox
+        bbox_width = x2 - x1
+        bbox_height = y2 - y1
+
+        aspect_ratio = bbox_width / bbox_height if bbox_height > 0 else None
+        height_ratio = (y1 + y2) / 2 / frame_height
+        horizontal_ratio = None
+        angle = None
+
+        if keypoints is not None and len(keypoints) > 0:
+            # 원소 단위 numpy 접근은 느리므로 한 번에 파이썬 리스트로 변환
+            if isinstance(keypoints, np.ndarray):
+                keypoints = keypoints.tolist()
+
+            # 머리와 엉덩이의 수직 거리를 바운딩 박스 높이로 정규화
+            head_y = self._get_average_keypoint_y(keypoints, self.HEAD_KEYPOINTS)
+            hip_y = self._get_average_keypoint_y(keypoints, self.HIP_KEYPOINTS)
+            if head_y is not None and hip_y is not None and bbox_height > 0:
+                horizontal_ratio = abs(hip_y - head_y) / bbox_height
+
+            # 몸통 각도 (수직에서 벗어난 정도)
+            shoulder_y = self._get_average_keypoint_y(keypoints, self.SHOULDER_KEYPOINTS)
+            shoulder_x = self._get_average_keypoint_x(keypoints, self.SHOULDER_KEYPOINTS)
+            hip_x = self._get_average_keypoint_x(keypoints, self.HIP_KEYPOINTS)
+            if shoulder_y is not None and hip_y is not None and shoulder_x is not None and hip_x is not None:
+                dx = abs(shoulder_x - hip_x)
+                dy = abs(shoulder_y - hip_y)
+                if dy > 0:
+                    angle = math.degrees(math.atan(dx / dy))
+
+        return aspect_ratio, height_ratio, horizontal_ratio, angle
+
+    def vertical_centroids(self, keypoints: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
+        """머리/엉덩이 평균 Y 좌표 (시간 창 특징 입력)"""
+        if isinstance(keypoints, np.ndarray):
+            keypoints = keypoints.tolist()
+        return (self._get_average_keypoint_y(keypoints, self.HEAD_KEYPOINTS),
+                self._get_average_keypoint_y(keypoints, self.HIP_KEYPOINTS))
+
+    @staticmethod
+    def _excess_score(value: float, threshold: float) -> float:
+        """임계값을 넘은 만큼의 점수 (임계값의 2배에서 1.0)"""
+        if value <= threshold or threshold <= 0:
+            return 0.0
+        return min(1.0, (value - threshold) / threshold)
+
+    @staticmethod
+    def _max_defined(a: Optional[float], b: Optional[float]) -> Optional[float]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return max(a, b)
+
+    def _get_average_keypoint_y(self, keypoints, indices: list) -> Optional[float]:
         """
         특정 키포인트들의 평균 Y 좌표 계산
 
         Args:
-            keypoints: (17, 3) 키포인트 배열
+            keypoints: (17, 3) 키포인트 배열 또는 리스트
             indices: 평균을 구할 키포인트 인덱스 리스트
 
         Returns:
             평균 Y 좌표 또는 None (유효한 키포인트가 없을 때)
         """
-        valid_points = []
-        for idx in indices:
-            if idx < len(keypoints) and keypoints[idx][2] > self.KEYPOINT_CONF_THRESHOLD:
-                valid_points.append(keypoints[idx][1])
+        return self._get_average_keypoint(keypoints, indices, 1)
 
-        return np.mean(valid_points) if valid_points else None
-
-    def _get_average_keypoint_x(self, keypoints: np.ndarray, indices: list) -> Optional[float]:
+    def _get_average_keypoint_x(self, keypoints, indices: list) -> Optional[float]:
         """
         특정 키포인트들의 평균 X 좌표 계산
 
         Args:
-            keypoints: (17, 3) 키포인트 배열
+            keypoints: (17, 3) 키포인트 배열 또는 리스트
             indices: 평균을 구할 키포인트 인덱스 리스트
 
         Returns:
             평균 X 좌표 또는 None (유효한 키포인트가 없을 때)
         """
-        valid_points = []
+        return self._get_average_keypoint(keypoints, indices, 0)
+
+    def _get_average_keypoint(self, keypoints, indices: list, axis: int) -> Optional[float]:
+        """신뢰도 임계값을 넘는 키포인트들의 axis 좌표 평균 (매 프레임 호출되므로 순수 파이썬으로 계산)"""
+        total = 0.0
+        count = 0
         for idx in indices:
             if idx < len(keypoints) and keypoints[idx][2] > self.KEYPOINT_CONF_THRESHOLD:
-                valid_points.append(keypoints[idx][0])
+                total += keypoints[idx][axis]
+                count += 1
 
-        return np.mean(valid_points) if valid_points else None
+        return total / count if count else None
 
     @staticmethod
     def draw_skeleton(frame: np.ndarray, keypoints: np.ndarray,
@@ -277,6 +365,8 @@ class PoseAnalyzer:
         Returns:
             스켈레톤이 그려진 프레임
         """
+        import cv2  # 분석만 하는 재생/튜닝 도구가 OpenCV 없이 동작하도록 지연 import
+
         # COCO 스켈레톤 연결 정의
         skeleton_connections = [
             # 얼굴
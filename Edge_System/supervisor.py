@@ -0,0 +1,483 @@
+"""
+다중 카메라 Edge supervisor
+
+카메라마다 캡처 프로세스(main.FallDetectionSystem, headless)를 하나씩 띄우고,
+YOLO-pose 추론은 모델을 한 번만 올린 공유 추론 프로세스가 담당
+    - 캡처/버퍼링/포즈 분석/그리기/녹화는 카메라별 프로세스에서 실행 (GIL 분리)
+    - 프레임은 카메라별 공유 메모리 링 슬롯으로 전달 (프레임 pickle 없음), 큐에는 슬롯 번호와 크기만 보냄
+    - 추론 프로세스는 동시에 도착한 여러 카메라의 프레임을 한 번의 모델 호출로 묶어 처리
+    - 프로세스가 죽거나 하트비트가 끊기면 백오프 후 재시작
+    - 카메라별/전체 FPS, 추론 지연, 배치 크기 등 통합 통계를 주기적으로 출력
+
+사용법:
+    python supervisor.py --camera front=rtsp://... --camera room=rtsp://...
+    (또는 SUPERVISOR_CAMERAS="front=rtsp://...,room=rtsp://...")
+"""
+
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import queue
+import signal
+import time
+from collections import defaultdict
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# 프로세스별 공유 통계 (RawArray, 필드마다 쓰는 프로세스는 하나)
+HEARTBEAT, FRAMES, FALLS, INFERENCES, INFERENCE_SECONDS, TIMEOUTS, BATCHES = range(7)
+STAT_FIELDS = 7
+
+RESTART_BACKOFF_SECONDS = (1, 2, 5, 10, 30)
+HEALTHY_RUN_SECONDS = 60.0  # 이보다 오래 정상 동작했으면 재시작 백오프 초기화
+
+
+class FrameRing:
+    """
+    공유 메모리 프레임 링 (슬롯 slots개, 슬롯당 slot_bytes)
+
+    만든 쪽(카메라 프로세스)이 소유하고 unlink, 추론 프로세스는 이름으로 연결해서 읽기만 함
+    """
+
+    def __init__(self, slots: int, slot_bytes: int, name: Optional[str] = None):
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner,
+                                              size=slots * slot_bytes if self.owner else 0)
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.buffer = np.ndarray((slots, slot_bytes), dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, slot: int, image: np.ndarray):
+        view = self.buffer[slot, :image.nbytes].reshape(image.shape)
+        np.copyto(view, image)
+
+    def view(self, slot: int, shape: tuple) -> np.ndarray:
+        return self.buffer[slot, :int(np.prod(shape))].reshape(shape)
+
+    def close(self):
+        self.buffer = None  # 공유 메모리를 닫기 전에 NumPy 뷰 해제
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def apply_overrides(overrides: dict):
+    """spawn된 프로세스는 config를 새로 읽으므로 CLI로 바꾼 설정을 다시 적용"""
+    for name, value in overrides.items():
+        setattr(config, name, value)
+
+
+def make_remote_detector(camera_index: int, request_queue, response_queue, stats, inference_ready):
+    """공유 추론 프로세스에 추론을 맡기는 FallDetector (모델을 올리지 않음)"""
+    from fall_detector import FallDetector
+
+    class RemoteFallDetector(FallDetector):
+        def __init__(self):
+            self.camera_index = camera_index
+            self.request_queue = request_queue
+            self.response_queue = response_queue
+            self.stats = stats
+            self.inference_ready = inference_ready
+            self.ring = None
+            self.next_slot = 0
+            # 재시작 전 요청에 대한 늦은 응답과 겹치지 않도록 시각으로 시작
+            self.sequence = time.monotonic_ns()
+            super().__init__(config)
+
+        def load_model(self):
+            self.device = 'shared-inference'
+
+        def run_pose_model(self, image: np.ndarray, imgsz: int, offset: Tuple[int, int] = (0, 0)) -> List[dict]:
+            if not self.inference_ready.is_set():
+                return []  # 추론 프로세스가 모델을 올리는 중 (재시작 포함)
+
+            image = np.ascontiguousarray(image)
+            if self.ring is None or image.nbytes > self.ring.slot_bytes:
+                if self.ring is not None:
+                    self.ring.close()
+                self.ring = FrameRing(config.SUPERVISOR_RING_SLOTS, image.nbytes)
+
+            # 응답 시간 초과 후 늦게 읽히는 슬롯을 덮어쓰지 않도록 슬롯을 돌아가며 사용
+            slot = self.next_slot
+            self.next_slot = (slot + 1) % self.ring.slots
+            self.ring.write(slot, image)
+            self.sequence += 1
+
+            start = time.monotonic()
+            self.request_queue.put((self.camera_index, self.ring.name, self.ring.slots, self.ring.slot_bytes,
+                                    self.sequence, slot, image.shape, imgsz))
+            deadline = start + config.SUPERVISOR_INFERENCE_TIMEOUT
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise queue.Empty
+                    sequence, results = self.response_queue.get(timeout=remaining)
+                except queue.Empty:
+                    self.stats[TIMEOUTS] += 1
+                    logger.warning(f"Inference timed out after {config.SUPERVISOR_INFERENCE_TIMEOUT}s")
+                    return []
+                if sequence == self.sequence:
+                    break  # 이전 요청의 늦은 응답은 버림
+
+            self.stats[INFERENCES] += 1
+            self.stats[INFERENCE_SECONDS] += time.monotonic() - start
+
+            offset_x, offset_y = offset
+            detections = []
+            for (x1, y1, x2, y2), keypoints, conf in results:
+                if offset_x or offset_y:
+                    keypoints[:, 0] += offset_x
+                    keypoints[:, 1] += offset_y
+                detections.append({
+                    'bbox': (x1 + offset_x, y1 + offset_y, x2 + offset_x, y2 + offset_y),
+                    'keypoints': keypoints,
+                    'conf': conf
+                })
+            return detections
+
+        def process_frame(self, frame: np.ndarray, timestamp: Optional[float] = None):
+            result = super().process_frame(frame, timestamp)
+            self.stats[HEARTBEAT] = time.monotonic()
+            self.stats[FRAMES] += 1
+            if result[1]:
+                self.stats[FALLS] += 1
+            return result
+
+        def close(self):
+            if self.ring is not None:
+                self.ring.close()
+                self.ring = None
+
+    return RemoteFallDetector()
+
+
+def camera_worker(camera_index: int, camera_id: str, source, overrides: dict,
+                  request_queue, response_queue, stats, inference_ready):
+    """카메라 프로세스: 캡처 + 버퍼링 + 포즈 분석 + 녹화/알림 (추론만 공유 프로세스에 위임)"""
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL),
+                        format=f'%(asctime)s - {camera_id} - %(name)s - %(levelname)s - %(message)s')
+    apply_overrides(overrides)
+    config.HEADLESS = True
+    config.CAMERA_ID = camera_id
+    config.METRICS_ENABLED = False  # 포트 충돌 방지 (통계는 supervisor가 통합)
+    if config.DEVICE_ID:
+        config.DEVICE_ID = f"{config.DEVICE_ID}-{camera_id}"
+
+    # 같은 시각 낙상 시 파일 이름이 겹치지 않도록 카메라별 디렉토리 사용
+    for name in ('FALL_IMAGES_DIR', 'FALL_VIDEOS_DIR', 'VIDEO_PASSTHROUGH_DIR', 'KEYPOINT_RECORDING_DIR'):
+        if getattr(config, name):
+            setattr(config, name, str(Path(getattr(config, name)) / camera_id))
+    for directory in (config.FALL_IMAGES_DIR, config.FALL_VIDEOS_DIR):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+
+    from main import FallDetectionSystem
+
+    detector = make_remote_detector(camera_index, request_queue, response_queue, stats, inference_ready)
+    try:
+        FallDetectionSystem(camera_source=source, detector=detector).run()
+    finally:
+        detector.close()
+
+
+def inference_worker(overrides: dict, request_queue, response_queues: list, stats, inference_ready):
+    """공유 추론 프로세스: 모델 1개로 모든 카메라의 프레임을 묶어 추론"""
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL),
+                        format='%(asctime)s - inference - %(name)s - %(levelname)s - %(message)s')
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # supervisor가 종료 신호(None)를 보냄
+    apply_overrides(overrides)
+
+    from fall_detector import FallDetector
+
+    detector = FallDetector(config)
+    rings = {}  # camera_index -> FrameRing
+    inference_ready.set()
+    logger.info(f"Shared inference ready on {detector.device}")
+
+    try:
+        while True:
+            stats[HEARTBEAT] = time.monotonic()
+            try:
+                request = request_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if request is None:
+                break
+
+            # 동시에 도착한 다른 카메라 요청도 함께 처리 (카메라당 대기 요청은 최대 1개)
+            batch = [request]
+            while len(batch) < len(response_queues):
+                try:
+                    request = request_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    request_queue.put(None)
+                    break
+                batch.append(request)
+
+            groups = defaultdict(list)
+            for request in batch:
+                groups[request[-1]].append(request)
+
+            for imgsz, requests in groups.items():
+                images, valid = [], []
+                for camera_index, ring_name, slots, slot_bytes, sequence, slot, shape, _ in requests:
+                    ring = rings.get(camera_index)
+                    try:
+                        if ring is None or ring.name != ring_name:
+                            if ring is not None:
+                                ring.close()
+                            ring = rings[camera_index] = FrameRing(slots, slot_bytes, name=ring_name)
+                    except FileNotFoundError:
+                        # 카메라 프로세스가 재시작되어 링이 사라짐
+                        rings.pop(camera_index, None)
+                        response_queues[camera_index].put((sequence, []))
+                        continue
+                    images.append(ring.view(slot, shape))
+                    valid.append((camera_index, sequence))
+
+                if not images:
+                    continue
+                start = time.monotonic()
+                try:
+                    results = detector.run_pose_batch(images, imgsz)
+                except Exception as e:
+                    logger.error(f"Error in shared inference: {e}")
+                    results = [[] for _ in images]
+                stats[INFERENCE_SECONDS] += time.monotonic() - start
+                stats[INFERENCES] += len(images)
+                stats[BATCHES] += 1
+                images.clear()
+
+                for (camera_index, sequence), detections in zip(valid, results):
+                    response_queues[camera_index].put((sequence, [
+                        (d['bbox'], np.asarray(d['keypoints'], dtype=np.float32), d['conf']) for d in detections
+                    ]))
+    finally:
+        for ring in rings.values():
+            ring.close()
+
+
+class WorkerHandle:
+    """재시작 가능한 자식 프로세스 1개의 상태"""
+
+    def __init__(self, ctx, name: str):
+        self.name = name
+        self.stats = ctx.RawArray('d', STAT_FIELDS)
+        self.process = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.failures = 0  # 연속 실패 횟수 (백오프 단계)
+        self.next_start_time = 0.0
+        self.last_frames = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self, ctx, target, args: tuple):
+        now = time.monotonic()
+        self.stats[HEARTBEAT] = now + config.SUPERVISOR_STARTUP_GRACE_SECONDS
+        self.process = ctx.Process(target=target, args=args, name=self.name, daemon=False)
+        self.process.start()
+        self.started_at = now
+        logger.info(f"Started {self.name} (pid {self.process.pid})")
+
+    def stop(self, timeout: float = 10.0):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+            if self.process.is_alive():
+                logger.warning(f"{self.name} did not stop within {timeout}s, killing")
+                self.process.kill()
+        self.process.join()
+        self.process = None
+
+    def schedule_restart(self, now: float, reason: str):
+        if now - self.started_at >= HEALTHY_RUN_SECONDS:
+            self.failures = 0
+        backoff = RESTART_BACKOFF_SECONDS[min(self.failures, len(RESTART_BACKOFF_SECONDS) - 1)]
+        self.failures += 1
+        self.restarts += 1
+        self.next_start_time = now + backoff
+        logger.warning(f"{self.name} {reason}, restarting in {backoff}s")
+
+
+class EdgeSupervisor:
+    """카메라 프로세스들과 공유 추론 프로세스 실행/감시/재시작 + 통합 통계"""
+
+    def __init__(self, cameras: List[Tuple[str, object]], overrides: dict):
+        # CUDA/스레드를 쓰는 부모를 fork하지 않도록 spawn 사용
+        self.ctx = mp.get_context('spawn')
+        self.cameras = cameras
+        self.overrides = overrides
+        self.request_queue = self.ctx.Queue()
+        self.response_queues = [self.ctx.Queue() for _ in cameras]
+        self.inference_ready = self.ctx.Event()
+        self.inference = WorkerHandle(self.ctx, 'inference')
+        self.workers = [WorkerHandle(self.ctx, f'camera-{camera_id}') for camera_id, _ in cameras]
+        self.running = False
+        self.last_stats_time = None
+
+    def start_inference(self):
+        self.inference_ready.clear()
+        self.inference.start(self.ctx, inference_worker,
+                             (self.overrides, self.request_queue, self.response_queues,
+                              self.inference.stats, self.inference_ready))
+
+    def start_camera(self, index: int):
+        camera_id, source = self.cameras[index]
+        worker = self.workers[index]
+        worker.start(self.ctx, camera_worker,
+                     (index, camera_id, source, self.overrides, self.request_queue, self.response_queues[index],
+                      worker.stats, self.inference_ready))
+
+    def check_health(self, now: float):
+        """죽었거나 하트비트가 끊긴 프로세스 재시작 (백오프)"""
+        handles = [(self.inference, self.start_inference)] + \
+                  [(worker, lambda i=i: self.start_camera(i)) for i, worker in enumerate(self.workers)]
+        for handle, start in handles:
+            if handle.process is not None:
+                if not handle.process.is_alive():
+                    handle.schedule_restart(now, f"exited with code {handle.process.exitcode}")
+                    handle.process.join()
+                    handle.process = None
+                elif now - handle.stats[HEARTBEAT] > config.SUPERVISOR_STALL_SECONDS:
+                    handle.schedule_restart(now, f"stalled for {now - handle.stats[HEARTBEAT]:.0f}s")
+                    handle.stop(timeout=5.0)
+            if handle.process is None and now >= handle.next_start_time:
+                start()
+
+    def log_stats(self, now: float):
+        """카메라별/전체 통계 출력 (FPS는 직전 출력 이후 구간 기준)"""
+        elapsed = now - self.last_stats_time
+        self.last_stats_time = now
+        total_fps = 0.0
+        logger.info("=" * 60)
+        for (camera_id, _), worker in zip(self.cameras, self.workers):
+            stats = worker.stats
+            frames = stats[FRAMES]
+            fps = (frames - worker.last_frames) / elapsed if elapsed > 0 and frames >= worker.last_frames else 0.0
+            worker.last_frames = frames
+            total_fps += fps
+            inference_ms = stats[INFERENCE_SECONDS] / stats[INFERENCES] * 1000 if stats[INFERENCES] else 0.0
+            logger.info(f"{camera_id}: {'alive' if worker.alive else 'down'} fps={fps:.1f} "
+                        f"inference_rtt={inference_ms:.1f}ms falls={stats[FALLS]:.0f} "
+                        f"timeouts={stats[TIMEOUTS]:.0f} restarts={worker.restarts}")
+
+        stats = self.inference.stats
+        batch_size = stats[INFERENCES] / stats[BATCHES] if stats[BATCHES] else 0.0
+        batch_ms = stats[INFERENCE_SECONDS] / stats[BATCHES] * 1000 if stats[BATCHES] else 0.0
+        logger.info(f"inference: {'alive' if self.inference.alive else 'down'} images={stats[INFERENCES]:.0f} "
+                    f"avg_batch={batch_size:.2f} avg_batch_time={batch_ms:.1f}ms "
+                    f"restarts={self.inference.restarts}")
+        logger.info(f"Total: {len(self.cameras)} cameras, {total_fps:.1f} fps")
+        logger.info("=" * 60)
+
+    def request_stop(self, signum, frame):
+        logger.info(f"Received signal {signum}, shutting down")
+        self.running = False
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        self.start_inference()
+        for index in range(len(self.cameras)):
+            self.start_camera(index)
+
+        self.running = True
+        self.last_stats_time = time.monotonic()
+        try:
+            while self.running:
+                time.sleep(1.0)
+                now = time.monotonic()
+                self.check_health(now)
+                if now - self.last_stats_time >= config.SUPERVISOR_STATS_SECONDS:
+                    self.log_stats(now)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        # 카메라 프로세스는 SIGTERM으로 정상 종료 (녹화 중인 영상 마무리), 그 다음 추론 프로세스 종료
+        for worker in self.workers:
+            if worker.alive:
+                worker.process.terminate()
+        for worker in self.workers:
+            worker.stop(timeout=30.0)
+        self.request_queue.put(None)
+        if self.inference.process is not None:
+            self.inference.process.join(10.0)
+        self.inference.stop()
+        self.log_stats(time.monotonic())
+        logger.info("Supervisor shutdown complete")
+
+
+def parse_camera(spec: str, index: int) -> Tuple[str, object]:
+    """'카메라ID=소스' 또는 '소스' → (camera_id, source), 숫자 소스는 웹캠 인덱스"""
+    camera_id, source = None, spec
+    name, sep, rest = spec.partition('=')
+    if sep and name and not any(c in name for c in ':/'):
+        camera_id, source = name, rest
+    if camera_id is None:
+        camera_id = f"{config.CAMERA_ID}-{index}"
+    try:
+        source = int(source)
+    except ValueError:
+        pass
+    return camera_id, source
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-camera Fall Detection Supervisor')
+    parser.add_argument('--camera', action='append', default=[], metavar='[ID=]SOURCE',
+                        help='Camera source, repeatable (e.g. front=rtsp://..., or 0 for a webcam)')
+    parser.add_argument('--debug', action='store_true',
+                        help='Enable debug mode (overlays drawn on saved clips/thumbnails)')
+    parser.add_argument('--passthrough', action='store_true',
+                        help='Save fall videos by remuxing each RTSP stream instead of re-encoding')
+    parser.add_argument('--model', type=str, default=config.YOLO_POSE_MODEL,
+                        choices=['yolov11n-pose.pt', 'yolov8n-pose.pt'],
+                        help='YOLO-pose model to use')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL),
+                        format='%(asctime)s - supervisor - %(name)s - %(levelname)s - %(message)s')
+
+    specs = args.camera or [spec.strip() for spec in config.SUPERVISOR_CAMERAS.split(',') if spec.strip()]
+    if not specs:
+        parser.error('no cameras given (use --camera or SUPERVISOR_CAMERAS)')
+    cameras = [parse_camera(spec, index) for index, spec in enumerate(specs)]
+    camera_ids = [camera_id for camera_id, _ in cameras]
+    if len(set(camera_ids)) != len(camera_ids):
+        parser.error(f'duplicate camera ids: {camera_ids}')
+
+    overrides = {'YOLO_POSE_MODEL': args.model}
+    if args.debug:
+        overrides['DEBUG_MODE'] = True
+        overrides['LOG_LEVEL'] = 'DEBUG'
+    if args.passthrough:
+        overrides['VIDEO_PASSTHROUGH'] = True
+
+    logger.info(f"Supervising {len(cameras)} cameras: {', '.join(camera_ids)} (pid {os.getpid()})")
+    EdgeSupervisor(cameras, overrides).run()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,196 @@
+"""
+Edge 성능 텔레메트리 수집 및 배치 전송 모듈
+FPS, 프레임 처리 지연 백분위수, 큐 깊이, 낙상 알림 전송 대기 수, 드롭 프레임, CPU/메모리를
+주기적으로 샘플링하여 Django 서버(api_root/Telemetry/)로 묶어서 전송
+"""
+
+import os
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime, timezone
+import numpy as np
+
+try:
+    import psutil
+except ImportError:  # 선택 의존성: 없으면 표준 라이브러리로 근사
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceSampler:
+    """프로세스 CPU 사용률(%)과 메모리(MB) 측정"""
+
+    def __init__(self):
+        self.process = psutil.Process(os.getpid()) if psutil is not None else None
+        if self.process is not None:
+            self.process.cpu_percent(None)  # 첫 호출은 기준점 설정
+        self.last_cpu_time = time.process_time()
+        self.last_wall_time = time.monotonic()
+
+    def sample(self) -> dict:
+        if self.process is not None:
+            return {
+                'cpu_percent': self.process.cpu_percent(None),
+                'memory_mb': self.process.memory_info().rss / (1024 * 1024)
+            }
+
+        # psutil이 없으면 프로세스 CPU 시간 / 경과 시간으로 계산
+        cpu_time = time.process_time()
+        wall_time = time.monotonic()
+        elapsed = wall_time - self.last_wall_time
+        cpu_percent = (cpu_time - self.last_cpu_time) / elapsed * 100 if elapsed > 0 else 0.0
+        self.last_cpu_time = cpu_time
+        self.last_wall_time = wall_time
+
+        return {'cpu_percent': cpu_percent, 'memory_mb': self._read_memory_mb()}
+
+    @staticmethod
+    def _read_memory_mb() -> float:
+        try:
+            with open('/proc/self/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        if resource is not None:
+            # Linux: KB 단위 최대 RSS (현재 값이 아닌 최댓값)
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return 0.0
+
+
+class TelemetryReporter:
+    """
+    프레임 단위 측정값을 모아 TELEMETRY_SAMPLE_SECONDS 마다 샘플 1개로 요약하고,
+    TELEMETRY_FLUSH_SECONDS 마다 백그라운드 스레드에서 서버로 배치 전송
+
+    메인 루프에서는 record_frame()만 호출하므로 네트워크 지연이 프레임 처리에 영향을 주지 않음
+    """
+
+    def __init__(self, config, api_client):
+        self.config = config
+        self.api_client = api_client
+        self.device_id = str(getattr(config, 'DEVICE_ID', None) or getattr(config, 'CAMERA_ID', 'default'))
+        self.sample_seconds = config.TELEMETRY_SAMPLE_SECONDS
+        self.flush_seconds = config.TELEMETRY_FLUSH_SECONDS
+
+        # 현재 샘플 구간 측정값
+        self.latencies = []
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self.buffer_depth_max = 0
+        self.upload_backlog_max = 0
+        self.last_capture_time = None
+        self.interval_start = time.monotonic()
+        self.expected_interval = 1.0 / config.FPS if config.FPS else None
+
+        # 전송 대기 샘플 (서버 장애 시에도 메모리 상한 유지, 오래된 샘플부터 폐기)
+        self.pending = deque(maxlen=config.TELEMETRY_MAX_PENDING)
+        self.lock = threading.Lock()
+        self.resources = ResourceSampler()
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._flush_loop, name='telemetry', daemon=True)
+
+    def start(self):
+        self.interval_start = time.monotonic()
+        self.thread.start()
+        logger.info(f"Telemetry enabled for device '{self.device_id}' "
+                    f"(sample {self.sample_seconds}s, flush {self.flush_seconds}s)")
+
+    def stop(self):
+        """남은 샘플을 요약/전송 후 종료"""
+        self._close_interval(time.monotonic())
+        self.stop_event.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout=5)
+        self.flush()
+
+    def record_frame(self, capture_time: float, latency: float, buffer_depth: int = 0, upload_backlog: int = 0):
+        """
+        프레임 1개 처리 결과 기록
+
+        Args:
+            capture_time: 프레임 캡처 시각 (time.monotonic())
+            latency: 프레임 처리 시간 (초)
+            buffer_depth: 현재 프레임 버퍼에 쌓인 프레임 수
+            upload_backlog: 녹화를 마치고 인코딩/서버 전송을 기다리는 낙상 알림 수
+        """
+        self.frame_count += 1
+        self.latencies.append(latency)
+        if buffer_depth > self.buffer_depth_max:
+            self.buffer_depth_max = buffer_depth
+        if upload_backlog > self.upload_backlog_max:
+            self.upload_backlog_max = upload_backlog
+
+        # 캡처 간격이 카메라 주기보다 크게 벌어지면 그 사이 프레임은 드롭된 것으로 간주
+        if self.last_capture_time is not None and self.expected_interval:
+            gap = capture_time - self.last_capture_time
+            if gap > self.expected_interval * 1.5:
+                self.dropped_frames += int(round(gap / self.expected_interval)) - 1
+        self.last_capture_time = capture_time
+
+        if capture_time - self.interval_start >= self.sample_seconds:
+            self._close_interval(capture_time)
+
+    def _close_interval(self, now: float):
+        """현재 구간을 샘플 1개로 요약하여 전송 대기열에 추가"""
+        elapsed = now - self.interval_start
+        if self.frame_count == 0 or elapsed <= 0:
+            return
+
+        latencies_ms = np.asarray(self.latencies) * 1000.0
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+
+        sample = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'fps_avg': round(self.frame_count / elapsed, 2),
+            'latency_p50_ms': round(float(p50), 2),
+            'latency_p95_ms': round(float(p95), 2),
+            'latency_p99_ms': round(float(p99), 2),
+            'buffer_depth_max': self.buffer_depth_max,
+            'upload_backlog_max': self.upload_backlog_max,
+            'dropped_frames': self.dropped_frames,
+        }
+        sample.update({key: round(value, 2) for key, value in self.resources.sample().items()})
+
+        with self.lock:
+            self.pending.append(sample)
+
+        self.latencies = []
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self.buffer_depth_max = 0
+        self.upload_backlog_max = 0
+        self.interval_start = now
+
+    def _flush_loop(self):
+        while not self.stop_event.wait(self.flush_seconds):
+            self.flush()
+
+    def flush(self) -> bool:
+        """대기 중인 샘플을 한 번의 요청으로 전송 (실패 시 다음 주기에 재시도)"""
+        with self.lock:
+            if not self.pending:
+                return True
+            # 전송하는 동안 추가되는 샘플은 새 대기열에 쌓음
+            # (같은 대기열에서 보낸 만큼 빼면 그 사이 maxlen 초과로 밀려난 만큼 안 보낸 샘플이 지워짐)
+            batch = self.pending
+            self.pending = deque(maxlen=batch.maxlen)
+
+        if self.api_client.send_telemetry(self.device_id, list(batch)):
+            return True
+
+        with self.lock:
+            # 실패: 보내지 못한 샘플을 앞에 되돌림 (넘치면 가장 오래된 샘플부터 폐기)
+            batch.extend(self.pending)
+            self.pending = batch
+        return False
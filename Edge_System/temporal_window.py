@@ -0,0 +1,221 @@
+"""
+사람별 시간 창(temporal window) 특징
+
+최근 window_seconds 동안의 머리/엉덩이 높이와 바운딩 박스 비율을 고정 크기 NumPy 링 버퍼에 보관하고,
+선형 회귀 누적합(n, Σt, Σt², Σy, Σty)을 샘플 추가/제거 시에만 갱신하여
+창 전체를 다시 훑지 않고 O(1)로 다음 값을 계산:
+    - 머리/엉덩이 수직 속도 (프레임 높이 / 초, 아래 방향이 양수)
+    - 머리/엉덩이 수직 가속도 (프레임 높이 / 초²)
+    - 가로/세로 비율 추세 (초당 변화량)
+
+모든 값은 실제 프레임 시각으로 정규화하므로 FPS가 낮거나 흔들려도 단위가 유지됨
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# 시계열 인덱스
+HEAD, HIP, ASPECT, HEAD_VELOCITY, HIP_VELOCITY = range(5)
+SERIES_COUNT = 5
+
+# 누적합 부동소수 오차가 쌓이지 않도록 이 시간(초)마다 기준 시각을 옮기고 누적합을 다시 계산
+REBASE_SECONDS = 600.0
+
+
+class FeatureWindow:
+    """사람 한 명의 시간 창 (링 버퍼 + 증분 회귀 통계)"""
+
+    def __init__(self, window_seconds: float = 1.0, size: int = 64):
+        self.window_seconds = window_seconds
+        self.size = size
+        # 시계열별 (시각, 값), 값이 없으면 NaN
+        self.times = np.zeros((size, SERIES_COUNT), dtype=np.float64)
+        self.values = np.full((size, SERIES_COUNT), np.nan, dtype=np.float64)
+        self.sample_times = np.zeros(size, dtype=np.float64)
+        self.start = 0  # 가장 오래된 샘플 위치
+        self.count = 0
+        self.reference = None  # 시각 기준점 (누적합 정밀도 유지용)
+
+        # 시계열별 회귀 누적합
+        self.n = [0] * SERIES_COUNT
+        self.sum_t = [0.0] * SERIES_COUNT
+        self.sum_tt = [0.0] * SERIES_COUNT
+        self.sum_y = [0.0] * SERIES_COUNT
+        self.sum_ty = [0.0] * SERIES_COUNT
+
+        # 순간 속도 계산용 직전 샘플
+        self.last_time = None
+        self.last_head = None
+        self.last_hip = None
+
+    def _add(self, series: int, t: float, y: float, sign: int):
+        self.n[series] += sign
+        self.sum_t[series] += sign * t
+        self.sum_tt[series] += sign * t * t
+        self.sum_y[series] += sign * y
+        self.sum_ty[series] += sign * t * y
+
+    def _evict_oldest(self):
+        index = self.start
+        for series, (t, y) in enumerate(zip(self.times[index].tolist(), self.values[index].tolist())):
+            if not math.isnan(y):
+                self._add(series, t, y, -1)
+        self.start = (self.start + 1) % self.size
+        self.count -= 1
+
+    def _rebase(self, reference: float):
+        """기준 시각을 옮기고 링 버퍼에서 누적합 재계산 (REBASE_SECONDS 마다 한 번, O(size))"""
+        shift = reference - self.reference
+        self.reference = reference
+        self.times -= shift
+        self.sample_times -= shift
+        self.last_time -= shift
+        self.n = [0] * SERIES_COUNT
+        self.sum_t = [0.0] * SERIES_COUNT
+        self.sum_tt = [0.0] * SERIES_COUNT
+        self.sum_y = [0.0] * SERIES_COUNT
+        self.sum_ty = [0.0] * SERIES_COUNT
+        for offset in range(self.count):
+            index = (self.start + offset) % self.size
+            for series, (t, y) in enumerate(zip(self.times[index].tolist(), self.values[index].tolist())):
+                if not math.isnan(y):
+                    self._add(series, t, y, 1)
+
+    def push(self, timestamp: float, head_y: Optional[float], hip_y: Optional[float],
+             aspect_ratio: Optional[float]) -> dict:
+        """
+        샘플 추가 후 현재 특징 반환
+
+        Args:
+            timestamp: 프레임 시각 (초)
+            head_y, hip_y: 프레임 높이로 정규화한 머리/엉덩이 높이 (없으면 None)
+            aspect_ratio: 바운딩 박스 가로/세로 비율 (없으면 None)
+        """
+        if self.reference is None:
+            self.reference = timestamp
+        t = timestamp - self.reference
+        if self.last_time is not None and t > REBASE_SECONDS:
+            self._rebase(timestamp - self.window_seconds)
+            t = timestamp - self.reference
+
+        # 창을 벗어났거나 버퍼가 가득 찬 샘플 제거
+        while self.count and (self.count == self.size or t - self.sample_times[self.start] > self.window_seconds):
+            self._evict_oldest()
+
+        # 순간 속도 (직전 샘플과의 차분, 두 샘플 중간 시각에 기록)
+        head_velocity = hip_velocity = None
+        velocity_time = t
+        if self.last_time is not None and t > self.last_time:
+            dt = t - self.last_time
+            velocity_time = (t + self.last_time) / 2
+            if head_y is not None and self.last_head is not None:
+                head_velocity = (head_y - self.last_head) / dt
+            if hip_y is not None and self.last_hip is not None:
+                hip_velocity = (hip_y - self.last_hip) / dt
+
+        index = (self.start + self.count) % self.size
+        self.sample_times[index] = t
+        for series, (series_time, y) in enumerate(((t, head_y), (t, hip_y), (t, aspect_ratio),
+                                                   (velocity_time, head_velocity), (velocity_time, hip_velocity))):
+            self.times[index, series] = series_time
+            if y is None:
+                self.values[index, series] = np.nan
+            else:
+                self.values[index, series] = y
+                self._add(series, series_time, y, 1)
+        self.count += 1
+
+        self.last_time = t
+        self.last_head = head_y
+        self.last_hip = hip_y
+        return self.features()
+
+    def slope(self, series: int, min_samples: int = 2) -> Optional[float]:
+        """시계열의 최소제곱 기울기 (초당 변화량)"""
+        n = self.n[series]
+        if n < min_samples:
+            return None
+        denominator = n * self.sum_tt[series] - self.sum_t[series] ** 2
+        if denominator <= 1e-12:
+            return None
+        return (n * self.sum_ty[series] - self.sum_t[series] * self.sum_y[series]) / denominator
+
+    def features(self) -> dict:
+        return {
+            'head_velocity': self.slope(HEAD, 3),
+            'hip_velocity': self.slope(HIP, 3),
+            'head_acceleration': self.slope(HEAD_VELOCITY, 3),
+            'hip_acceleration': self.slope(HIP_VELOCITY, 3),
+            'aspect_trend': self.slope(ASPECT, 3),
+        }
+
+
+class Track:
+    """IoU로 프레임 간 연결한 사람 한 명"""
+
+    __slots__ = ('track_id', 'bbox', 'last_seen', 'window')
+
+    def __init__(self, track_id: int, bbox: Tuple[int, int, int, int], timestamp: float, window: FeatureWindow):
+        self.track_id = track_id
+        self.bbox = bbox
+        self.last_seen = timestamp
+        self.window = window
+
+
+def bbox_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    if intersection == 0:
+        return 0.0
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+class TrackManager:
+    """
+    탐욕적 IoU 매칭으로 감지 결과를 사람별 Track에 연결
+    (낙상 중에는 바운딩 박스 모양이 크게 바뀌므로 임계값을 낮게 둠)
+    """
+
+    def __init__(self, window_seconds: float = 1.0, window_size: int = 64,
+                 iou_threshold: float = 0.2, max_age_seconds: float = 1.0):
+        self.window_seconds = window_seconds
+        self.window_size = window_size
+        self.iou_threshold = iou_threshold
+        self.max_age_seconds = max_age_seconds
+        self.tracks: List[Track] = []
+        self.next_id = 0
+
+    def update(self, detections: List[dict], timestamp: float) -> List[Track]:
+        """감지 결과 순서대로 대응하는 Track 목록 반환 (매칭되지 않으면 새 Track 생성)"""
+        self.tracks = [track for track in self.tracks if timestamp - track.last_seen <= self.max_age_seconds]
+
+        pairs = []
+        for detection_index, detection in enumerate(detections):
+            for track_index, track in enumerate(self.tracks):
+                iou = bbox_iou(detection['bbox'], track.bbox)
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, detection_index, track_index))
+        pairs.sort(reverse=True)
+
+        assigned: List[Optional[Track]] = [None] * len(detections)
+        used_tracks = set()
+        for _, detection_index, track_index in pairs:
+            if assigned[detection_index] is None and track_index not in used_tracks:
+                assigned[detection_index] = self.tracks[track_index]
+                used_tracks.add(track_index)
+
+        for detection_index, detection in enumerate(detections):
+            track = assigned[detection_index]
+            if track is None:
+                track = Track(self.next_id, detection['bbox'], timestamp,
+                              FeatureWindow(self.window_seconds, self.window_size))
+                self.next_id += 1
+                self.tracks.append(track)
+                assigned[detection_index] = track
+            track.bbox = detection['bbox']
+            track.last_seen = timestamp
+        return assigned
@@ -116,6 +116,64 @@ def test_modules():
         return False
 
 
+def test_frame_rate_independence():
+    """낙상 확정/쿨다운이 처리 FPS와 무관한지 합성 키포인트 재생으로 확인 (모델/카메라 불필요)"""
+    logger.info("\nTesting frame-rate independence (5/10/30 fps replay)...")
+    try:
+        from benchmark import generate_synthetic_clip, replay
+
+        frame_rates = (5.0, 10.0, 30.0)
+        # 의심 시작과 확정이 각각 프레임 단위로 양자화되므로 가장 느린 FPS의 두 프레임 간격까지 허용
+        tolerance = 2.0 / min(frame_rates) + 1e-6
+
+        # 낙상 구간 직후(일어나는 중)의 재감지는 오탐이 아닌 중복으로 봄 (benchmark.py 기본 허용 시간)
+        event_margin = 2.0
+
+        def decisions(seed, fps):
+            """낙상 구간별 첫 감지 시각 (감지 못하면 None) + 구간 밖 감지(오탐) 수"""
+            clip = generate_synthetic_clip(seed, fps=fps)
+            frames = [(t, detections, False) for t, detections in clip['frames']]
+            detections_at = replay(frames, clip['frame_height'])
+            first = []
+            for event in clip['events']:
+                inside = [t for t in detections_at if event['start'] <= t <= event['end']]
+                first.append(inside[0] if inside else None)
+            outside = sum(1 for t in detections_at
+                          if not any(event['start'] <= t <= event['end'] + event_margin for event in clip['events']))
+            return first, outside
+
+        mismatches = 0
+        for seed in range(30):
+            reference_first, reference_outside = decisions(seed, max(frame_rates))
+            for fps in frame_rates[:-1]:
+                first, outside = decisions(seed, fps)
+                same = outside == reference_outside and all(
+                    (a is None) == (b is None) and (a is None or abs(a - b) <= tolerance)
+                    for a, b in zip(first, reference_first))
+                if not same:
+                    logger.error(f"✗ seed {seed}: {fps:g} fps {first} (+{outside} false) != "
+                                 f"{max(frame_rates):g} fps {reference_first} (+{reference_outside} false)")
+                    mismatches += 1
+
+        # 카메라 끊김: 의심 시작 직후 긴 공백이 있어도 한 프레임이 fall_duration_seconds를 채우지 못함
+        from fall_state import FallStateMachine
+        state = FallStateMachine({'fall_duration_seconds': 0.5, 'cooldown_seconds': 5.0})
+        stalled = [state.update(True, t) for t in (0.0, 3.0)]
+        confirmed = state.update(True, 3.0 + state.max_step_seconds)
+        if any(stalled) or not confirmed:
+            logger.error(f"✗ stalled step: confirmed {stalled + [confirmed]} (expected only on the 3rd frame)")
+            mismatches += 1
+
+        if mismatches:
+            return False
+        logger.info(f"✓ Identical fall decisions at {', '.join(f'{fps:g}' for fps in frame_rates)} fps "
+                    f"(detection times within {tolerance:.2f}s)")
+        return True
+    except Exception as e:
+        logger.error(f"✗ Frame-rate independence test failed: {e}")
+        return False
+
+
 def main():
     """테스트 실행"""
     logger.info("=" * 60)
@@ -126,6 +184,7 @@ def main():
         ("Library imports", test_imports),
         ("Camera access", test_camera),
         ("Project modules", test_modules),
+        ("Frame-rate independence", test_frame_rate_independence),
         ("YOLO models", test_models),
         ("Django connection", test_django_connection),
     ]
@@ -0,0 +1,373 @@
+"""
+FALL_DETECTION_PARAMS 자동 튜닝
+
+라벨이 있는 키포인트 녹화(또는 합성 클립)에서 임계값과 무관한 프레임별 측정값을
+한 번만 계산해 두고, 무작위로 뽑은 파라미터 조합마다 점수를 numpy로 일괄 계산한 뒤
+상태 머신만 다시 돌려 평가함 (프로세스 풀로 코어 수만큼 병렬 실행)
+
+오탐률(false alarms / hour)과 평균 감지 소요 시간의 파레토 최적 조합을 출력하며,
+--verify 를 주면 파레토 조합을 실제 PoseAnalyzer 파이프라인(benchmark.replay)으로 다시 평가함
+(일괄 계산은 쿨다운 직후 프레임의 비율 변화량을 직전 관측 기준으로 근사하므로 값이 약간 다를 수 있음)
+
+사용법:
+    python tune.py --keypoints recordings/ --samples 5000 --output tuning.json
+    python tune.py --synthetic 100 --samples 2000 --workers 8 --verify
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import config
+from benchmark import evaluate, generate_synthetic_clip, git_commit, load_annotations, replay
+from fall_state import FallDecisionPipeline, FallStateMachine
+from keypoint_recording import find_recordings
+
+logger = logging.getLogger(__name__)
+
+# 탐색 범위: (최소, 최대), 정수 파라미터는 정수로 샘플링
+SEARCH_SPACE = {
+    'aspect_ratio_threshold': (1.0, 2.2),
+    'bbox_height_ratio_threshold': (0.2, 0.6),
+    'horizontal_threshold': (0.15, 0.5),
+    'body_angle_threshold': (30.0, 75.0),
+    'fall_score_threshold': (0.3, 0.8),
+    'descent_velocity_threshold': (0.2, 1.5),
+    'descent_acceleration_threshold': (1.0, 8.0),
+    'aspect_trend_threshold': (0.5, 3.0),
+    'fall_duration_seconds': (0.1, 1.5),
+    'cooldown_seconds': (2.0, 10.0),
+}
+
+WEIGHT_KEYS = ('aspect_ratio', 'low_position', 'horizontal_body', 'body_angle', 'sudden_change',
+               'descent_velocity', 'descent_acceleration', 'aspect_trend')
+
+# PoseAnalyzer 와 동일한 기본 가중치
+DEFAULT_WEIGHTS = {'aspect_ratio': 0.25, 'low_position': 0.15, 'horizontal_body': 0.20,
+                   'body_angle': 0.15, 'sudden_change': 0.25}
+
+
+# ========== 입력 ==========
+
+def load_sources(args) -> List[dict]:
+    """
+    튜닝 데이터 목록: {'name', 'fps', 'frame_height', 'events', 'frames': () -> (timestamp, detections, skipped) 반복자}
+    frames 는 검증 단계에서 다시 읽을 수 있도록 함수로 보관
+    """
+    sources = []
+    if args.synthetic:
+        for offset in range(args.synthetic):
+            seed = args.seed + offset
+            clip = generate_synthetic_clip(seed, fps=args.fps)
+            sources.append({
+                'name': clip['name'], 'fps': clip['fps'], 'frame_height': clip['frame_height'],
+                'events': clip['events'],
+                'frames': lambda seed=seed: ((t, d, False) for t, d in
+                                             generate_synthetic_clip(seed, fps=args.fps)['frames']),
+            })
+        return sources
+
+    annotations = load_annotations(args.annotations) if args.annotations else {}
+    for recording in find_recordings(args.keypoints):
+        events = annotations.get(recording.name, recording.events)
+        if events is None:
+            logger.warning(f"{recording.name}: no labels, skipped")
+            continue
+        sources.append({'name': recording.name, 'fps': recording.fps, 'frame_height': recording.frame_height,
+                        'events': events, 'frames': recording.frames})
+    return sources
+
+
+def extract_features(source: dict) -> dict:
+    """
+    클립 하나의 임계값 무관 측정값을 관측(프레임 x 사람) 단위 배열로 계산
+
+    offsets[i]:offsets[i+1] 이 프레임 i 의 관측 범위 (CSR 형식), 계산할 수 없는 값은 NaN
+    시간 창 특징은 가중치와 무관하게 항상 계산 (창 길이는 config 값 고정)
+    """
+    # 시간 창 가중치를 켜서 사람별 추적이 항상 동작하도록 함
+    params = copy.deepcopy(config.FALL_DETECTION_PARAMS)
+    params['weights'] = dict(params.get('weights', DEFAULT_WEIGHTS), descent_velocity=1.0)
+    pipeline = FallDecisionPipeline(params)
+    analyzer = pipeline.analyzer
+    timestamps, offsets = [], [0]
+    aspect, delta, height, horizontal, angle = [], [], [], [], []
+    velocity, acceleration, trend = [], [], []
+    previous = None
+
+    for timestamp, detections, _ in source['frames']():
+        timestamps.append(timestamp)
+        tracks = pipeline.tracker.update(detections, timestamp) if detections else ()
+        for detection, track in zip(detections or (), tracks):
+            ar, hr, hz, ang = analyzer.measure_pose(detection['keypoints'], detection['bbox'],
+                                                    source['frame_height'])
+            temporal = pipeline.temporal_features(track, detection, source['frame_height'], timestamp)
+            velocity.append(max_defined(temporal['head_velocity'], temporal['hip_velocity']))
+            acceleration.append(max_defined(temporal['head_acceleration'], temporal['hip_acceleration']))
+            trend.append(nan_if_none(temporal['aspect_trend']))
+            # 비율 변화량은 PoseAnalyzer 와 같이 비율을 계산할 수 있었던 직전 관측 기준
+            delta.append(abs(ar - previous) if ar is not None and previous is not None else np.nan)
+            if ar is not None:
+                previous = ar
+            aspect.append(nan_if_none(ar))
+            height.append(hr)
+            horizontal.append(nan_if_none(hz))
+            angle.append(nan_if_none(ang))
+        offsets.append(len(aspect))
+
+    return {
+        'name': source['name'], 'fps': source['fps'], 'events': source['events'],
+        'timestamps': timestamps, 'offsets': offsets,
+        'aspect': np.array(aspect, dtype=np.float64), 'delta': np.array(delta, dtype=np.float64),
+        'height': np.array(height, dtype=np.float64), 'horizontal': np.array(horizontal, dtype=np.float64),
+        'angle': np.array(angle, dtype=np.float64),
+        'velocity': np.array(velocity, dtype=np.float64),
+        'acceleration': np.array(acceleration, dtype=np.float64),
+        'trend': np.array(trend, dtype=np.float64),
+    }
+
+
+def nan_if_none(value: Optional[float]) -> float:
+    return np.nan if value is None else value
+
+
+def max_defined(*values: Optional[float]) -> float:
+    """None 을 제외한 최댓값 (모두 None 이면 NaN)"""
+    return max((value for value in values if value is not None), default=np.nan)
+
+
+def excess_score(values: np.ndarray, threshold: float) -> np.ndarray:
+    """PoseAnalyzer._excess_score 벡터화"""
+    return np.where(values > threshold, np.minimum(1.0, (values - threshold) / threshold), 0.0)
+
+
+# ========== 평가 ==========
+
+def score_features(features: dict, params: dict) -> np.ndarray:
+    """PoseAnalyzer.analyze_pose() 의 점수 계산을 전체 관측에 대해 벡터화 (is_fall 배열 반환)"""
+    weights = params.get('weights', DEFAULT_WEIGHTS)
+    ar, delta = features['aspect'], features['delta']
+
+    aspect_threshold = params.get('aspect_ratio_threshold', 1.5)
+    wide = ar > aspect_threshold  # NaN 비교는 False
+    aspect_score = np.where(wide, np.minimum(1.0, ar - aspect_threshold), 0.0)
+    sudden_score = np.where(wide & (delta > 0.8), np.minimum(1.0, delta / 1.5), 0.0)
+
+    low_threshold = params.get('bbox_height_ratio_threshold', 0.4)
+    low = features['height'] - (1 - low_threshold)
+    position_score = np.where(low > 0, np.minimum(1.0, low / low_threshold), 0.0)
+
+    horizontal_threshold = params.get('horizontal_threshold', 0.3)
+    horizontal = features['horizontal']
+    horizontal_score = np.where(horizontal < horizontal_threshold, 1.0 - horizontal / horizontal_threshold, 0.0)
+
+    angle_threshold = params.get('body_angle_threshold', 60)
+    angle = features['angle']
+    angle_score = np.where(angle > angle_threshold, np.minimum(1.0, (angle - angle_threshold) / 30.0), 0.0)
+
+    score = (aspect_score * weights.get('aspect_ratio', 0.25) +
+             position_score * weights.get('low_position', 0.15) +
+             horizontal_score * weights.get('horizontal_body', 0.20) +
+             angle_score * weights.get('body_angle', 0.15) +
+             sudden_score * weights.get('sudden_change', 0.25))
+
+    # 시간 창 특징 (가중치가 0이면 계산 생략)
+    for key, feature, threshold_key, default in (
+            ('descent_velocity', 'velocity', 'descent_velocity_threshold', 0.6),
+            ('descent_acceleration', 'acceleration', 'descent_acceleration_threshold', 3.0),
+            ('aspect_trend', 'trend', 'aspect_trend_threshold', 1.5)):
+        weight = weights.get(key, 0.0)
+        if weight > 0:
+            score = score + excess_score(features[feature], params.get(threshold_key, default)) * weight
+    return score >= params.get('fall_score_threshold', 0.6)
+
+
+def simulate(features: dict, is_fall: np.ndarray, params: dict) -> List[float]:
+    """관측별 낙상 여부로 FallStateMachine 실행 (FallDecisionPipeline.process 와 같이 프레임당 한 번 갱신)"""
+    state = FallStateMachine(params)
+    flags = is_fall.tolist()
+    offsets = features['offsets']
+    detections_at = []
+    for index, timestamp in enumerate(features['timestamps']):
+        if state.in_cooldown(timestamp):
+            continue
+        start, end = offsets[index], offsets[index + 1]
+        if start == end:
+            state.no_person(timestamp)
+            continue
+        if state.update(any(flags[start:end]), timestamp):
+            detections_at.append(timestamp)
+    return detections_at
+
+
+_WORKER_CLIPS: List[dict] = []
+_WORKER_TOLERANCE = 2.0
+
+
+def _init_worker(clips: List[dict], tolerance: float):
+    global _WORKER_CLIPS, _WORKER_TOLERANCE
+    _WORKER_CLIPS = clips
+    _WORKER_TOLERANCE = tolerance
+
+
+def evaluate_params(params: dict) -> Optional[dict]:
+    """파라미터 조합 하나를 전체 클립에 대해 평가 (워커 프로세스에서 실행)"""
+    results = []
+    for features in _WORKER_CLIPS:
+        detections_at = simulate(features, score_features(features, params), params)
+        results.append({'frames': len(features['timestamps']), 'fps': features['fps'],
+                        'detections': detections_at, 'events': features['events']})
+    return evaluate(results, _WORKER_TOLERANCE)
+
+
+# ========== 탐색 ==========
+
+def sample_params(rng: np.random.Generator, base: dict) -> dict:
+    """탐색 범위에서 무작위 조합 하나 생성 (가중치는 합이 1인 Dirichlet 분포)"""
+    params = copy.deepcopy(base)
+    for key, (low, high) in SEARCH_SPACE.items():
+        if isinstance(low, int):
+            params[key] = int(rng.integers(low, high + 1))
+        else:
+            params[key] = round(float(rng.uniform(low, high)), 3)
+    weights = rng.dirichlet(np.ones(len(WEIGHT_KEYS)))
+    params['weights'] = {key: round(float(weight), 3) for key, weight in zip(WEIGHT_KEYS, weights)}
+    return params
+
+
+def pareto_front(candidates: List[dict], min_recall: float) -> List[dict]:
+    """
+    오탐률과 평균 감지 소요 시간이 모두 더 나은 조합이 없는 조합 목록 (오탐률 오름차순)
+    재현율이 min_recall 미만인 조합은 제외
+    """
+    eligible = [c for c in candidates
+                if c['quality'] and c['quality']['recall'] is not None and c['quality']['recall'] >= min_recall
+                and c['quality']['time_to_detect'] is not None]
+    eligible.sort(key=lambda c: (c['quality']['false_alarms_per_hour'],
+                                 c['quality']['time_to_detect']['mean'],
+                                 -c['quality']['recall']))
+    front = []
+    best_latency = float('inf')
+    for candidate in eligible:
+        latency = candidate['quality']['time_to_detect']['mean']
+        if latency < best_latency:
+            front.append(candidate)
+            best_latency = latency
+    return front
+
+
+def verify(sources: List[dict], params: dict, tolerance: float) -> Optional[dict]:
+    """실제 판정 파이프라인으로 재평가"""
+    results = []
+    for source in sources:
+        frames = list(source['frames']())
+        results.append({'frames': len(frames), 'fps': source['fps'], 'events': source['events'],
+                        'detections': replay(frames, source['frame_height'], params=params)})
+    return evaluate(results, tolerance)
+
+
+def summarize(quality: Optional[dict]) -> str:
+    if not quality:
+        return 'no labeled clips'
+    latency = quality['time_to_detect']['mean'] if quality['time_to_detect'] else float('nan')
+    precision = quality['precision'] if quality['precision'] is not None else float('nan')
+    return (f"FA/h={quality['false_alarms_per_hour']:.2f} detect={latency:.2f}s "
+            f"recall={quality['recall']:.3f} precision={precision:.3f} dup={quality['duplicates']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel FALL_DETECTION_PARAMS tuning')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--keypoints', nargs='+', help='Labeled keypoint recordings (or directories of them)')
+    source.add_argument('--synthetic', type=int, help='Number of synthetic clips to tune on')
+    parser.add_argument('--annotations', help='Labels overriding those stored in the recordings')
+    parser.add_argument('--fps', type=float, default=30.0, help='Frame rate of synthetic clips')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for synthetic clips and parameter sampling')
+    parser.add_argument('--samples', type=int, default=2000, help='Number of parameter combinations')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--tolerance', type=float, default=2.0,
+                        help='Seconds after an event end during which a detection still counts')
+    parser.add_argument('--min-recall', type=float, default=0.9, help='Minimum recall for Pareto candidates')
+    parser.add_argument('--verify', action='store_true', help='Re-evaluate the Pareto front with the exact pipeline')
+    parser.add_argument('--output', help='Write the JSON result to this file')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logging.getLogger('pose_analyzer').setLevel(logging.INFO)
+
+    sources = load_sources(args)
+    if not sources:
+        logger.error("No labeled clips to tune on")
+        return 1
+
+    start = time.perf_counter()
+    clips = [extract_features(source) for source in sources]
+    observations = sum(len(clip['aspect']) for clip in clips)
+    frames = sum(len(clip['timestamps']) for clip in clips)
+    logger.info(f"Features: {len(clips)} clips, {frames} frames, {observations} observations "
+                f"in {time.perf_counter() - start:.1f}s")
+
+    rng = np.random.default_rng(args.seed)
+    base = config.FALL_DETECTION_PARAMS
+    candidates = [copy.deepcopy(base)] + [sample_params(rng, base) for _ in range(args.samples)]
+
+    start = time.perf_counter()
+    chunksize = max(1, len(candidates) // (args.workers * 8))
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(clips, args.tolerance)) as executor:
+        qualities = list(executor.map(evaluate_params, candidates, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    logger.info(f"Evaluated {len(candidates)} combinations in {elapsed:.1f}s "
+                f"({len(candidates) * frames / elapsed / 1e6:.1f}M frames/s, {args.workers} workers)")
+
+    results = [{'params': params, 'quality': quality} for params, quality in zip(candidates, qualities)]
+    current = results[0]
+    front = pareto_front(results, args.min_recall)
+
+    if args.verify:
+        for candidate in front:
+            candidate['verified_quality'] = verify(sources, candidate['params'], args.tolerance)
+
+    print('=' * 60)
+    print(f"Current config: {summarize(current['quality'])}")
+    print(f"Pareto front ({len(front)} of {len(results)}, recall >= {args.min_recall}):")
+    for index, candidate in enumerate(front):
+        print(f"  [{index}] {summarize(candidate['quality'])}")
+        if 'verified_quality' in candidate:
+            print(f"      verified: {summarize(candidate['verified_quality'])}")
+    print('=' * 60)
+
+    if args.output:
+        report: Dict = {
+            'meta': {
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'commit': git_commit(),
+                'clips': len(clips),
+                'frames': frames,
+                'samples': args.samples,
+                'seed': args.seed,
+                'tolerance': args.tolerance,
+                'min_recall': args.min_recall,
+                'search_space': SEARCH_SPACE,
+            },
+            'current': current,
+            'pareto': front,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Result written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+낙상 영상 인코더
+
+프레임을 모아 두었다가 한꺼번에 쓰지 않고, 녹화하는 동안 별도 스레드에서 바로 인코딩하여
+녹화가 끝나는 시점에 파일이 거의 완성되어 있도록 함 (메모리는 큐 크기만큼만 사용)
+
+인코더 우선순위 (VIDEO_ENCODER='auto'):
+    1. ffmpeg + VAAPI 하드웨어 인코딩 (h264_vaapi, /dev/dri 렌더 노드가 있을 때)
+    2. ffmpeg + libx264 (ultrafast)
+    3. OpenCV VideoWriter (VIDEO_CODEC, 실패 시 mp4v)
+ffmpeg 출력은 +faststart MP4 (moov 박스를 앞에 두어 앱에서 내려받는 중에도 재생 가능)
+"""
+
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VAAPI_DEVICE = '/dev/dri/renderD128'
+
+_ffmpeg_encoders = None  # ffmpeg -encoders 결과 캐시
+
+
+def find_ffmpeg(path: str = 'ffmpeg') -> Optional[str]:
+    return shutil.which(path)
+
+
+def ffmpeg_has_encoder(ffmpeg: str, name: str) -> bool:
+    """ffmpeg 빌드가 해당 인코더를 지원하는지 (결과 캐시)"""
+    global _ffmpeg_encoders
+    if _ffmpeg_encoders is None:
+        try:
+            _ffmpeg_encoders = subprocess.run([ffmpeg, '-hide_banner', '-encoders'], capture_output=True,
+                                              text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            _ffmpeg_encoders = ''
+    return f' {name} ' in _ffmpeg_encoders
+
+
+class FFmpegEncoder:
+    """BGR 원시 프레임을 stdin 파이프로 ffmpeg 에 전달"""
+
+    def __init__(self, ffmpeg: str, path: str, width: int, height: int, fps: float,
+                 hardware: bool = False, crf: int = 23):
+        self.path = path
+        self.frame_shape = (height, width, 3)
+        self.name = 'ffmpeg-vaapi' if hardware else 'ffmpeg-libx264'
+
+        command = [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y']
+        if hardware:
+            command += ['-vaapi_device', VAAPI_DEVICE]
+        command += ['-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}', '-r', f'{fps:.3f}', '-i', '-']
+        if hardware:
+            command += ['-vf', 'format=nv12,hwupload', '-c:v', 'h264_vaapi', '-qp', str(crf)]
+        else:
+            command += ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', str(crf), '-pix_fmt', 'yuv420p']
+        command += ['-movflags', '+faststart', '-an', path]
+
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.PIPE)
+
+    def write(self, frame: np.ndarray):
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match encoder {self.frame_shape}")
+        self.process.stdin.write(np.ascontiguousarray(frame).data)
+
+    def close(self) -> bool:
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            _, stderr = self.process.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            _, stderr = self.process.communicate()
+        if self.process.returncode != 0:
+            logger.error(f"ffmpeg exited with {self.process.returncode}: "
+                         f"{stderr.decode(errors='replace').strip()[-500:]}")
+            return False
+        return True
+
+
+class OpenCVEncoder:
+    """cv2.VideoWriter (설정 코덱을 열 수 없으면 mp4v로 재시도)"""
+
+    def __init__(self, path: str, width: int, height: int, fps: float, codec: str = 'mp4v'):
+        import cv2
+
+        self.path = path
+        self.writer = None
+        for fourcc in dict.fromkeys((codec, 'mp4v')):
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+            if writer.isOpened():
+                self.writer = writer
+                self.name = f'opencv-{fourcc}'
+                break
+            logger.warning(f"OpenCV VideoWriter cannot open codec {fourcc}")
+        if self.writer is None:
+            raise RuntimeError(f"No usable OpenCV codec for {path}")
+
+    def write(self, frame: np.ndarray):
+        self.writer.write(frame)
+
+    def close(self) -> bool:
+        self.writer.release()
+        return True
+
+
+def pack_frame(frame: np.ndarray, jpeg_quality: int = 0) -> np.ndarray:
+    """버퍼 보관용 프레임 복사본 (jpeg_quality > 0 이면 JPEG 바이트 배열로 압축)"""
+    if jpeg_quality <= 0:
+        return frame.copy()
+    import cv2
+
+    ok, data = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    if not ok:
+        return frame.copy()
+    return data
+
+
+def unpack_frame(data: np.ndarray) -> np.ndarray:
+    """pack_frame() 결과를 BGR 프레임으로 복원 (1차원 배열이면 JPEG)"""
+    if data.ndim != 1:
+        return data
+    import cv2
+
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+def create_encoder(config, path: str, width: int, height: int, fps: float):
+    """설정(VIDEO_ENCODER)과 환경에 맞는 인코더 생성"""
+    choice = getattr(config, 'VIDEO_ENCODER', 'auto')
+    crf = getattr(config, 'VIDEO_CRF', 23)
+
+    if choice in ('auto', 'vaapi', 'ffmpeg'):
+        ffmpeg = find_ffmpeg(getattr(config, 'FFMPEG_PATH', 'ffmpeg'))
+        if ffmpeg is not None:
+            hardware = (choice in ('auto', 'vaapi') and os.path.exists(VAAPI_DEVICE)
+                        and ffmpeg_has_encoder(ffmpeg, 'h264_vaapi'))
+            try:
+                return FFmpegEncoder(ffmpeg, path, width, height, fps, hardware=hardware, crf=crf)
+            except OSError as e:
+                logger.warning(f"Cannot start ffmpeg: {e}")
+        elif choice != 'auto':
+            logger.warning(f"VIDEO_ENCODER={choice} but ffmpeg was not found, falling back to OpenCV")
+
+    return OpenCVEncoder(path, width, height, fps, codec=config.VIDEO_CODEC)
+
+
+class FallClipRecorder:
+    """
+    낙상 영상 1개를 녹화하면서 백그라운드 스레드로 인코딩
+
+    start() 에 낙상 전 버퍼 프레임을 넘기고, 이후 프레임은 add() 로 전달, finish() 는 남은 큐만 처리하고 경로 반환
+    큐는 낙상 후 녹화 구간 전체를 담을 수 있는 크기 (낙상 전 버퍼를 인코딩하는 동안 쌓이는 프레임을 버리지 않음)
+    인코더는 고정 FPS로 쓰므로 프레임마다 캡처 시각을 받아, 빠진 구간(큐 초과로 버린 프레임, 카메라 지연)은
+    직전 프레임을 반복해 채움 → 영상 길이와 재생 속도가 실제 시간과 일치
+    """
+
+    def __init__(self, config, path: str, fps: float,
+                 annotate: Optional[Callable[[np.ndarray, list], np.ndarray]] = None):
+        self.config = config
+        self.path = str(path)
+        self.fps = fps
+        self.annotate = annotate
+        post_fall_frames = int(fps * getattr(config, 'VIDEO_RECORD_AFTER_SECONDS', 0)) + 1
+        self.queue = queue.Queue(maxsize=max(getattr(config, 'VIDEO_ENCODER_QUEUE_FRAMES', 90), post_fall_frames))
+        self.thread = None
+        self.encoder = None
+        self.first_timestamp = None
+        self.last_timestamp = None  # 마지막으로 add()된 프레임 시각 (버려진 프레임 포함)
+        self.last_frame = None
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_repeated = 0
+        self.error = None
+
+    def start(self, buffered: Iterable[tuple]):
+        """
+        인코딩 시작
+
+        Args:
+            buffered: 낙상 전 (frame, overlays, timestamp) 목록 (이미 메모리에 있으므로 큐를 거치지 않고 바로 인코딩,
+                      frame은 pack_frame() 결과도 가능, timestamp는 add()와 같은 monotonic 시계)
+        """
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.thread = threading.Thread(target=self._run, args=(list(buffered),), name='clip-encoder', daemon=True)
+        self.thread.start()
+
+    def add(self, frame: np.ndarray, overlays: Optional[list] = None, timestamp: Optional[float] = None):
+        """프레임 추가 (캡처 루프를 막지 않음, 큐가 가득 차면 버리고 그 구간은 인코딩 시 직전 프레임으로 채움)"""
+        self.last_timestamp = timestamp
+        try:
+            self.queue.put_nowait((frame, overlays, timestamp))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    @property
+    def backlog(self) -> int:
+        return self.queue.qsize()
+
+    def finish(self, timeout: float = 60.0) -> Optional[str]:
+        """
+        남은 프레임 인코딩을 기다린 뒤 파일 경로 반환 (실패 시 None)
+        최대 timeout초 걸리므로 캡처 루프가 아닌 별도 스레드에서 호출
+        """
+        start = time.monotonic()
+        try:
+            # 인코딩 스레드가 멈춰 큐가 가득 차 있어도 timeout 안에 끝나도록 종료 표시도 기다림에 포함
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.error(f"Encoder queue stayed full for {timeout}s, giving up: {self.path}")
+            return None
+        self.thread.join(max(0.0, timeout - (time.monotonic() - start)))
+        if self.thread.is_alive():
+            logger.error(f"Encoder did not finish within {timeout}s: {self.path}")
+            return None
+        if self.error is not None:
+            logger.error(f"Error saving fall video: {self.error}")
+            return None
+
+        encoder_name = self.encoder.name if self.encoder is not None else 'none'
+        message = (f"Fall video saved: {self.path} ({self.frames_written} frames @ {self.fps:.2f}fps, "
+                   f"{encoder_name}, finished {time.monotonic() - start:.2f}s after recording)")
+        if self.frames_dropped or self.frames_repeated:
+            logger.warning(f"{message} - {self.frames_dropped} frames dropped (encoder queue full), "
+                           f"{self.frames_repeated} gap frames filled by repeating the previous frame")
+        else:
+            logger.info(message)
+        return self.path if self.frames_written else None
+
+    def _encode(self, frame: np.ndarray):
+        if self.encoder is None:
+            height, width = frame.shape[:2]
+            self.encoder = create_encoder(self.config, self.path, width, height, self.fps)
+        self.encoder.write(frame)
+        self.frames_written += 1
+
+    def _write(self, frame: np.ndarray, overlays: Optional[list], timestamp: Optional[float]):
+        frame = unpack_frame(frame)  # 압축 보관된 버퍼 프레임은 인코딩 스레드에서 복원
+        if overlays and self.annotate is not None:
+            # 보관해 둔 감지 결과를 그림 (캡처 루프가 아닌 인코딩 스레드에서)
+            frame = self.annotate(frame.copy(), overlays)
+
+        if timestamp is not None:
+            if self.first_timestamp is None:
+                self.first_timestamp = timestamp
+            self._fill_until(timestamp)
+        self._encode(frame)
+        self.last_frame = frame
+
+    def _fill_until(self, timestamp: float):
+        """timestamp 프레임이 놓일 위치 전까지 비어 있는 구간을 직전 프레임으로 채움"""
+        slot = round((timestamp - self.first_timestamp) * self.fps)
+        while self.last_frame is not None and self.frames_written < slot:
+            self._encode(self.last_frame)
+            self.frames_repeated += 1
+
+    def _run(self, buffered: list):
+        try:
+            for item in buffered:
+                self._write(*item)
+            buffered.clear()  # 버퍼 프레임 참조 해제
+
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                self._write(*item)
+            # 끝부분에서 버려진 프레임 구간 (마지막 add() 프레임 자리까지 포함)
+            if self.last_timestamp is not None and self.first_timestamp is not None:
+                self._fill_until(self.last_timestamp + 1.0 / self.fps)
+        except Exception as e:
+            self.error = e
+            # finish() 가 막히지 않도록 종료 신호까지 남은 프레임은 버림
+            while self.queue.get() is not None:
+                pass
+        finally:
+            self.last_frame = None
+            if self.encoder is not None and not self.encoder.close() and self.error is None:
+                self.error = RuntimeError('encoder failed')
@@ -1,5 +1,11 @@
 from django.contrib import admin
-from .models import Post
+from .models import Post, PostTombstone, MediaBlob, ArchivedVideo, FallEvent, FallStatBucket, TelemetrySample
 
 # Register your models here.
-admin.site.register(Post)
\ No newline at end of file
+admin.site.register(Post)
+admin.site.register(PostTombstone)
+admin.site.register(MediaBlob)
+admin.site.register(ArchivedVideo)
+admin.site.register(FallEvent)
+admin.site.register(FallStatBucket)
+admin.site.register(TelemetrySample)
@@ -0,0 +1,160 @@
+"""
+비동기(ASGI) 게시글 API - api_async/Post/
+
+daphne에서 DRF 뷰(api_root/)는 sync 뷰라 요청마다 스레드 풀의 스레드 하나를 응답 끝까지 점유
+(업로드 파싱, 파일 저장, DB 대기 동안에도 점유 → 동시 요청 수가 스레드 수로 제한)
+가장 많이 호출되는 목록/상세/알림 생성을 async 뷰로 구현 (요청/응답 형식은 api_root/Post/ 와 동일)
+부하 비교: python manage.py loadtest_api
+    - 인증: 토큰(CachedTokenAuthentication.aauthenticate) 또는 세션(조회만), Admin만 허용
+    - 조회: async ORM (aaggregate, aget, 비동기 반복)
+    - 생성: multipart/form 또는 JSON 본문 (그 밖의 Content-Type은 415, 잘못된 JSON은 400)
+            본문 파싱과 파일 해시/저장은 스레드 풀에서 실행 (blog/blobs.py)
+            Post/FallEvent 생성(트랜잭션)과 signals는 sync 스레드에서 실행 (async ORM은 트랜잭션 미지원)
+"""
+import io
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from blog.authentication import CachedTokenAuthentication
+from blog.models import Post
+from blog.renderers import FastJSONRenderer
+from blog.serializers import PostSerializer, PostListSerializer
+from blog.views import POST_LIST_STATE, post_list_etag_for
+
+renderer = FastJSONRenderer()
+json_parser = JSONParser()
+# Django가 request.POST/FILES로 파싱하는 본문 (DRF FormParser/MultiPartParser와 같은 형식)
+FORM_MEDIA_TYPES = (FormParser.media_type, MultiPartParser.media_type)
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(renderer.render(data), content_type='application/json', status=status_code)
+
+
+def async_api_view(methods):
+    """
+    async 뷰용 인증/권한/예외 처리 (DRF APIView와 같은 상태 코드와 {'detail': ...} 형식)
+
+    세션 인증은 CSRF 검사가 필요한 쓰기 요청에는 사용하지 않음 (쓰기는 토큰만)
+    """
+    authentication = CachedTokenAuthentication()
+
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in methods:
+                    raise exceptions.MethodNotAllowed(request.method)
+                result = await authentication.aauthenticate(request)
+                if result is not None:
+                    request.user = result[0]
+                elif request.method in ('GET', 'HEAD'):
+                    request.user = await request.auser()
+                else:
+                    raise exceptions.NotAuthenticated()
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                if not request.user.is_staff:
+                    raise exceptions.PermissionDenied()
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as e:
+                detail = e.detail if isinstance(e.detail, (list, dict)) else {'detail': e.detail}
+                response = json_response(detail, e.status_code)
+                if isinstance(e, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                    response.status_code = status.HTTP_401_UNAUTHORIZED
+                    response.headers['WWW-Authenticate'] = authentication.authenticate_header(request)
+                return response
+        return wrapper
+    return decorator
+
+
+@async_api_view(('GET', 'HEAD', 'POST'))
+async def post_list(request):
+    """GET: 게시글 목록 (페이지네이션/?fields=/ETag는 api_root/Post/ 와 동일), POST: 알림 생성"""
+    if request.method == 'POST':
+        return await post_create(request)
+
+    # 총 개수는 ETag와 페이지네이션에 같이 사용
+    state = await Post.objects.aaggregate(**POST_LIST_STATE)
+    etag = quote_etag(post_list_etag_for(state, request))
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        raise exceptions.NotFound('Invalid page.')
+    count = state['count']
+    if page < 1 or (page > 1 and (page - 1) * page_size >= count):
+        raise exceptions.NotFound('Invalid page.')
+
+    queryset = (Post.objects.select_related('fall_event')
+                .order_by('-published_date')[(page - 1) * page_size:page * page_size])
+    posts = [post async for post in queryset]
+
+    serializer_class = PostSerializer if 'fields' in request.GET else PostListSerializer
+    results = serializer_class(posts, many=True, context={'request': Request(request)}).data
+
+    url = request.build_absolute_uri()
+    previous_url = None
+    if page == 2:
+        previous_url = remove_query_param(url, 'page')
+    elif page > 2:
+        previous_url = replace_query_param(url, 'page', page - 1)
+    response = json_response({
+        'count': count,
+        'next': replace_query_param(url, 'page', page + 1) if page * page_size < count else None,
+        'previous': previous_url,
+        'results': results,
+    })
+    response.headers['ETag'] = etag
+    return response
+
+
+@async_api_view(('GET', 'HEAD'))
+async def post_detail(request, pk):
+    """게시글 상세 (전체 표현, ?fields= 지원)"""
+    try:
+        post = await Post.objects.aget(pk=pk)
+    except Post.DoesNotExist:
+        raise exceptions.NotFound()
+    return json_response(PostSerializer(post, context={'request': Request(request)}).data)
+
+
+async def post_create(request):
+    """
+    알림 게시글 생성 (Edge multipart 요청 또는 JSON, api_root/Post/ POST와 같은 필드)
+    파일 저장은 스레드 풀, 게시글/FallEvent 저장만 sync 스레드에서 실행
+    """
+    if request.content_type not in FORM_MEDIA_TYPES + (json_parser.media_type,):
+        raise exceptions.UnsupportedMediaType(request.content_type)
+
+    def parse():
+        # ASGI 요청 본문(임시 파일)을 읽어 파싱 - 디스크 I/O이므로 스레드 풀에서 실행
+        if request.content_type == json_parser.media_type:
+            # DRF JSONParser와 같은 처리 (잘못된 JSON은 ParseError → 400)
+            return json_parser.parse(io.BytesIO(request.body), request.content_type,
+                                     {'encoding': request.encoding or settings.DEFAULT_CHARSET})
+        data = request.POST.copy()
+        data.update(request.FILES)
+        return data
+
+    data = await sync_to_async(parse, thread_sensitive=False)()
+    serializer = PostSerializer(data=data, context={'request': Request(request)})
+    await sync_to_async(serializer.is_valid)(raise_exception=True)  # author/해시 조회 (sync ORM)
+    await serializer.astore_media(serializer.validated_data)
+    await sync_to_async(serializer.save)()
+    return json_response(serializer.data, status.HTTP_201_CREATED)
@@ -0,0 +1,173 @@
+"""
+토큰 인증 캐시
+
+Edge 업로드/앱 폴링은 요청마다 Authorization: Token ... 으로 인증하므로
+TokenAuthentication이 매번 authtoken_token + auth_user 조회(JOIN 1회)를 수행
+    - 토큰 → (토큰, 사용자)를 프로세스 메모리에 AUTH_TOKEN_CACHE_TTL초 동안 보관 (최대 AUTH_TOKEN_CACHE_SIZE개, LRU)
+    - 토큰 삭제/재발급, 사용자 변경(비활성화, is_staff 변경 등) 시 signals에서 무효화
+    - 다른 프로세스(워커)의 변경은 TTL이 지나야 반영되므로 TTL을 짧게 유지
+    - 토큰별 분당 요청 수 집계 (AUTH_TOKEN_RATE_WARN 초과 시 경고 출력)
+      인증 항목과 별도로 보관하므로 TTL 만료/무효화로 재조회해도 집계는 이어짐
+    - 캐시 적중률과 토큰별 집계는 Admin 전용 api_root/metrics/ 로 조회
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """스레드 안전한 TTL + LRU 캐시 (토큰 키 → 캐시 항목)"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._usage = OrderedDict()  # 토큰 키 → 요청 집계 (최대 max_size개, LRU)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['expires'] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, token, user, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries.pop(key, None)
+            entry = {'token': token, 'user': user, 'expires': now + self.ttl}
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return entry
+
+    def count_request(self, key, user, now=None, window=60):
+        """
+        토큰별 요청 수 집계 (인증 항목의 TTL과 무관하게 유지)
+
+        Returns:
+            int: 현재 window초 구간의 요청 수
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            usage = self._usage.get(key)
+            if usage is None:
+                usage = self._usage[key] = {'window_start': now, 'window_count': 0, 'total': 0}
+                while len(self._usage) > self.max_size:
+                    self._usage.popitem(last=False)
+            else:
+                self._usage.move_to_end(key)
+            usage['user'] = user.get_username()
+            if now - usage['window_start'] >= window:
+                usage['window_start'] = now
+                usage['window_count'] = 0
+            usage['window_count'] += 1
+            usage['total'] += 1
+            return usage['window_count']
+
+    def invalidate(self, key=None, user_id=None):
+        """토큰 키 또는 사용자 ID로 항목 삭제 (둘 다 없으면 전체 삭제)"""
+        with self._lock:
+            if key is None and user_id is None:
+                self._entries.clear()
+                return
+            if key is not None:
+                self._entries.pop(key, None)
+            if user_id is not None:
+                for cached_key in [k for k, e in self._entries.items() if e['user'].pk == user_id]:
+                    del self._entries[cached_key]
+
+    def stats(self):
+        """캐시 적중률 + 토큰별 요청 집계 스냅샷 (토큰 키는 앞 8자리만, 요청 수 내림차순)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'tokens': sorted((
+                    {
+                        'token': key[:8],
+                        'user': usage['user'],
+                        'requests_in_window': usage['window_count'],
+                        'requests_total': usage['total'],
+                    }
+                    for key, usage in self._usage.items()
+                ), key=lambda item: -item['requests_total']),
+            }
+
+    def reset_stats(self):
+        """적중/미스 수와 토큰별 요청 집계 초기화 (캐시 항목은 유지)"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self._usage.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache(settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_TTL)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication + 프로세스 내 토큰 캐시
+
+    캐시 미스일 때만 DB 조회 (실패한 토큰은 캐시하지 않음 → 잘못된 토큰은 매번 401)
+    """
+    cache = token_cache
+
+    def authenticate_credentials(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            user, token = super().authenticate_credentials(key)
+            entry = self.cache.put(key, token, user)
+        return self.account(key, entry)
+
+    async def aauthenticate(self, request):
+        """
+        비동기 뷰(blog/async_views.py)용 토큰 인증 (캐시 미스일 때만 async ORM 조회)
+
+        Returns:
+            (user, token) 또는 Authorization 헤더가 없으면 None
+        """
+        auth = request.META.get('HTTP_AUTHORIZATION', '').split()
+        if not auth or auth[0].lower() != self.keyword.lower():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+
+        key = auth[1]
+        entry = self.cache.get(key)
+        if entry is None:
+            token = await self.get_model().objects.select_related('user').filter(key=key).afirst()
+            if token is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            entry = self.cache.put(key, token, token.user)
+        return self.account(key, entry)
+
+    def account(self, key, entry):
+        """요청 수 집계 후 (user, token) 반환"""
+        count = self.cache.count_request(key, entry['user'])
+        if count == settings.AUTH_TOKEN_RATE_WARN:
+            print(f"⚠ Token {key[:8]}… ({entry['user'].get_username()}) "
+                  f"reached {count} requests/min")
+        return entry['user'], entry['token']
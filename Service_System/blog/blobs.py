@@ -0,0 +1,122 @@
+"""
+업로드 미디어 내용 주소 저장 (SHA-256)
+
+Edge가 업로드를 재시도하거나 장애 후 다시 올려도 같은 파일을 두 번 저장하지 않도록
+Post.image/Post.video 파일을 내용 해시 경로에 저장하고 MediaBlob으로 해시 -> 경로를 기록
+    - 해시는 업로드를 디스크(임시 파일)로 받는 동안 SHA256UploadHandler가 계산 (다시 읽지 않음)
+    - 같은 해시가 이미 있으면 저장하지 않고 기존 파일 재사용
+    - Edge는 같은 파일을 재전송할 때만 HEAD api_root/Media/<sha256>/ 로 확인하고, 있으면 파일 대신 해시만 전송
+
+저장 경로: <업로드 디렉토리>/sha256/<해시 앞 2자리>/<해시>.<확장자> (예: blog_video/sha256/3f/3fa1....mp4)
+"""
+import hashlib
+import os
+
+from asgiref.sync import sync_to_async
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler
+
+from blog.models import MediaBlob
+
+HASH_DIR = 'sha256'
+
+
+class SHA256UploadHandler(FileUploadHandler):
+    """
+    업로드 파일의 SHA-256을 받는 동안 계산해 request.upload_sha256[필드명]에 기록
+    (FILE_UPLOAD_HANDLERS 맨 앞에 두고, 실제 저장은 다음 핸들러(메모리/임시 파일)가 담당)
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, 'upload_sha256'):
+            self.request.upload_sha256 = {}
+        self.request.upload_sha256[self.field_name] = self.hasher.hexdigest()
+        return None
+
+
+def sha256_of(file):
+    """파일 객체의 SHA-256 (업로드 핸들러를 거치지 않은 파일용, 청크 단위로 읽음)"""
+    hasher = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks() if hasattr(file, 'chunks') else iter(lambda: file.read(65536), b''):
+        hasher.update(chunk)
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+def is_sha256(value):
+    return len(value) == 64 and all(c in '0123456789abcdef' for c in value)
+
+
+def blob_name(upload_dir, digest, filename):
+    """내용 주소 저장 경로"""
+    extension = os.path.splitext(filename)[1].lower()
+    return f'{upload_dir}/{HASH_DIR}/{digest[:2]}/{digest}{extension}'
+
+
+def find_blob(digest):
+    """해시로 저장된 파일 조회 (기록은 있지만 파일이 없으면 None)"""
+    blob = MediaBlob.objects.filter(sha256=digest).first()
+    if blob is None or not default_storage.exists(blob.name):
+        return None
+    return blob
+
+
+def store_upload(upload_dir, file, digest=None):
+    """
+    업로드 파일을 내용 주소 경로에 저장 (같은 내용이 이미 있으면 재사용)
+
+    Args:
+        upload_dir: FileField upload_to의 최상위 디렉토리 (blog_image, blog_video)
+        file: 업로드된 파일 (UploadedFile)
+        digest: SHA256UploadHandler가 계산한 해시 (없으면 여기서 계산)
+
+    Returns:
+        MediaBlob
+    """
+    digest = digest or sha256_of(file)
+    blob = find_blob(digest)
+    if blob is not None:
+        return blob
+
+    name = blob_name(upload_dir, digest, file.name)
+    if not default_storage.exists(name):
+        # 동시에 같은 파일이 올라와 먼저 저장된 경우 storage가 다른 이름을 붙여 저장
+        name = default_storage.save(name, file)
+    blob, _ = MediaBlob.objects.update_or_create(sha256=digest, defaults={'name': name, 'size': file.size})
+    return blob
+
+
+async def _run_blocking(function, *args):
+    """파일 해시/저장을 스레드 풀에서 실행 (이벤트 루프와 sync 뷰 전용 스레드를 막지 않음)"""
+    return await sync_to_async(function, thread_sensitive=False)(*args)
+
+
+async def afind_blob(digest):
+    """find_blob의 비동기 버전"""
+    blob = await MediaBlob.objects.filter(sha256=digest).afirst()
+    if blob is None or not await _run_blocking(default_storage.exists, blob.name):
+        return None
+    return blob
+
+
+async def astore_upload(upload_dir, file, digest=None):
+    """store_upload의 비동기 버전 (async ORM + 스레드 풀 파일 쓰기)"""
+    digest = digest or await _run_blocking(sha256_of, file)
+    blob = await afind_blob(digest)
+    if blob is not None:
+        return blob
+
+    name = blob_name(upload_dir, digest, file.name)
+    if not await _run_blocking(default_storage.exists, name):
+        name = await _run_blocking(default_storage.save, name, file)
+    blob, _ = await MediaBlob.objects.aupdate_or_create(sha256=digest, defaults={'name': name, 'size': file.size})
+    return blob
@@ -0,0 +1,108 @@
+"""
+Post 이미지 파생본 (목록 썸네일/상세 크기, WebP/JPEG)
+
+원본(Edge가 올린 640x480 JPEG)을 크기별로 줄이고 다시 압축한 파일을 MEDIA_ROOT/derivatives/ 아래에 캐시
+    - 업로드 시 IMAGE_DERIVATIVES_ON_UPLOAD 크기는 미리 생성
+    - 나머지는 첫 요청 시 생성 (views.image_derivative)
+원본 파일명이 업로드마다 다르므로 파생본 URL은 내용이 바뀌지 않음 → 장기 캐시 헤더로 제공
+"""
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+DERIVATIVE_DIR = 'derivatives'
+FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+}
+
+
+def derivative_name(image_name, size, fmt):
+    """원본 저장 경로 -> 파생본 저장 경로 (예: derivatives/thumb/blog_image/2025/10/09/fall.webp)"""
+    stem, _ = os.path.splitext(image_name)
+    return f'{DERIVATIVE_DIR}/{size}/{stem}.{fmt}'
+
+
+def is_valid_source(image_name):
+    """파생본을 만들 수 있는 원본 경로인지 (업로드 디렉토리 밖 경로 차단)"""
+    normalized = os.path.normpath(image_name).replace('\\', '/')
+    return (normalized == image_name and not normalized.startswith(('/', '..'))
+            and normalized.startswith(settings.IMAGE_DERIVATIVE_SOURCE_DIRS))
+
+
+def ensure_derivative(image_name, size, fmt):
+    """
+    파생본이 없으면 생성하고 저장 경로 반환
+
+    Args:
+        image_name: Post.image.name (MEDIA_ROOT 기준 경로)
+        size: settings.IMAGE_DERIVATIVES 키 (thumb, detail)
+        fmt: FORMATS 키 (webp, jpeg)
+
+    Raises:
+        FileNotFoundError: 원본이 없을 때
+        KeyError: 알 수 없는 size/fmt
+    """
+    spec = settings.IMAGE_DERIVATIVES[size]
+    pil_format, _ = FORMATS[fmt]
+    name = derivative_name(image_name, size, fmt)
+    path = default_storage.path(name)
+    if os.path.exists(path):
+        return name
+
+    with default_storage.open(image_name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.thumbnail(spec['size'], Image.LANCZOS)
+
+        # 동시 요청이 같은 파일을 만들어도 반쯤 쓴 파일이 보이지 않도록 임시 파일에 쓰고 교체
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                options = {'quality': spec['quality']}
+                if pil_format == 'JPEG':
+                    options.update(optimize=True, progressive=True)
+                else:
+                    options['method'] = 4
+                image.save(f, pil_format, **options)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    return name
+
+
+def generate_derivatives(image_name, sizes=None):
+    """업로드 직후 파생본 미리 생성 (실패해도 요청 시 다시 시도하므로 무시)"""
+    for size in sizes if sizes is not None else settings.IMAGE_DERIVATIVES:
+        for fmt in settings.IMAGE_DERIVATIVE_FORMATS:
+            try:
+                ensure_derivative(image_name, size, fmt)
+            except (OSError, KeyError):
+                pass
+
+
+def derivative_urls(image_name, request=None, sizes=None):
+    """크기별/포맷별 파생본 URL: {'thumb': {'webp': url, 'jpeg': url}, ...} (request가 있으면 절대 URL)"""
+    urls = {}
+    for size in sizes if sizes is not None else settings.IMAGE_DERIVATIVES:
+        urls[size] = {}
+        for fmt in settings.IMAGE_DERIVATIVE_FORMATS:
+            url = reverse('image_derivative', args=[size, fmt, image_name])
+            urls[size][fmt] = request.build_absolute_uri(url) if request else url
+    return urls
+
+
+def delete_derivatives(image_name):
+    for size in settings.IMAGE_DERIVATIVES:
+        for fmt in FORMATS:
+            name = derivative_name(image_name, size, fmt)
+            if default_storage.exists(name):
+                default_storage.delete(name)
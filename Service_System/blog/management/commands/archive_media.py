@@ -0,0 +1,191 @@
+"""
+오래된 게시글 영상 보관 관리 명령
+
+MEDIA_ARCHIVE_AFTER_DAYS 보다 오래된 게시글의 영상(blog_video/)을 보관 위치로 옮기고 참조를 갱신
+    --mode cold   (기본) MEDIA_ROOT/MEDIA_ARCHIVE_DIR/ 아래로 이동, Post.video 경로 갱신 (URL로 계속 제공)
+    --mode bundle 날짜별 zip 번들(MEDIA_ARCHIVE_DIR/bundles/blog_video/YYYY/MM/DD.zip)로 묶고
+                  Post.video는 비운 뒤 ArchivedVideo에 위치 기록 (--restore 로 복원)
+                  내용 주소 저장으로 같은 파일을 가리키는 최근 게시글(기준일 이후)이 있으면 그 파일은 건너뜀
+
+Post.image(blog_image/)는 대상이 아님: 영상보다 훨씬 작고, 앱 목록/상세의 썸네일 파생본이
+IMAGE_DERIVATIVE_SOURCE_DIRS(blog_image/) 아래 원본에서만 만들어지며, 기본값 이미지는 여러 게시글이 공유
+
+게시글을 --batch-size 개씩 pk 순서로 처리하므로 게시글 수와 관계없이 메모리 사용량이 일정
+파일을 먼저 옮기고 참조를 갱신하므로 중간에 중단되어도 다시 실행하면 이어서 처리
+
+사용법 (cron 등으로 주기 실행):
+    python manage.py archive_media
+    python manage.py archive_media --mode bundle --days 180
+    python manage.py archive_media --dry-run
+    python manage.py archive_media --restore 12 15
+"""
+import os
+import shutil
+import zipfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Post, ArchivedVideo, MediaBlob
+
+SOURCE_DIR = 'blog_video/'
+
+
+class Command(BaseCommand):
+    help = '오래된 게시글 영상을 보관 디렉토리 또는 압축 번들로 옮기고 참조를 갱신합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=('cold', 'bundle'), default='cold',
+                            help='cold: 보관 디렉토리로 이동, bundle: 날짜별 zip으로 묶음')
+        parser.add_argument('--days', type=int, default=settings.MEDIA_ARCHIVE_AFTER_DAYS,
+                            help='이보다 오래된 게시글(created_date 기준)의 영상 처리')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='한 번에 처리할 게시글 수')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='옮기지 않고 대상만 출력')
+        parser.add_argument('--restore', type=int, nargs='+', metavar='POST_ID',
+                            help='번들로 옮긴 게시글 영상을 원래 위치로 복원')
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            self.restore(options['restore'])
+            return
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        archive = self.archive_cold if options['mode'] == 'cold' else self.archive_bundle
+        archived = archived_bytes = 0
+        last_pk = 0
+        while True:
+            batch = list(Post.objects
+                         .filter(pk__gt=last_pk, created_date__lt=cutoff, video__startswith=SOURCE_DIR)
+                         .order_by('pk')
+                         .only('pk', 'video', 'created_date')[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            posts = []
+            for post in batch:
+                if not default_storage.exists(post.video.name):
+                    self.stderr.write(f'Missing file, skipped: {post.video.name} (post {post.pk})')
+                    continue
+                posts.append((post, default_storage.size(post.video.name)))
+            if options['mode'] == 'bundle':
+                posts = self.without_recent_sharers(posts, cutoff)
+            if options['dry_run']:
+                for post, size in posts:
+                    self.stdout.write(f'{post.pk}\t{post.video.name}\t{size}')
+            else:
+                archive(posts, cutoff)
+            archived += len(posts)
+            archived_bytes += sum(size for _, size in posts)
+
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {archived} videos ({archived_bytes / (1024 * 1024):.1f}MB, mode={options["mode"]})'))
+
+    def without_recent_sharers(self, posts, cutoff):
+        """
+        기준일 이후 게시글도 같은 파일을 가리키면 제외
+        (번들로 옮기면 공유하는 모든 게시글의 Post.video를 비우므로 최근 게시글의 영상 URL이 사라짐)
+        """
+        names = {post.video.name for post, _ in posts}
+        recent = set(Post.objects.filter(video__in=names, created_date__gte=cutoff)
+                     .values_list('video', flat=True))
+        if not recent:
+            return posts
+        for name in sorted(recent):
+            self.stdout.write(f'Still used by a recent post, skipped: {name}')
+        return [(post, size) for post, size in posts if post.video.name not in recent]
+
+    @staticmethod
+    def save_video_name(post, name):
+        # updated_at도 갱신하여 앱 증분 동기화에 바뀐 영상 URL이 반영되도록 함
+        post.video = name
+        post.save(update_fields=['video', 'updated_at'])
+
+    def archive_cold(self, posts, cutoff):
+        """보관 디렉토리로 이동 (다른 디스크여도 동작), 파일마다 이동 → 참조 갱신"""
+        for post, _ in posts:
+            source_name = post.video.name
+            source_path = default_storage.path(source_name)
+            if not os.path.exists(source_path):  # 같은 파일을 쓰는 앞선 게시글과 함께 이미 이동
+                continue
+            target_name = f'{settings.MEDIA_ARCHIVE_DIR}/{source_name}'
+            target_path = default_storage.path(target_name)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.move(source_path, target_path)
+            try:
+                with transaction.atomic():
+                    # 내용 주소 저장으로 여러 게시글이 같은 파일을 가리킬 수 있음
+                    for sharing_post in Post.objects.filter(video=source_name).only('pk', 'video'):
+                        self.save_video_name(sharing_post, target_name)
+                    MediaBlob.objects.filter(name=source_name).update(name=target_name)
+            except Exception:
+                shutil.move(target_path, source_path)
+                raise
+
+    def archive_bundle(self, posts, cutoff):
+        """날짜별 zip에 추가 → 참조 갱신(번들 단위 트랜잭션) → 원본 삭제"""
+        by_bundle = {}
+        for post, size in posts:
+            day = timezone.localtime(post.created_date)
+            bundle = f'{settings.MEDIA_ARCHIVE_DIR}/bundles/{SOURCE_DIR}{day:%Y/%m/%d}.zip'
+            by_bundle.setdefault(bundle, {}).setdefault(post.video.name, size)
+
+        for bundle, files in by_bundle.items():
+            bundle_path = default_storage.path(bundle)
+            os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+            with zipfile.ZipFile(bundle_path, 'a', compression=zipfile.ZIP_DEFLATED,
+                                 compresslevel=settings.MEDIA_ARCHIVE_COMPRESSLEVEL) as zf:
+                existing = set(zf.namelist())
+                for name in files:
+                    member = name[len(SOURCE_DIR):]  # 업로드 날짜 경로 포함 (파일명 중복 방지)
+                    # 이전 실행이 참조 갱신 전에 중단된 경우 이미 들어 있음
+                    if member not in existing:
+                        zf.write(default_storage.path(name), arcname=member)  # 청크 단위로 복사
+            with open(bundle_path, 'rb') as f:
+                os.fsync(f.fileno())
+
+            with transaction.atomic():
+                # 번들에 넣는 사이 새 게시글이 같은 파일로 중복 제거되었으면 그 파일은 그대로 둠 (번들 사본은 무해)
+                recent = set(Post.objects.filter(video__in=list(files), created_date__gte=cutoff)
+                             .values_list('video', flat=True))
+                files = {name: size for name, size in files.items() if name not in recent}
+                # 내용 주소 저장으로 여러 게시글이 같은 파일을 가리킬 수 있음
+                for sharing_post in Post.objects.filter(video__in=list(files)).only('pk', 'video'):
+                    name = sharing_post.video.name
+                    ArchivedVideo.objects.update_or_create(post=sharing_post, defaults={
+                        'original_name': name,
+                        'bundle': bundle,
+                        'member': name[len(SOURCE_DIR):],
+                        'size': files[name],
+                        'archived_at': timezone.now(),
+                    })
+                    self.save_video_name(sharing_post, None)
+                MediaBlob.objects.filter(name__in=list(files)).delete()
+            for name in files:
+                default_storage.delete(name)
+
+    def restore(self, post_ids):
+        """번들에서 꺼내 원래 경로에 저장하고 Post.video 복원"""
+        entries = ArchivedVideo.objects.filter(post_id__in=post_ids).select_related('post')
+        found = {entry.post_id for entry in entries}
+        missing = set(post_ids) - found
+        if missing:
+            raise CommandError(f'번들에 보관된 영상이 없는 게시글: {", ".join(map(str, sorted(missing)))}')
+
+        for entry in entries:
+            target_path = default_storage.path(entry.original_name)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            with zipfile.ZipFile(default_storage.path(entry.bundle)) as zf, \
+                    zf.open(entry.member) as source, open(target_path, 'wb') as target:
+                shutil.copyfileobj(source, target)
+            with transaction.atomic():
+                self.save_video_name(entry.post, entry.original_name)
+                entry.delete()
+            self.stdout.write(f'Restored {entry.original_name} (post {entry.post_id})')
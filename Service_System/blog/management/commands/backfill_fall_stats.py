@@ -0,0 +1,91 @@
+"""
+FallEvent 전체로부터 FallStatBucket 롤업을 다시 계산하는 관리 명령
+
+사용법:
+    python manage.py backfill_fall_stats
+    python manage.py backfill_fall_stats --since 2025-11-01
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blog.models import FallEvent, FallStatBucket
+
+
+class Command(BaseCommand):
+    help = 'FallEvent로부터 시간/일 단위 낙상 통계 롤업을 재계산합니다.'
+
+    TRUNCATE = {
+        FallStatBucket.HOUR: TruncHour,
+        FallStatBucket.DAY: TruncDay,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', default=None,
+                            help='이 시각(ISO 8601 날짜/시각) 이후의 버킷만 재계산 (기본: 전체)')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='bulk_create 배치 크기')
+
+    def handle(self, *args, **options):
+        since = self.parse_since(options['since'])
+
+        with transaction.atomic():
+            for granularity, trunc in self.TRUNCATE.items():
+                buckets = FallStatBucket.objects.filter(granularity=granularity)
+                events = FallEvent.objects.all()
+                if since is not None:
+                    # 경계 버킷이 잘리지 않도록 since를 버킷 시작으로 내림
+                    start = FallStatBucket.bucket_start_for(granularity, since)
+                    buckets = buckets.filter(bucket_start__gte=start)
+                    events = events.filter(detected_at__gte=start)
+
+                deleted, _ = buckets.delete()
+
+                # 집계는 DB에서 수행 (이벤트를 메모리로 가져오지 않음)
+                rows = (events
+                        .annotate(bucket=trunc('detected_at'))
+                        .values('camera_id', 'bucket')
+                        .annotate(fall_count=Count('id'), score_sum=Sum('fall_score'),
+                                  score_max=Max('fall_score'))
+                        .order_by())
+
+                created = 0
+                batch = []
+                for row in rows.iterator():
+                    batch.append(FallStatBucket(
+                        granularity=granularity,
+                        camera_id=row['camera_id'],
+                        bucket_start=row['bucket'],
+                        fall_count=row['fall_count'],
+                        score_sum=row['score_sum'] or 0.0,
+                        score_max=row['score_max'] or 0.0,
+                    ))
+                    if len(batch) >= options['batch_size']:
+                        FallStatBucket.objects.bulk_create(batch)
+                        created += len(batch)
+                        batch = []
+                if batch:
+                    FallStatBucket.objects.bulk_create(batch)
+                    created += len(batch)
+
+                self.stdout.write(f'{granularity}: removed {deleted}, created {created} buckets')
+
+        self.stdout.write(self.style.SUCCESS('Fall statistics backfill complete'))
+
+    def parse_since(self, value):
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                raise CommandError(f'Invalid --since value: {value}')
+            parsed = datetime(date.year, date.month, date.day)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
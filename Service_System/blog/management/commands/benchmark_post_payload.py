@@ -0,0 +1,131 @@
+"""
+Post 목록 한 페이지의 응답 크기와 직렬화/렌더링 시간 비교
+
+    - 표현 방식: 전체 표현 / 목록용 경량 표현 / ?fields= 선택
+    - 전송 크기: 압축 없음 / gzip / brotli (CompressionMiddleware와 같은 설정, brotli는 설치된 경우)
+    - 렌더링: DRF 기본 JSONRenderer / FastJSONRenderer (orjson, 설치된 경우)
+
+사용법:
+    python manage.py benchmark_post_payload                  # DB의 최신 게시글 한 페이지
+    python manage.py benchmark_post_payload --synthetic 10   # DB 없이 Edge 알림 형식의 가상 게시글
+"""
+import gzip
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from blog.middleware import brotli
+from blog.models import Post, FallEvent
+from blog.renderers import FastJSONRenderer, orjson
+from blog.serializers import PostSerializer, PostListSerializer
+
+# Edge System(api_client.create_fall_alert)이 보내는 본문과 같은 형식
+SYNTHETIC_TEXT = """낙상이 감지되었습니다!
+
+        발생 시각: 2025-10-09 04:14:10
+
+        감지 정보:
+        - 사람 감지 신뢰도: 0.87
+        - 낙상 점수: 0.82
+
+        상세 분석:
+        - 바운딩 박스 가로/세로 비율: 1.74
+        - 몸통 각도: 71.3도
+        - 감지 근거: Aspect ratio high (1.74), Head near ground (0.81), Body horizontal (71.3°)
+
+        위험도: 높음
+
+        즉시 확인이 필요합니다!"""
+
+
+class Command(BaseCommand):
+    help = 'Post 목록 응답 크기(압축 전후)와 직렬화/렌더링 시간을 표현 방식별로 측정합니다.'
+
+    VARIANTS = (
+        ('full (PostSerializer)', PostSerializer, None),
+        ('list (PostListSerializer)', PostListSerializer, None),
+        ('fields=id,title,published_date', PostSerializer, 'id,title,published_date'),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--synthetic', type=int, default=0, metavar='N',
+                            help='DB 대신 가상 게시글 N개 사용')
+        parser.add_argument('--repeat', type=int, default=200,
+                            help='직렬화 반복 횟수 (중앙값 사용)')
+        parser.add_argument('--host', default='localhost',
+                            help='절대 URL 생성에 사용할 호스트')
+
+    def handle(self, *args, **options):
+        posts = self.synthetic_posts(options['synthetic']) if options['synthetic'] else self.page_posts()
+        if not posts:
+            raise CommandError('게시글이 없습니다. --synthetic N 으로 가상 게시글을 사용하세요.')
+
+        factory = APIRequestFactory()
+        repeat = options['repeat']
+        renderers = [('drf', JSONRenderer())]
+        if orjson is not None:
+            renderers.append(('orjson', FastJSONRenderer()))
+
+        self.stdout.write(f'{len(posts)} posts per page, median of {repeat} runs '
+                          f'(brotli: {"yes" if brotli else "not installed"}, '
+                          f'orjson: {"yes" if orjson else "not installed"})')
+        self.stdout.write(f'{"":34s} {"raw":>8s} {"gzip":>8s} {"br":>8s}  {"serialize":>9s}  '
+                          + '  '.join(f'{"render/" + name:>13s}' for name, _ in renderers))
+        baseline = None
+        for name, serializer_class, fields in self.VARIANTS:
+            params = {'fields': fields} if fields else {}
+            request = Request(factory.get('/api_root/Post/', params, HTTP_HOST=options['host']))
+
+            serialize_ms = self.median_ms(repeat, lambda: serializer_class(
+                posts, many=True, context={'request': request}).data)
+            data = serializer_class(posts, many=True, context={'request': request}).data
+            render_ms = [self.median_ms(repeat, lambda renderer=renderer: renderer.render(data))
+                         for _, renderer in renderers]
+
+            body = JSONRenderer().render(data)
+            raw = len(body)
+            gzipped = len(gzip.compress(body, compresslevel=6))
+            brotli_size = (len(brotli.compress(body, quality=settings.RESPONSE_BROTLI_QUALITY))
+                           if brotli is not None else None)
+            if baseline is None:
+                baseline = raw
+            self.stdout.write(f'{name:34s} {raw:8d} {gzipped:8d} {brotli_size or "-":>8}  '
+                              f'{serialize_ms:7.3f}ms  ' + '  '.join(f'{ms:11.3f}ms' for ms in render_ms))
+            self.stdout.write(f'{"":34s} {"":8s} {gzipped / baseline:8.1%}'
+                              + (f' {brotli_size / baseline:8.1%}' if brotli_size else ''))
+
+    @staticmethod
+    def median_ms(repeat, function):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    @staticmethod
+    def page_posts():
+        # 목록 API와 같은 쿼리 (경량 표현의 fall_score용 select_related 포함)
+        queryset = Post.objects.select_related('fall_event').order_by('-published_date')
+        return list(queryset[:settings.REST_FRAMEWORK['PAGE_SIZE']])
+
+    @staticmethod
+    def synthetic_posts(count):
+        now = timezone.now()
+        posts = []
+        for i in range(count):
+            detected = now - timedelta(minutes=i)
+            post = Post(id=i + 1, author_id=1, title=f'[긴급] 낙상 감지 알림 - {detected:%Y-%m-%d %H:%M:%S}',
+                        text=SYNTHETIC_TEXT, created_date=detected, published_date=detected,
+                        image=f'blog_image/{detected:%Y/%m/%d}/fall_{detected:%Y%m%d_%H%M%S}.jpg',
+                        video=f'blog_video/{detected:%Y/%m/%d}/fall_{detected:%Y%m%d_%H%M%S}.mp4')
+            FallEvent(post=post, fall_score=0.82, detected_at=detected)
+            posts.append(post)
+        return posts
@@ -0,0 +1,171 @@
+"""
+sync(api_root/) / async(api_async/) 게시글 API 동시 처리 능력 비교 부하 테스트
+
+실행 중인 서버(daphne)에 동시 클라이언트 N개로 일정 시간 요청을 보내고
+엔드포인트별 처리량(req/s), 지연 p50/p99, 오류 수를 비교
+
+    - list:   GET <prefix>/Post/
+    - detail: GET <prefix>/Post/<id>/
+    - create: POST <prefix>/Post/ (Edge 알림 형식, 요청마다 다른 내용의 이미지/영상 → 중복 제거 없이 매번 저장)
+
+사용법:
+    daphne -b 127.0.0.1 -p 8000 mysite.asgi:application    # 다른 터미널
+    python manage.py loadtest_api --url http://127.0.0.1:8000 --concurrency 1,16,64 --duration 10
+
+인증 토큰은 --token으로 지정하거나, 같은 DB를 쓰는 로컬 서버면 Admin 사용자(--user)의 토큰을 만들어 사용
+create는 게시글을 실제로 만들므로 테스트용 DB/MEDIA_ROOT에서만 실행
+"""
+import io
+import json
+import os
+import statistics
+import threading
+import time
+
+import requests
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image
+from rest_framework.authtoken.models import Token
+
+PREFIXES = {'sync': '/api_root', 'async': '/api_async'}
+ENDPOINTS = ('list', 'detail', 'create')
+
+
+class Command(BaseCommand):
+    help = 'sync/async 게시글 API의 동시 요청 처리량과 지연을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='서버 주소')
+        parser.add_argument('--token', default='', help='API 토큰 (없으면 --user의 토큰 생성)')
+        parser.add_argument('--user', default='loadtest', help='토큰을 만들 Admin 사용자 (없으면 생성)')
+        parser.add_argument('--concurrency', default='1,16,64',
+                            help='동시 클라이언트 수 (쉼표로 구분, 단계별로 실행)')
+        parser.add_argument('--duration', type=float, default=10.0, help='단계별 실행 시간 (초)')
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                            help=f'테스트할 엔드포인트 ({", ".join(ENDPOINTS)})')
+        parser.add_argument('--paths', default='sync,async', help='비교할 경로 (sync, async)')
+        parser.add_argument('--video-kb', type=int, default=512, help='create 요청의 영상 크기 (KB)')
+
+    def handle(self, *args, **options):
+        endpoints = [name for name in options['endpoints'].split(',') if name]
+        paths = [name for name in options['paths'].split(',') if name]
+        if set(endpoints) - set(ENDPOINTS) or set(paths) - set(PREFIXES):
+            raise CommandError(f'endpoints: {", ".join(ENDPOINTS)} / paths: {", ".join(PREFIXES)}')
+        concurrency_levels = [int(value) for value in options['concurrency'].split(',')]
+
+        self.base_url = options['url'].rstrip('/')
+        self.token = options['token'] or self.admin_token(options['user'])
+        self.author_id = self.get_author_id()
+        self.video_bytes = options['video_kb'] * 1024
+        self.image = self.synthetic_image()
+        self.post_id = self.ensure_post()
+
+        self.stdout.write(f'{self.base_url}, {options["duration"]:g}s per step')
+        self.stdout.write(f'{"endpoint":8s} {"path":6s} {"clients":>7s} {"requests":>9s} {"req/s":>8s} '
+                          f'{"p50 ms":>8s} {"p99 ms":>8s} {"errors":>7s}')
+        for endpoint in endpoints:
+            for concurrency in concurrency_levels:
+                for path in paths:
+                    result = self.run_step(path, endpoint, concurrency, options['duration'])
+                    self.stdout.write(
+                        f'{endpoint:8s} {path:6s} {concurrency:7d} {result["requests"]:9d} '
+                        f'{result["rps"]:8.1f} {result["p50_ms"]:8.1f} {result["p99_ms"]:8.1f} '
+                        f'{result["errors"]:7d}')
+
+    @staticmethod
+    def admin_token(username):
+        user, created = User.objects.get_or_create(username=username, defaults={'is_staff': True})
+        if not user.is_staff:
+            raise CommandError(f'{username} 사용자가 Admin이 아닙니다.')
+        token, _ = Token.objects.get_or_create(user=user)
+        return token.key
+
+    def headers(self):
+        return {'Authorization': f'Token {self.token}'}
+
+    def get_author_id(self):
+        token = Token.objects.filter(key=self.token).select_related('user').first()
+        return token.user_id if token else 1
+
+    @staticmethod
+    def synthetic_image():
+        buffer = io.BytesIO()
+        Image.new('RGB', (640, 480), (90, 120, 150)).save(buffer, 'JPEG', quality=85)
+        return buffer.getvalue()
+
+    def ensure_post(self):
+        """detail 요청에 쓸 게시글 (없으면 하나 생성)"""
+        response = requests.get(f'{self.base_url}/api_root/Post/?fields=id', headers=self.headers(), timeout=10)
+        if response.status_code != 200:
+            raise CommandError(f'서버 응답 {response.status_code}: {response.text[:200]}')
+        results = response.json()['results']
+        if results:
+            return results[0]['id']
+        return self.send('create', '/api_root', requests.Session()).json()['id']
+
+    def send(self, endpoint, prefix, session):
+        if endpoint == 'list':
+            return session.get(f'{self.base_url}{prefix}/Post/', headers=self.headers(), timeout=60)
+        if endpoint == 'detail':
+            return session.get(f'{self.base_url}{prefix}/Post/{self.post_id}/', headers=self.headers(), timeout=60)
+        # 내용이 매번 달라야 서버가 중복 제거 없이 실제로 저장
+        nonce = os.urandom(16)
+        data = {
+            'author': self.author_id,
+            'title': '[부하 테스트] 낙상 감지 알림',
+            'text': '부하 테스트',
+            'fall_event': json.dumps({'camera_id': 'loadtest', 'fall_score': 0.8}),
+        }
+        files = {
+            'image': ('fall.jpg', self.image + nonce, 'image/jpeg'),
+            'video': ('fall.mp4', os.urandom(self.video_bytes), 'video/mp4'),
+        }
+        return session.post(f'{self.base_url}{prefix}/Post/', data=data, files=files,
+                            headers=self.headers(), timeout=60)
+
+    def run_step(self, path, endpoint, concurrency, duration):
+        """동시 클라이언트 concurrency개로 duration초 동안 요청"""
+        prefix = PREFIXES[path]
+        expected = 201 if endpoint == 'create' else 200
+        latencies, errors = [], [0]
+        lock = threading.Lock()
+        start_event = threading.Event()
+        deadline = [0.0]
+
+        def worker():
+            session = requests.Session()
+            local_latencies, local_errors = [], 0
+            start_event.wait()
+            while time.perf_counter() < deadline[0]:
+                started = time.perf_counter()
+                try:
+                    ok = self.send(endpoint, prefix, session).status_code == expected
+                except requests.RequestException:
+                    ok = False
+                local_latencies.append(time.perf_counter() - started)
+                local_errors += not ok
+            with lock:
+                latencies.extend(local_latencies)
+                errors[0] += local_errors
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        begin = time.perf_counter()
+        deadline[0] = begin + duration
+        start_event.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - begin
+
+        if not latencies:
+            return {'requests': 0, 'rps': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'errors': errors[0]}
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'rps': len(latencies) / elapsed,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+            'errors': errors[0],
+        }
@@ -0,0 +1,66 @@
+"""
+텔레메트리 다운샘플링 및 보존 기간 적용 관리 명령
+
+1. TELEMETRY_RAW_RETENTION_HOURS 보다 오래된 1분 버킷을 1시간 버킷으로 병합 후 삭제
+2. TELEMETRY_RETENTION_DAYS 보다 오래된 버킷 삭제
+
+사용법 (cron 등으로 주기 실행):
+    python manage.py prune_telemetry
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import TelemetrySample
+
+
+class Command(BaseCommand):
+    help = '오래된 텔레메트리 버킷을 다운샘플링하고 보존 기간이 지난 데이터를 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='한 번에 병합할 1분 버킷 수')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        raw_resolution = settings.TELEMETRY_RAW_RESOLUTION
+        rollup_resolution = settings.TELEMETRY_ROLLUP_RESOLUTION
+
+        # 1. 오래된 raw 버킷 -> rollup 버킷 (배치 단위로 메모리 사용 제한)
+        raw_cutoff = TelemetrySample.bucket_start_for(
+            rollup_resolution, now - timedelta(hours=settings.TELEMETRY_RAW_RETENTION_HOURS))
+        merged = 0
+        while True:
+            with transaction.atomic():
+                batch = list(TelemetrySample.objects
+                             .filter(resolution=raw_resolution, bucket_start__lt=raw_cutoff)
+                             .order_by('device_id', 'bucket_start')[:options['batch_size']])
+                if not batch:
+                    break
+
+                rollups = {}
+                for sample in batch:
+                    key = (sample.device_id, TelemetrySample.bucket_start_for(rollup_resolution, sample.bucket_start))
+                    if key not in rollups:
+                        rollups[key], _ = TelemetrySample.objects.select_for_update().get_or_create(
+                            device_id=key[0], resolution=rollup_resolution, bucket_start=key[1])
+                    values = {field: getattr(sample, field) for field in
+                              TelemetrySample.AVERAGE_FIELDS + TelemetrySample.MAX_FIELDS}
+                    values['fps_min'] = sample.fps_min
+                    values['dropped_frames'] = sample.dropped_frames
+                    rollups[key].merge(values, count=sample.sample_count)
+
+                for rollup in rollups.values():
+                    rollup.save()
+                TelemetrySample.objects.filter(pk__in=[sample.pk for sample in batch]).delete()
+                merged += len(batch)
+
+        # 2. 보존 기간이 지난 버킷 삭제
+        retention_cutoff = now - timedelta(days=settings.TELEMETRY_RETENTION_DAYS)
+        deleted, _ = TelemetrySample.objects.filter(bucket_start__lt=retention_cutoff).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Telemetry pruned: merged {merged} raw buckets, deleted {deleted} expired buckets'))
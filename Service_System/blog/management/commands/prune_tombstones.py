@@ -0,0 +1,25 @@
+"""
+게시글 삭제 기록(PostTombstone) 보존 기간 적용 관리 명령
+
+SYNC_TOMBSTONE_RETENTION_DAYS 보다 오래된 삭제 기록 삭제
+(그보다 오래된 워터마크로 동기화하는 앱은 sync 응답의 reset으로 전체 재동기화)
+
+사용법 (cron 등으로 주기 실행):
+    python manage.py prune_tombstones
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import PostTombstone
+
+
+class Command(BaseCommand):
+    help = '보존 기간이 지난 게시글 삭제 기록을 삭제합니다.'
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = PostTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Tombstones pruned: deleted {deleted} expired records'))
@@ -0,0 +1,88 @@
+"""
+응답 압축 미들웨어
+
+모바일 클라이언트(셀룰러 데이터)용으로 JSON/HTML 응답을 압축
+    - Accept-Encoding에 br이 있고 brotli 패키지가 설치되어 있으면 brotli, 아니면 gzip
+    - HTML은 CSRF 토큰이 들어 있으므로 Django GZipMiddleware의 BREACH 완화(랜덤 패딩)가 있는 gzip만 사용
+    - RESPONSE_COMPRESSION_TYPES 콘텐츠 타입만 압축 (이미 압축된 이미지/영상 제외)
+    - RESPONSE_COMPRESSION_MIN_SIZE 바이트보다 작은 응답은 그대로 전송
+    - 스트리밍 응답(동기/비동기)은 청크 단위로 압축
+"""
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만 사용
+    brotli = None
+
+
+def accepted_encodings(header):
+    """Accept-Encoding 헤더에서 q=0이 아닌 인코딩 집합"""
+    encodings = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            encodings.add(name)
+    return encodings
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """brotli/gzip 응답 압축 (gzip 경로는 Django GZipMiddleware 그대로 사용)"""
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in settings.RESPONSE_COMPRESSION_TYPES:
+            return response
+        if not response.streaming and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE:
+            return response
+
+        encodings = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is None or 'br' not in encodings or content_type == 'text/html':
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        quality = settings.RESPONSE_BROTLI_QUALITY
+        if response.streaming:
+            original_iterator = response.streaming_content
+            if response.is_async:
+                async def brotli_wrapper():
+                    compressor = brotli.Compressor(quality=quality)
+                    async for chunk in original_iterator:
+                        yield compressor.process(chunk) + compressor.flush()
+                    yield compressor.finish()
+
+                response.streaming_content = brotli_wrapper()
+            else:
+                def brotli_sequence():
+                    compressor = brotli.Compressor(quality=quality)
+                    for chunk in original_iterator:
+                        yield compressor.process(chunk) + compressor.flush()
+                    yield compressor.finish()
+
+                response.streaming_content = brotli_sequence()
+            del response.headers['Content-Length']
+        else:
+            compressed_content = brotli.compress(response.content, quality=quality)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_video'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FallEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('camera_id', models.CharField(default='default', max_length=64)),
+                ('detected_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('fall_score', models.FloatField()),
+                ('confidence', models.FloatField(default=0.0)),
+                ('reason', models.CharField(blank=True, default='', max_length=255)),
+                ('aspect_ratio', models.FloatField(default=0.0)),
+                ('body_angle', models.FloatField(default=0.0)),
+                ('head_height_ratio', models.FloatField(default=0.0)),
+                ('horizontal_ratio', models.FloatField(default=0.0)),
+                ('aspect_ratio_delta', models.FloatField(default=0.0)),
+                ('aspect_score', models.FloatField(default=0.0)),
+                ('position_score', models.FloatField(default=0.0)),
+                ('horizontal_score', models.FloatField(default=0.0)),
+                ('angle_score', models.FloatField(default=0.0)),
+                ('sudden_change_score', models.FloatField(default=0.0)),
+                ('bbox', models.JSONField(blank=True, null=True)),
+                ('keypoints', models.BinaryField(blank=True, null=True)),
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='fall_event', to='blog.post')),
+            ],
+            options={
+                'ordering': ['-detected_at'],
+                'indexes': [models.Index(fields=['detected_at'], name='fallevent_detected_idx'), models.Index(fields=['fall_score', 'detected_at'], name='fallevent_score_idx'), models.Index(fields=['camera_id', 'detected_at'], name='fallevent_camera_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_fallevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FallStatBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hourly'), ('day', 'Daily')], max_length=8)),
+                ('camera_id', models.CharField(max_length=64)),
+                ('bucket_start', models.DateTimeField()),
+                ('fall_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('score_max', models.FloatField(default=0.0)),
+            ],
+            options={
+                'ordering': ['-bucket_start', 'camera_id'],
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='fallstat_time_idx')],
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'camera_id', 'bucket_start'), name='fallstat_unique_bucket')],
+            },
+        ),
+    ]
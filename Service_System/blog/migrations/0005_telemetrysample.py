@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_fallstatbucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelemetrySample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('device_id', models.CharField(max_length=64)),
+                ('resolution', models.PositiveIntegerField()),
+                ('bucket_start', models.DateTimeField()),
+                ('sample_count', models.PositiveIntegerField(default=0)),
+                ('fps_avg', models.FloatField(default=0.0)),
+                ('fps_min', models.FloatField(default=0.0)),
+                ('latency_p50_ms', models.FloatField(default=0.0)),
+                ('latency_p95_ms', models.FloatField(default=0.0)),
+                ('latency_p99_ms', models.FloatField(default=0.0)),
+                ('buffer_depth_max', models.PositiveIntegerField(default=0)),
+                ('upload_backlog_max', models.PositiveIntegerField(default=0)),
+                ('dropped_frames', models.PositiveIntegerField(default=0)),
+                ('cpu_percent', models.FloatField(default=0.0)),
+                ('memory_mb', models.FloatField(default=0.0)),
+            ],
+            options={
+                'ordering': ['-bucket_start'],
+                'constraints': [models.UniqueConstraint(fields=('device_id', 'resolution', 'bucket_start'), name='telemetry_unique_bucket')],
+            },
+        ),
+    ]
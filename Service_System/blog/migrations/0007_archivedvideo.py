@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedVideo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_name', models.CharField(max_length=255)),
+                ('bundle', models.CharField(max_length=255)),
+                ('member', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='archived_video', to='blog.post')),
+            ],
+        ),
+    ]
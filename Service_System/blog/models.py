@@ -1,5 +1,10 @@
+import struct
+from datetime import datetime, timedelta, timezone as dt_timezone
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Max, Value
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 # Create your models here.
@@ -12,10 +17,289 @@ class Post(models.Model):
     published_date = models.DateTimeField(blank=True, null=True)
     image = models.ImageField(upload_to='blog_image/%Y/%m/%d/', default='blog_image/default_error.png')
     video = models.FileField(upload_to='blog_video/%Y/%m/%d/', blank=True, null=True)
+    # 생성/수정 시각 (앱 증분 동기화 워터마크, api_root/Post/sync/)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at'], name='post_updated_idx'),
+        ]
 
     def publish(self):
         self.published_date = timezone.now()
         self.save()
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+class PostTombstone(models.Model):
+    """
+    삭제된 게시글 기록 (앱 증분 동기화에서 삭제 반영용)
+    SYNC_TOMBSTONE_RETENTION_DAYS 이후 prune_tombstones 명령으로 삭제
+    """
+    post_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['deleted_at'], name='posttombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f'Post {self.post_id} deleted {self.deleted_at:%Y-%m-%d %H:%M:%S}'
+
+
+class MediaBlob(models.Model):
+    """
+    내용 주소 저장된 업로드 파일 (SHA-256 -> 저장 경로, blog/blobs.py)
+    같은 파일을 다시 올리면 저장하지 않고 이 경로를 재사용하므로 여러 게시글이 같은 파일을 가리킬 수 있음
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255)  # MEDIA_ROOT 기준 저장 경로
+    size = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.sha256[:12]} {self.name}'
+
+
+class ArchivedVideo(models.Model):
+    """
+    압축 번들로 옮긴 게시글 영상의 위치 (archive_media --mode bundle)
+    번들 안의 파일은 URL로 제공할 수 없으므로 Post.video는 비우고 여기에 기록 (archive_media --restore 로 복원)
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, related_name='archived_video')
+    original_name = models.CharField(max_length=255)  # 원래 Post.video 저장 경로
+    bundle = models.CharField(max_length=255)  # MEDIA_ROOT 기준 zip 경로
+    member = models.CharField(max_length=255)  # zip 안의 파일명
+    size = models.BigIntegerField(default=0)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f'{self.original_name} -> {self.bundle}:{self.member}'
+
+
+class FallEvent(models.Model):
+    """
+    Edge System이 보낸 낙상 분석 결과 (Post 본문 텍스트와 별도로 구조화 저장)
+    점수/시각/카메라 기준 필터링과 정렬은 인덱스를 타도록 컬럼으로 분리
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, related_name='fall_event')
+    camera_id = models.CharField(max_length=64, default='default')
+    detected_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    # 감지 정보
+    fall_score = models.FloatField()
+    confidence = models.FloatField(default=0.0)
+    reason = models.CharField(max_length=255, blank=True, default='')
+
+    # 측정값
+    aspect_ratio = models.FloatField(default=0.0)
+    body_angle = models.FloatField(default=0.0)
+    head_height_ratio = models.FloatField(default=0.0)
+    horizontal_ratio = models.FloatField(default=0.0)
+    aspect_ratio_delta = models.FloatField(default=0.0)
+
+    # 특징별 점수
+    aspect_score = models.FloatField(default=0.0)
+    position_score = models.FloatField(default=0.0)
+    horizontal_score = models.FloatField(default=0.0)
+    angle_score = models.FloatField(default=0.0)
+    sudden_change_score = models.FloatField(default=0.0)
+
+    # 바운딩 박스 (x1, y1, x2, y2)
+    bbox = models.JSONField(blank=True, null=True)
+    # 17개 키포인트 [x, y, conf] 를 float16 little-endian으로 패킹 (102 bytes)
+    keypoints = models.BinaryField(blank=True, null=True)
+
+    KEYPOINT_COUNT = 17
+    KEYPOINT_FORMAT = '<%de' % (KEYPOINT_COUNT * 3)
+
+    class Meta:
+        ordering = ['-detected_at']
+        indexes = [
+            models.Index(fields=['detected_at'], name='fallevent_detected_idx'),
+            models.Index(fields=['fall_score', 'detected_at'], name='fallevent_score_idx'),
+            models.Index(fields=['camera_id', 'detected_at'], name='fallevent_camera_idx'),
+        ]
+
+    @classmethod
+    def pack_keypoints(cls, keypoints):
+        """[[x, y, conf], ...] (17개) -> bytes"""
+        flat = [float(v) for point in keypoints for v in point]
+        if len(flat) != cls.KEYPOINT_COUNT * 3:
+            raise ValueError(f'keypoints must be {cls.KEYPOINT_COUNT}x3, got {len(flat)} values')
+        return struct.pack(cls.KEYPOINT_FORMAT, *flat)
+
+    @classmethod
+    def unpack_keypoints(cls, data):
+        """bytes -> [[x, y, conf], ...] (데이터가 없으면 None)"""
+        if not data:
+            return None
+        flat = struct.unpack(cls.KEYPOINT_FORMAT, bytes(data))
+        return [list(flat[i:i + 3]) for i in range(0, len(flat), 3)]
+
+    def get_keypoints(self):
+        return self.unpack_keypoints(self.keypoints)
+
+    def __str__(self):
+        return f'{self.camera_id} {self.detected_at:%Y-%m-%d %H:%M:%S} ({self.fall_score:.2f})'
+
+
+class FallStatBucket(models.Model):
+    """
+    카메라별 시간/일 단위 낙상 통계 롤업
+    FallEvent 생성 시 signals에서 증분 갱신되므로 통계 조회는 버킷 수에만 비례
+    """
+    HOUR = 'hour'
+    DAY = 'day'
+    GRANULARITY_CHOICES = [(HOUR, 'Hourly'), (DAY, 'Daily')]
+
+    granularity = models.CharField(max_length=8, choices=GRANULARITY_CHOICES)
+    camera_id = models.CharField(max_length=64)
+    bucket_start = models.DateTimeField()
+    fall_count = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    score_max = models.FloatField(default=0.0)
+
+    class Meta:
+        ordering = ['-bucket_start', 'camera_id']
+        constraints = [
+            models.UniqueConstraint(fields=['granularity', 'camera_id', 'bucket_start'],
+                                    name='fallstat_unique_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start'], name='fallstat_time_idx'),
+        ]
+
+    @property
+    def score_avg(self):
+        return self.score_sum / self.fall_count if self.fall_count else 0.0
+
+    @staticmethod
+    def bucket_start_for(granularity, moment):
+        """현재 TIME_ZONE 기준으로 버킷 시작 시각 계산 (TruncHour/TruncDay와 동일)"""
+        local = timezone.localtime(moment)
+        if granularity == FallStatBucket.DAY:
+            return local.replace(hour=0, minute=0, second=0, microsecond=0)
+        return local.replace(minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def add_event(cls, event):
+        """FallEvent 하나를 시간/일 버킷에 반영 (F() 증분으로 동시 삽입에도 안전)"""
+        for granularity in (cls.HOUR, cls.DAY):
+            bucket, created = cls.objects.get_or_create(
+                granularity=granularity,
+                camera_id=event.camera_id,
+                bucket_start=cls.bucket_start_for(granularity, event.detected_at),
+                defaults={'fall_count': 1, 'score_sum': event.fall_score, 'score_max': event.fall_score},
+            )
+            if not created:
+                cls.objects.filter(pk=bucket.pk).update(
+                    fall_count=models.F('fall_count') + 1,
+                    score_sum=models.F('score_sum') + event.fall_score,
+                    score_max=Greatest('score_max', Value(event.fall_score)),
+                )
+
+    @classmethod
+    def remove_event(cls, event):
+        """
+        FallEvent 하나를 시간/일 버킷에서 차감 (삭제 후, 또는 수정 전 값으로 수정 후에 호출)
+        score_max는 버킷에 남은 이벤트로 다시 계산하고, 비게 된 버킷은 삭제
+        """
+        for granularity in (cls.HOUR, cls.DAY):
+            start = cls.bucket_start_for(granularity, event.detected_at)
+            end = start + (timedelta(days=1) if granularity == cls.DAY else timedelta(hours=1))
+            buckets = cls.objects.filter(granularity=granularity, camera_id=event.camera_id, bucket_start=start)
+            buckets.filter(fall_count__gt=0).update(
+                fall_count=models.F('fall_count') - 1,
+                score_sum=models.F('score_sum') - event.fall_score,
+            )
+            buckets.filter(fall_count=0).delete()
+            remaining_max = (FallEvent.objects
+                             .filter(camera_id=event.camera_id, detected_at__gte=start, detected_at__lt=end)
+                             .aggregate(score_max=Max('fall_score'))['score_max'])
+            if remaining_max is not None:
+                buckets.update(score_max=remaining_max)
+
+    def __str__(self):
+        return f'{self.granularity} {self.camera_id} {self.bucket_start:%Y-%m-%d %H:%M} ({self.fall_count})'
+
+
+class TelemetrySample(models.Model):
+    """
+    Edge 장치 성능 텔레메트리 시계열 (다운샘플된 버킷 단위 저장)
+    수신 샘플은 TELEMETRY_RAW_RESOLUTION(초) 버킷에 병합되고,
+    prune_telemetry 명령이 오래된 버킷을 TELEMETRY_ROLLUP_RESOLUTION 버킷으로 합친 뒤 보존 기간을 적용
+    """
+    device_id = models.CharField(max_length=64)
+    resolution = models.PositiveIntegerField()  # 버킷 크기 (초)
+    bucket_start = models.DateTimeField()
+    sample_count = models.PositiveIntegerField(default=0)
+
+    fps_avg = models.FloatField(default=0.0)
+    fps_min = models.FloatField(default=0.0)
+    latency_p50_ms = models.FloatField(default=0.0)
+    latency_p95_ms = models.FloatField(default=0.0)
+    latency_p99_ms = models.FloatField(default=0.0)
+    buffer_depth_max = models.PositiveIntegerField(default=0)
+    upload_backlog_max = models.PositiveIntegerField(default=0)
+    dropped_frames = models.PositiveIntegerField(default=0)
+    cpu_percent = models.FloatField(default=0.0)
+    memory_mb = models.FloatField(default=0.0)
+
+    # 병합 방식: 평균은 샘플 수 가중 평균, 꼬리 지연/큐 깊이/메모리는 최댓값, 드롭 프레임은 합계
+    AVERAGE_FIELDS = ('fps_avg', 'latency_p50_ms', 'cpu_percent')
+    MAX_FIELDS = ('latency_p95_ms', 'latency_p99_ms', 'buffer_depth_max', 'upload_backlog_max', 'memory_mb')
+
+    class Meta:
+        ordering = ['-bucket_start']
+        constraints = [
+            models.UniqueConstraint(fields=['device_id', 'resolution', 'bucket_start'],
+                                    name='telemetry_unique_bucket'),
+        ]
+
+    @staticmethod
+    def bucket_start_for(resolution, moment):
+        """epoch 기준으로 resolution 초 단위 내림"""
+        epoch = int(moment.timestamp())
+        return datetime.fromtimestamp(epoch - epoch % resolution, tz=dt_timezone.utc)
+
+    def merge(self, values, count=1):
+        """
+        다른 샘플(또는 버킷)의 값을 현재 버킷에 병합
+
+        Args:
+            values: 필드명 -> 값 딕셔너리 (fps_min이 없으면 fps_avg 사용)
+            count: values가 대표하는 샘플 수
+        """
+        total = self.sample_count + count
+        for field in self.AVERAGE_FIELDS:
+            current = getattr(self, field)
+            setattr(self, field, (current * self.sample_count + values.get(field, 0.0) * count) / total)
+        for field in self.MAX_FIELDS:
+            setattr(self, field, max(getattr(self, field), values.get(field, 0)))
+
+        fps_min = values.get('fps_min', values.get('fps_avg', 0.0))
+        self.fps_min = fps_min if self.sample_count == 0 else min(self.fps_min, fps_min)
+        self.dropped_frames += values.get('dropped_frames', 0)
+        self.sample_count = total
+
+    @classmethod
+    def ingest(cls, device_id, timestamp, values, resolution):
+        """샘플 하나를 해당 버킷에 병합 저장"""
+        with transaction.atomic():
+            bucket, _ = cls.objects.select_for_update().get_or_create(
+                device_id=device_id,
+                resolution=resolution,
+                bucket_start=cls.bucket_start_for(resolution, timestamp),
+            )
+            bucket.merge(values)
+            bucket.save()
+        return bucket
+
+    def __str__(self):
+        return f'{self.device_id} {self.bucket_start:%Y-%m-%d %H:%M} /{self.resolution}s ({self.fps_avg:.1f} fps)'
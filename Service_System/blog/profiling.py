@@ -0,0 +1,313 @@
+"""
+요청 프로파일링 (기본 꺼짐, REQUEST_PROFILING_SAMPLE_RATE로 켬)
+
+표본으로 뽑힌 요청의 처리 시간을 단계별로 나눠 엔드포인트별 히스토그램으로 집계
+    - db:        SQL 실행 시간/쿼리 수 (connection.execute_wrappers에 등록한 profile_query)
+    - serialize: DRF 직렬화 (ProfiledSerializerMixin.to_representation, 중첩 serializer는 바깥 것만 측정)
+    - render:    JSON 렌더링 (FastJSONRenderer)
+    - template:  Django 템플릿 렌더링 (ProfiledDjangoTemplates 백엔드)
+    (serialize 중 발생한 지연 로딩 쿼리는 db와 serialize 양쪽에 포함)
+
+REQUEST_PROFILING_SLOW_MS 이상 걸린 요청은 실행한 SQL(파라미터 제외)과 함께 출력하고 최근 목록에 보관
+집계는 Admin 전용 api_root/metrics/ 로 조회 (프로세스별 메모리 집계, DELETE로 초기화)
+
+현재 요청의 프로파일은 contextvar로 전달하므로 async 뷰에서 sync_to_async 스레드로 넘어간 ORM 호출도 측정됨
+샘플링이 꺼져 있으면 미들웨어가 제거되고(MiddlewareNotUsed), 나머지 측정 지점은 contextvar 조회 한 번만 수행
+"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates
+
+STAGES = ('db', 'serialize', 'render', 'template')
+# 히스토그램 버킷 상한 (ms), 마지막 버킷은 그 이상 전체
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_current = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """요청 하나의 측정값"""
+
+    __slots__ = ('started', 'stages', 'query_count', 'queries', 'serializing')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.query_count = 0
+        self.queries = []  # (sql, ms), 최대 REQUEST_PROFILING_MAX_QUERIES개
+        self.serializing = False
+
+    def add_query(self, sql, seconds):
+        self.stages['db'] += seconds
+        self.query_count += 1
+        if len(self.queries) < settings.REQUEST_PROFILING_MAX_QUERIES:
+            self.queries.append((sql, seconds * 1000))
+
+
+@contextmanager
+def stage(name):
+    """단계 시간 측정 (프로파일 중인 요청에서만)"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.stages[name] += time.perf_counter() - started
+
+
+def profile_query(execute, sql, params, many, context):
+    """connection.execute_wrappers용 SQL 시간 측정 (파라미터는 토큰 등이 들어 있어 기록하지 않음)"""
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(sql, time.perf_counter() - started)
+
+
+def install_query_wrapper(connection, **kwargs):
+    """
+    DB 연결에 profile_query 등록 (connection_created 수신)
+
+    연결 객체는 스레드별로 만들어지고 CONN_MAX_AGE=0이면 요청마다 다시 연결하므로 중복 등록 방지
+    """
+    if profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(profile_query)
+
+
+class ProfiledSerializerMixin:
+    """직렬화 시간 측정 (ListSerializer는 항목별 시간을 합산, 중첩 serializer는 바깥 것만 측정)"""
+
+    def to_representation(self, instance):
+        profile = _current.get()
+        if profile is None or profile.serializing:
+            return super().to_representation(instance)
+        profile.serializing = True
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            profile.serializing = False
+            profile.stages['serialize'] += time.perf_counter() - started
+
+
+class ProfiledDjangoTemplates(DjangoTemplates):
+    """템플릿 렌더링 시간을 측정하는 DjangoTemplates 백엔드 ({% include %}는 바깥 템플릿 시간에 포함)"""
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name))
+
+
+class ProfiledTemplate:
+    """백엔드 Template 래퍼 (origin, template 등 나머지 속성은 그대로 전달)"""
+
+    def __init__(self, wrapped):
+        self._wrapped = wrapped
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+    def render(self, context=None, request=None):
+        with stage('template'):
+            return self._wrapped.render(context, request)
+
+
+# ========== 집계 ==========
+
+class Histogram:
+    """고정 버킷(BUCKETS_MS) 히스토그램"""
+
+    __slots__ = ('counts', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        index = 0
+        while index < len(BUCKETS_MS) and ms > BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q, count):
+        """q 백분위수가 속한 버킷의 상한 (ms, 마지막 버킷이면 최댓값)"""
+        target = max(1, round(count * q / 100))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max
+        return 0.0
+
+    def summary(self, count):
+        return {
+            'mean_ms': round(self.total / count, 2) if count else 0.0,
+            'p50_ms': self.percentile(50, count),
+            'p95_ms': self.percentile(95, count),
+            'p99_ms': self.percentile(99, count),
+            'max_ms': round(self.max, 2),
+            'buckets': dict(zip([f'le_{bound}' for bound in BUCKETS_MS] + ['inf'], self.counts)),
+        }
+
+
+class EndpointStats:
+    __slots__ = ('count', 'errors', 'queries', 'total', 'stages')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.queries = 0
+        self.total = Histogram()
+        self.stages = {name: Histogram() for name in STAGES}
+
+
+class ProfileRegistry:
+    """엔드포인트('METHOD view_name')별 집계와 최근 느린 요청 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            self.slow_requests = deque(maxlen=settings.REQUEST_PROFILING_RECENT_SLOW)
+
+    def record(self, endpoint, status_code, total_ms, profile):
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats()
+            stats.count += 1
+            stats.errors += status_code >= 500
+            stats.queries += profile.query_count
+            stats.total.observe(total_ms)
+            for name, seconds in profile.stages.items():
+                stats.stages[name].observe(seconds * 1000)
+
+    def add_slow(self, entry):
+        with self._lock:
+            self.slow_requests.append(entry)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'sample_rate': settings.REQUEST_PROFILING_SAMPLE_RATE,
+                'slow_threshold_ms': settings.REQUEST_PROFILING_SLOW_MS,
+                'endpoints': {
+                    endpoint: {
+                        'count': stats.count,
+                        'errors': stats.errors,
+                        'queries_mean': round(stats.queries / stats.count, 2),
+                        'total': stats.total.summary(stats.count),
+                        **{name: histogram.summary(stats.count) for name, histogram in stats.stages.items()},
+                    }
+                    for endpoint, stats in sorted(self.endpoints.items())
+                },
+                'slow_requests': list(self.slow_requests),
+            }
+
+
+registry = ProfileRegistry()
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return f'{request.method} unresolved'
+    return f'{request.method} {match.view_name or match.route}'
+
+
+class RequestProfilingMiddleware:
+    """
+    표본 요청의 단계별 처리 시간 집계와 느린 요청 기록 (sync/async 뷰 모두 지원)
+
+    MIDDLEWARE 맨 앞에 두어 다른 미들웨어 시간도 전체 시간에 포함
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        connection_created.connect(install_query_wrapper, dispatch_uid='blog.profiling')
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, profile)
+        return response
+
+    @staticmethod
+    def finish(request, response, profile):
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        endpoint = endpoint_name(request)
+        registry.record(endpoint, response.status_code, total_ms, profile)
+        if total_ms < settings.REQUEST_PROFILING_SLOW_MS:
+            return
+
+        stages = {name: round(seconds * 1000, 2) for name, seconds in profile.stages.items()}
+        registry.add_slow({
+            'endpoint': endpoint,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'stages_ms': stages,
+            'query_count': profile.query_count,
+            'queries': [{'sql': sql, 'ms': round(ms, 2)} for sql, ms in profile.queries],
+        })
+        print(f"⚠ Slow request {request.method} {request.get_full_path()} → {response.status_code} "
+              f"{total_ms:.0f}ms ({', '.join(f'{name} {ms:.0f}ms' for name, ms in stages.items())}, "
+              f"{profile.query_count} queries)")
+        for sql, ms in profile.queries:
+            print(f"    {ms:8.2f}ms  {sql}")
+        if profile.query_count > len(profile.queries):
+            print(f"    ... {profile.query_count - len(profile.queries)} more queries")
@@ -0,0 +1,44 @@
+"""
+JSON 렌더러
+
+orjson이 설치되어 있으면 orjson으로 직렬화 (DRF 기본 json.dumps 대비 수 배 빠름), 없으면 DRF 기본 렌더러
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from blog.profiling import stage
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson 기반 JSONRenderer
+
+    datetime/Decimal/지연 번역 문자열 등 orjson이 모르는 타입은 DRF JSONEncoder로 변환
+    (datetime/date/time은 orjson이 직접 처리하면 형식이 달라지므로 OPT_PASSTHROUGH_DATETIME으로 DRF에 넘김,
+     U+2028/U+2029도 DRF와 같이 이스케이프 → orjson 설치 여부와 관계없이 같은 출력)
+    들여쓰기를 요청(Accept: application/json; indent=4)하면 DRF 기본 구현 사용
+     / 는 이스케이프하지 않음 (JSON 응답을 HTML에 그대로 넣지 않으므로)
+    """
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with stage('render'):
+            return self.encode(data, accepted_media_type, renderer_context)
+
+    def encode(self, data, accepted_media_type, renderer_context):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=self._encoder.default,
+                           option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
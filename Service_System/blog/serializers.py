@@ -1,10 +1,211 @@
-from blog.models import Post
+from blog.models import Post, FallEvent, FallStatBucket, TelemetrySample, MediaBlob
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from blog.blobs import astore_upload, find_blob, is_sha256, store_upload
+from blog.derivatives import derivative_urls, is_valid_source
+from blog.profiling import ProfiledSerializerMixin
 
-class PostSerializer(serializers.ModelSerializer):
+
+class SparseFieldsetMixin:
+    """
+    ?fields=id,title,... 로 조회 응답에 포함할 필드 선택 (쓰기 요청에는 적용하지 않음)
+    알 수 없는 필드를 요청하면 400
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return
+        requested = request.query_params.get('fields')
+        if not requested:
+            return
+
+        names = {name.strip() for name in requested.split(',') if name.strip()}
+        readable = [name for name, field in self.fields.items() if not field.write_only]
+        unknown = names.difference(readable)
+        if unknown:
+            raise serializers.ValidationError(
+                {'fields': f'알 수 없는 필드: {", ".join(sorted(unknown))} (허용 값: {", ".join(readable)})'})
+        for name in readable:
+            if name not in names:
+                self.fields.pop(name)
+
+
+class KeypointsField(serializers.Field):
+    """17x3 키포인트 리스트 <-> FallEvent.keypoints (float16 패킹) 변환"""
+
+    def to_representation(self, value):
+        return FallEvent.unpack_keypoints(value)
+
+    def to_internal_value(self, data):
+        try:
+            return FallEvent.pack_keypoints(data)
+        except (TypeError, ValueError) as e:
+            raise serializers.ValidationError(str(e))
+
+
+class FallEventSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    post = serializers.PrimaryKeyRelatedField(read_only=True)
+    keypoints = KeypointsField(required=False, allow_null=True)
+
+    class Meta:
+        model = FallEvent
+        fields = ('id', 'post', 'camera_id', 'detected_at', 'fall_score', 'confidence', 'reason',
+                  'aspect_ratio', 'body_angle', 'head_height_ratio', 'horizontal_ratio',
+                  'aspect_ratio_delta', 'aspect_score', 'position_score', 'horizontal_score',
+                  'angle_score', 'sudden_change_score', 'bbox', 'keypoints')
+
+
+class FallStatBucketSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    score_avg = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = FallStatBucket
+        fields = ('granularity', 'camera_id', 'bucket_start', 'fall_count', 'score_avg', 'score_max')
+
+
+class TelemetryValueSerializer(serializers.Serializer):
+    """Edge가 보내는 개별 텔레메트리 샘플"""
+    timestamp = serializers.DateTimeField()
+    fps_avg = serializers.FloatField(min_value=0)
+    fps_min = serializers.FloatField(min_value=0, required=False)
+    latency_p50_ms = serializers.FloatField(min_value=0, default=0.0)
+    latency_p95_ms = serializers.FloatField(min_value=0, default=0.0)
+    latency_p99_ms = serializers.FloatField(min_value=0, default=0.0)
+    buffer_depth_max = serializers.IntegerField(min_value=0, default=0)
+    upload_backlog_max = serializers.IntegerField(min_value=0, default=0)
+    dropped_frames = serializers.IntegerField(min_value=0, default=0)
+    cpu_percent = serializers.FloatField(min_value=0, default=0.0)
+    memory_mb = serializers.FloatField(min_value=0, default=0.0)
+
+
+class TelemetryBatchSerializer(serializers.Serializer):
+    """POST api_root/Telemetry/ 요청 본문: {'device_id': ..., 'samples': [...]}"""
+    device_id = serializers.CharField(max_length=64)
+    samples = TelemetryValueSerializer(many=True, allow_empty=False)
+
+    def validate_samples(self, value):
+        if len(value) > settings.TELEMETRY_MAX_BATCH:
+            raise serializers.ValidationError(f'최대 {settings.TELEMETRY_MAX_BATCH}개까지 전송할 수 있습니다.')
+        return value
+
+
+class TelemetrySampleSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = TelemetrySample
+        fields = ('device_id', 'resolution', 'bucket_start', 'sample_count', 'fps_avg', 'fps_min',
+                  'latency_p50_ms', 'latency_p95_ms', 'latency_p99_ms', 'buffer_depth_max',
+                  'upload_backlog_max', 'dropped_frames', 'cpu_percent', 'memory_mb')
+
+
+class PostListSerializer(ProfiledSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    목록용 경량 표현 (본문/영상/원본 이미지 제외)
+    본문 등 전체 내용은 상세 조회(api_root/Post/<id>/)로 가져옴
+    """
+    fall_score = serializers.SerializerMethodField()
+    thumbnail = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Post
+        fields = ('id', 'title', 'published_date', 'updated_at', 'fall_score', 'thumbnail')
+
+    def get_fall_score(self, obj):
+        # 목록 쿼리에서 select_related('fall_event')로 함께 조회
+        try:
+            return obj.fall_event.fall_score
+        except FallEvent.DoesNotExist:
+            return None
+
+    def get_thumbnail(self, obj):
+        """목록 썸네일 URL ({'webp': url, 'jpeg': url})"""
+        if not obj.image or not is_valid_source(obj.image.name):
+            return None
+        return derivative_urls(obj.image.name, self.context.get('request'), sizes=('thumb',))['thumb']
+
+
+class MediaBlobSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = MediaBlob
+        fields = ('sha256', 'name', 'size', 'created_at')
+
+
+class PostSerializer(ProfiledSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     author = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+    # Edge System이 multipart 요청에 JSON 문자열로 함께 보내는 낙상 분석 결과
+    fall_event = serializers.JSONField(write_only=True, required=False)
+    # 서버에 이미 있는 파일(HEAD api_root/Media/<sha256>/ 로 확인)은 파일 대신 해시만 전송
+    image_sha256 = serializers.CharField(write_only=True, required=False, min_length=64, max_length=64)
+    video_sha256 = serializers.CharField(write_only=True, required=False, min_length=64, max_length=64)
+    # 크기별/포맷별 이미지 파생본 URL: {'thumb': {'webp': url, 'jpeg': url}, 'detail': {...}}
+    image_derivatives = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = ('author', 'title', 'text', 'created_date', 'published_date', 'image', 'video')
\ No newline at end of file
+        fields = ('id', 'author', 'title', 'text', 'created_date', 'published_date', 'updated_at', 'image',
+                  'image_derivatives', 'video', 'fall_event', 'image_sha256', 'video_sha256')
+
+    # 파일 필드 -> 내용 주소 저장 디렉토리 (upload_to 최상위)
+    MEDIA_FIELDS = (('image', 'blog_image'), ('video', 'blog_video'))
+
+    def get_image_derivatives(self, obj):
+        if not obj.image or not is_valid_source(obj.image.name):
+            return None
+        return derivative_urls(obj.image.name, self.context.get('request'))
+
+    def validate_fall_event(self, value):
+        serializer = FallEventSerializer(data=value)
+        if not serializer.is_valid():
+            raise serializers.ValidationError(serializer.errors)
+        return serializer.validated_data
+
+    def validate(self, attrs):
+        for field, _ in self.MEDIA_FIELDS:
+            digest = attrs.pop(f'{field}_sha256', '').lower()
+            if not digest or field in attrs:  # 파일을 함께 보냈으면 파일 사용
+                continue
+            if not is_sha256(digest):
+                raise serializers.ValidationError({f'{field}_sha256': 'SHA-256 16진수 문자열이 필요합니다.'})
+            blob = find_blob(digest)
+            if blob is None:
+                raise serializers.ValidationError({f'{field}_sha256': '서버에 없는 파일입니다. 파일을 전송하세요.'})
+            attrs[field] = blob.name
+        return attrs
+
+    def store_media(self, validated_data):
+        """업로드 파일을 내용 주소 경로에 저장하고 저장 경로로 교체 (같은 파일이 있으면 재사용)"""
+        digests = getattr(self.context.get('request'), 'upload_sha256', {})
+        for field, upload_dir in self.MEDIA_FIELDS:
+            file = validated_data.get(field)
+            if isinstance(file, UploadedFile):
+                validated_data[field] = store_upload(upload_dir, file, digests.get(field)).name
+
+    async def astore_media(self, validated_data):
+        """store_media의 비동기 버전 (blog/async_views.py, 이후 save()에서는 파일을 다시 저장하지 않음)"""
+        digests = getattr(self.context.get('request'), 'upload_sha256', {})
+        for field, upload_dir in self.MEDIA_FIELDS:
+            file = validated_data.get(field)
+            if isinstance(file, UploadedFile):
+                validated_data[field] = (await astore_upload(upload_dir, file, digests.get(field))).name
+
+    def create(self, validated_data):
+        fall_event_data = validated_data.pop('fall_event', None)
+        self.store_media(validated_data)
+        with transaction.atomic():
+            post = super().create(validated_data)
+            if fall_event_data:
+                FallEvent.objects.create(post=post, **fall_event_data)
+        return post
+
+    def update(self, instance, validated_data):
+        fall_event_data = validated_data.pop('fall_event', None)
+        self.store_media(validated_data)
+        with transaction.atomic():
+            post = super().update(instance, validated_data)
+            if fall_event_data:
+                FallEvent.objects.update_or_create(post=post, defaults=fall_event_data)
+        return post
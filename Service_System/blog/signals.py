@@ -2,11 +2,18 @@
 Django signals for blog app
 Post 생성 시 WebSocket 알림 전송
 """
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .models import Post
+from .models import Post, PostTombstone, FallEvent, FallStatBucket
+from .authentication import token_cache
+from .derivatives import delete_derivatives, generate_derivatives, is_valid_source
 
 
 @receiver(post_save, sender=Post)
@@ -50,3 +57,85 @@ def notify_new_post(sender, instance, created, **kwargs):
         )
 
         print(f"✓ Notification sent for new post: {instance.title} (ID: {instance.pk})")
+
+
+@receiver(post_save, sender=Post)
+def create_image_derivatives(sender, instance, **kwargs):
+    """
+    업로드된 이미지의 목록 썸네일 미리 생성 (커밋 후, 이미 있으면 건너뜀)
+
+    Args:
+        sender: Post 모델
+        instance: 저장된 Post 인스턴스
+    """
+    if instance.image and is_valid_source(instance.image.name):
+        name = instance.image.name
+        transaction.on_commit(lambda: generate_derivatives(name, settings.IMAGE_DERIVATIVES_ON_UPLOAD))
+
+
+@receiver(post_delete, sender=Post)
+def remove_image_derivatives(sender, instance, **kwargs):
+    """삭제된 게시글의 이미지 파생본 삭제 (기본 이미지, 같은 내용을 올려 다른 게시글과 공유하는 이미지는 제외)"""
+    if (instance.image and instance.image.name != Post._meta.get_field('image').default
+            and not Post.objects.filter(image=instance.image.name).exists()):
+        delete_derivatives(instance.image.name)
+
+
+@receiver(post_delete, sender=Post)
+def record_post_tombstone(sender, instance, **kwargs):
+    """삭제된 게시글을 기록해 앱 증분 동기화(api_root/Post/sync/)에서 삭제를 반영"""
+    PostTombstone.objects.create(post_id=instance.pk)
+
+
+@receiver(pre_save, sender=FallEvent)
+def remember_fall_event_rollup(sender, instance, raw=False, **kwargs):
+    """수정 전 카메라/시각/점수를 기억해 post_save에서 이전 버킷 차감에 사용"""
+    instance._rollup_previous = None
+    if instance.pk and not raw:
+        instance._rollup_previous = (FallEvent.objects.filter(pk=instance.pk)
+                                     .only('camera_id', 'detected_at', 'fall_score').first())
+
+
+@receiver(post_save, sender=FallEvent)
+def rollup_fall_event(sender, instance, created, **kwargs):
+    """
+    FallEvent를 시간/일 통계 버킷에 증분 반영 (수정이면 이전 값을 차감하고 새 값을 더함)
+
+    Args:
+        sender: FallEvent 모델
+        instance: 저장된 FallEvent 인스턴스
+        created: True if 새로 생성된 경우
+    """
+    previous = getattr(instance, '_rollup_previous', None)
+    if not created:
+        if previous is None or (previous.camera_id, previous.detected_at, previous.fall_score) == (
+                instance.camera_id, instance.detected_at, instance.fall_score):
+            return
+        FallStatBucket.remove_event(previous)
+    FallStatBucket.add_event(instance)
+
+
+@receiver(post_delete, sender=FallEvent)
+def rollback_fall_event(sender, instance, **kwargs):
+    """삭제된 FallEvent를 통계 버킷에서 차감"""
+    FallStatBucket.remove_event(instance)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache(sender, instance, **kwargs):
+    """토큰이 재발급/삭제되면 인증 캐시에서 제거"""
+    token_cache.invalidate(key=instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    """
+    사용자가 변경(비활성화, 권한 변경 등)/삭제되면 해당 사용자의 캐시된 토큰 모두 제거
+    (로그인 시 last_login만 갱신하는 저장은 제외)
+    """
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    token_cache.invalidate(user_id=instance.pk)
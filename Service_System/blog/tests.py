@@ -1,3 +1,343 @@
-from django.test import TestCase
+import hashlib
+import io
+import shutil
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from blog.authentication import TokenCache, token_cache
+from blog.renderers import FastJSONRenderer
+from blog.models import Post, PostTombstone, MediaBlob, ArchivedVideo, FallEvent, FallStatBucket, TelemetrySample
+
+
+class AdminAPITestCase(TestCase):
+    """Admin 토큰으로 인증한 APIClient"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', password='pw', is_staff=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin).key}')
+
+    def create_post(self, title='낙상 감지', **fall_event):
+        data = {'author': self.admin.pk, 'title': title, 'text': '본문'}
+        if fall_event:
+            data['fall_event'] = fall_event
+        response = self.client.post('/api_root/Post/', data, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['id']
+
+
+class FallStatRollupTest(AdminAPITestCase):
+    def buckets(self, camera_id):
+        return {(bucket.granularity, bucket.fall_count, round(bucket.score_sum, 4), bucket.score_max)
+                for bucket in FallStatBucket.objects.filter(camera_id=camera_id)}
+
+    def test_create_update_delete(self):
+        detected_at = timezone.now().replace(minute=10)
+        first = self.create_post(camera_id='cam1', fall_score=0.8, detected_at=detected_at.isoformat())
+        self.create_post(camera_id='cam1', fall_score=0.6, detected_at=detected_at.isoformat())
+        self.assertEqual(self.buckets('cam1'), {('hour', 2, 1.4, 0.8), ('day', 2, 1.4, 0.8)})
+
+        # 카메라/시각/점수 수정 → 이전 버킷에서 빠지고(score_max 재계산) 새 버킷에 반영
+        moved_at = detected_at - timedelta(days=3)
+        response = self.client.patch(f'/api_root/Post/{first}/', {
+            'fall_event': {'camera_id': 'cam2', 'fall_score': 0.3, 'detected_at': moved_at.isoformat()},
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.buckets('cam1'), {('hour', 1, 0.6, 0.6), ('day', 1, 0.6, 0.6)})
+        self.assertEqual(self.buckets('cam2'), {('hour', 1, 0.3, 0.3), ('day', 1, 0.3, 0.3)})
+
+        # 삭제 → 비게 된 버킷 삭제
+        self.client.delete(f'/api_root/Post/{first}/')
+        self.assertEqual(self.buckets('cam2'), set())
+        self.assertEqual(self.buckets('cam1'), {('hour', 1, 0.6, 0.6), ('day', 1, 0.6, 0.6)})
+
+    def test_unchanged_save_keeps_buckets(self):
+        post_id = self.create_post(camera_id='cam1', fall_score=0.5)
+        FallEvent.objects.get(post_id=post_id).save()
+        self.assertEqual(self.buckets('cam1'), {('hour', 1, 0.5, 0.5), ('day', 1, 0.5, 0.5)})
+        Post.objects.filter(pk=post_id).delete()
+        self.assertFalse(FallStatBucket.objects.exists())
+
+
+class TokenCacheUsageTest(AdminAPITestCase):
+    def test_usage_survives_ttl_expiry(self):
+        cache = TokenCache(max_size=8, ttl=60)
+        cache.put('k' * 40, None, self.admin, now=0)
+        self.assertEqual(cache.count_request('k' * 40, self.admin, now=0), 1)
+
+        # TTL 만료 → 미스 후 재조회해도 분당/누적 집계는 이어짐
+        self.assertIsNone(cache.get('k' * 40, now=61))
+        cache.put('k' * 40, None, self.admin, now=61)
+        self.assertEqual(cache.count_request('k' * 40, self.admin, now=62), 1)
+        self.assertEqual(cache.count_request('k' * 40, self.admin, now=63), 2)
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (0, 1, 1))
+        self.assertEqual(stats['tokens'], [{'token': 'kkkkkkkk', 'user': 'admin',
+                                            'requests_in_window': 2, 'requests_total': 3}])
+
+    def test_metrics_endpoint(self):
+        token_cache.invalidate()
+        token_cache.reset_stats()
+        self.client.get('/api_root/metrics/')
+        stats = self.client.get('/api_root/metrics/').json()['auth_token_cache']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['tokens'][0]['requests_total'], 2)
+
+        self.assertEqual(self.client.delete('/api_root/metrics/').status_code, 204)
+        self.assertEqual(token_cache.stats()['tokens'], [])
+
+
+class PostSyncTest(AdminAPITestCase):
+    def sync(self, since=None):
+        response = self.client.get('/api_root/Post/sync/', {'since': since.isoformat()} if since else {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    @override_settings(SYNC_MAX_CHANGES=2)
+    def test_ties_at_page_boundary(self):
+        now = timezone.now()
+        first, *tied, last = [self.create_post(title=f'post {i}') for i in range(4)]
+        Post.objects.filter(pk=first).update(updated_at=now - timedelta(minutes=30))
+        Post.objects.filter(pk__in=tied).update(updated_at=now - timedelta(minutes=20))
+        Post.objects.filter(pk=last).update(updated_at=now - timedelta(minutes=10))
+
+        # 한도(2개) 경계에 같은 updated_at이 걸치면 함께 반환하고 워터마크는 그 시각
+        page = self.sync(now - timedelta(hours=1))
+        self.assertTrue(page['has_more'])
+        self.assertEqual([post['id'] for post in page['posts']], [first, *tied])
+
+        page = self.sync(parse_datetime(page['next_since']))
+        self.assertFalse(page['has_more'])
+        self.assertEqual([post['id'] for post in page['posts']], [last])
+
+    def test_deleted_post(self):
+        since = timezone.now() - timedelta(minutes=1)
+        kept = self.create_post()
+        deleted = self.create_post()
+        self.assertEqual(self.client.delete(f'/api_root/Post/{deleted}/').status_code, 204)
+
+        page = self.sync(since)
+        self.assertEqual([post['id'] for post in page['posts']], [kept])
+        self.assertEqual(page['deleted'], [deleted])
+        self.assertTrue(PostTombstone.objects.filter(post_id=deleted).exists())
+
+    def test_next_since_format(self):
+        # 게시글 시각 필드와 같은 현지 시각 ISO 형식이고, 그대로 다음 since로 사용 가능
+        post_id = self.create_post()
+        page = self.sync(timezone.now() - timedelta(minutes=1))
+        updated_at = self.client.get(f'/api_root/Post/{post_id}/').json()['updated_at']
+        self.assertEqual(page['next_since'][-6:], updated_at[-6:])
+        self.assertFalse(self.sync(parse_datetime(page['next_since']))['reset'])
+
+    @override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=30)
+    def test_reset(self):
+        self.create_post()
+        for since in (None, timezone.now() - timedelta(days=31)):
+            page = self.sync(since)
+            self.assertTrue(page['reset'])
+            self.assertEqual((page['posts'], page['deleted'], page['has_more']), ([], [], False))
+            self.assertIsNotNone(page['next_since'])
+        self.assertFalse(self.sync(timezone.now() - timedelta(days=29))['reset'])
+
+
+class PostListETagTest(AdminAPITestCase):
+    def test_not_modified_until_edit(self):
+        post_id = self.create_post()
+        response = self.client.get('/api_root/Post/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get('/api_root/Post/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # 페이지가 다르면 다른 응답
+        self.assertNotEqual(self.client.get('/api_root/Post/', {'page': 1})['ETag'], etag)
+
+        self.client.patch(f'/api_root/Post/{post_id}/', {'title': '수정'}, format='json')
+        response = self.client.get('/api_root/Post/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['results'][0]['title'], '수정')
+
+
+class MediaTestCase(AdminAPITestCase):
+    """임시 MEDIA_ROOT + multipart 게시글 생성"""
+    VIDEO = b'fall clip bytes'
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+    def post_media(self, **data):
+        return self.client.post('/api_root/Post/', {
+            'author': self.admin.pk, 'title': '낙상 감지', 'text': '본문', **data,
+        }, format='multipart')
+
+
+class MediaBlobTest(MediaTestCase):
+    def test_same_content_stored_once(self):
+        names = []
+        for filename in ('fall_1.mp4', 'fall_2.mp4'):
+            response = self.post_media(video=SimpleUploadedFile(filename, self.VIDEO))
+            self.assertEqual(response.status_code, 201, response.content)
+            names.append(Post.objects.get(pk=response.json()['id']).video.name)
+
+        digest = hashlib.sha256(self.VIDEO).hexdigest()
+        self.assertEqual(list(MediaBlob.objects.values_list('sha256', flat=True)), [digest])
+        self.assertEqual(names[0], names[1])
+        self.assertEqual(self.client.head(f'/api_root/Media/{digest}/').status_code, 200)
+
+    def test_create_with_hash_only(self):
+        first = self.post_media(video=SimpleUploadedFile('fall.mp4', self.VIDEO)).json()['id']
+        response = self.post_media(video_sha256=hashlib.sha256(self.VIDEO).hexdigest())
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Post.objects.get(pk=response.json()['id']).video.name,
+                         Post.objects.get(pk=first).video.name)
+        self.assertEqual(MediaBlob.objects.count(), 1)
+
+    def test_unknown_hash_rejected(self):
+        digest = hashlib.sha256(b'never uploaded').hexdigest()
+        self.assertEqual(self.client.head(f'/api_root/Media/{digest}/').status_code, 404)
+        response = self.post_media(video_sha256=digest)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('video_sha256', response.json())
+        self.assertFalse(Post.objects.exists())
+
+
+class TelemetryDevicesTest(AdminAPITestCase):
+    def add_buckets(self, device_id, now):
+        for resolution, age, fps in ((60, 0, 30.0), (3600, 0, 25.0), (60, 5, 20.0)):
+            TelemetrySample.objects.create(device_id=device_id, resolution=resolution,
+                                           bucket_start=now - timedelta(minutes=age), fps_avg=fps)
+
+    def devices(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api_root/Telemetry/devices/')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+    def test_latest_bucket_per_device(self):
+        self.devices()  # 토큰 인증 캐시 채움 (이후 쿼리 수에서 인증 조회 제외)
+        now = timezone.now().replace(second=0, microsecond=0)
+        for device_id in ('cam2', 'cam1'):
+            self.add_buckets(device_id, now)
+        devices, query_count = self.devices()
+        # 같은 시각의 버킷 중 해상도가 작은(1분) 버킷
+        self.assertEqual([(d['device_id'], d['resolution'], d['fps_avg']) for d in devices],
+                         [('cam1', 60, 30.0), ('cam2', 60, 30.0)])
+
+        # 장치가 늘어도 쿼리 수는 같음
+        for device_id in ('cam3', 'cam4', 'cam5'):
+            self.add_buckets(device_id, now)
+        devices, more_devices_query_count = self.devices()
+        self.assertEqual(len(devices), 5)
+        self.assertEqual(more_devices_query_count, query_count)
+
+
+class FastJSONRendererTest(TestCase):
+    def test_same_output_as_drf(self):
+        moment = timezone.now().replace(microsecond=123456)
+        data = {
+            'utc': moment,
+            'local': timezone.localtime(moment),
+            'date': moment.date(),
+            'time': moment.time(),
+            'nested': [{'at': moment, 1: 'int key'}],
+            'text': '줄\u2028바꿈\u2029/',
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class ArchiveBundleTest(MediaTestCase):
+    def test_keeps_files_shared_with_recent_posts(self):
+        shared = self.post_media(video=SimpleUploadedFile('shared.mp4', self.VIDEO)).json()['id']
+        old_only = self.post_media(video=SimpleUploadedFile('old.mp4', b'old clip')).json()['id']
+        # 오늘 게시글이 같은 내용으로 중복 제거되어 오래된 게시글과 파일을 공유
+        recent = self.post_media(video_sha256=hashlib.sha256(self.VIDEO).hexdigest()).json()['id']
+        Post.objects.filter(pk__in=[shared, old_only]).update(created_date=timezone.now() - timedelta(days=200))
+        shared_name = Post.objects.get(pk=shared).video.name
+
+        call_command('archive_media', mode='bundle', days=90, stdout=io.StringIO())
+
+        self.assertEqual(Post.objects.get(pk=recent).video.name, shared_name)
+        self.assertEqual(Post.objects.get(pk=shared).video.name, shared_name)
+        self.assertTrue(default_storage.exists(shared_name))
+        self.assertFalse(Post.objects.get(pk=old_only).video)
+        self.assertEqual(list(ArchivedVideo.objects.values_list('post_id', flat=True)), [old_only])
+
+
+class AsyncPostViewTest(MediaTestCase):
+    """api_async/Post/ (blog/async_views.py)"""
+
+    def setUp(self):
+        super().setUp()
+        self.auth = {'authorization': f'Token {Token.objects.get(user=self.admin).key}'}
+
+    async def test_list_etag(self):
+        await Post.objects.acreate(author=self.admin, title='낙상 감지', text='본문')
+        response = await self.async_client.get('/api_async/Post/', headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+
+        headers = {**self.auth, 'if-none-match': response['ETag']}
+        response = await self.async_client.get('/api_async/Post/', headers=headers)
+        self.assertEqual(response.status_code, 304)
+
+    async def test_detail_not_found(self):
+        response = await self.async_client.get('/api_async/Post/999/', headers=self.auth)
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('detail', response.json())
+
+    async def test_multipart_create(self):
+        response = await self.async_client.post('/api_async/Post/', {
+            'author': self.admin.pk, 'title': '낙상 감지', 'text': '본문',
+            'video': SimpleUploadedFile('fall.mp4', self.VIDEO),
+        }, headers=self.auth)
+        self.assertEqual(response.status_code, 201, response.content)
+        post = await Post.objects.aget(pk=response.json()['id'])
+        self.assertTrue(post.video.name.startswith('blog_video/sha256/'))
+
+    async def test_json_create(self):
+        response = await self.async_client.post('/api_async/Post/', {
+            'author': self.admin.pk, 'title': '낙상 감지', 'text': '본문',
+            'fall_event': {'camera_id': 'cam1', 'fall_score': 0.9},
+        }, content_type='application/json', headers=self.auth)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(await FallEvent.objects.filter(camera_id='cam1').acount(), 1)
+
+    async def test_bad_body(self):
+        response = await self.async_client.post('/api_async/Post/', '{"title": ',
+                                                content_type='application/json', headers=self.auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('detail', response.json())
+        response = await self.async_client.post('/api_async/Post/', 'title',
+                                                content_type='text/plain', headers=self.auth)
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(await Post.objects.aexists())
+
+    async def test_authentication(self):
+        response = await self.async_client.get('/api_async/Post/')
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get('/api_async/Post/', headers={'authorization': 'Token invalid'})
+        self.assertEqual(response.status_code, 401)
+
+        user = await User.objects.acreate_user('viewer', password='pw')
+        token = await Token.objects.acreate(user=user)
+        response = await self.async_client.get('/api_async/Post/', headers={'authorization': f'Token {token.key}'})
+        self.assertEqual(response.status_code, 403)
@@ -1,14 +1,23 @@
 from django.urls import path, include
-from . import views
+from . import views, async_views
 from rest_framework import routers
 
 router = routers.DefaultRouter()
 router.register('Post', views.blogImage)
+router.register('FallEvent', views.FallEventViewSet)
+router.register('FallStats', views.FallStatViewSet)
+router.register('Telemetry', views.TelemetryViewSet)
+router.register('Media', views.MediaBlobViewSet)
 
 urlpatterns = [
     path('', views.post_list, name='post_list'),
     path('post/<int:pk>/', views.post_detail, name='post_detail'),
     path('post/new/', views.post_new, name='post_new'),
     path('post/<int:pk>/edit/', views.post_edit, name='post_edit'),
+    path('api_root/metrics/', views.request_metrics, name='request_metrics'),
     path('api_root/', include(router.urls)),
+    # async(ASGI) 버전: 목록/상세/알림 생성 (blog/async_views.py)
+    path('api_async/Post/', async_views.post_list, name='async_post_list'),
+    path('api_async/Post/<int:pk>/', async_views.post_detail, name='async_post_detail'),
+    path('media-derivatives/<str:size>/<str:fmt>/<path:name>', views.image_derivative, name='image_derivative'),
 ]
\ No newline at end of file
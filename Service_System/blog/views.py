@@ -1,23 +1,365 @@
+import hashlib
+from datetime import timedelta
+
 from django.shortcuts import render, redirect, get_object_or_404
-from blog.models import Post
+from django.http import FileResponse, Http404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, require_safe
+from django.core.files.storage import default_storage
+from blog.models import Post, PostTombstone, MediaBlob, FallEvent, FallStatBucket, TelemetrySample
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from blog.forms import PostForm
 from django.contrib.auth.decorators import login_required, user_passes_test
-from rest_framework import viewsets
+from django.db.models import Count, F, Max, Sum, Window
+from django.db.models.functions import RowNumber
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAdminUser
-from blog.serializers import PostSerializer
+from rest_framework.response import Response
+from blog import profiling
+from blog.authentication import token_cache
+from blog.blobs import find_blob
+from blog.derivatives import FORMATS, ensure_derivative, is_valid_source
+from blog.serializers import (PostSerializer, PostListSerializer, FallEventSerializer, FallStatBucketSerializer,
+                              MediaBlobSerializer,
+                              TelemetryBatchSerializer, TelemetrySampleSerializer)
+
+
+def parse_datetime_param(params, name):
+    """쿼리 파라미터의 ISO 8601 시각 파싱 (없으면 None)"""
+    value = params.get(name)
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValidationError({name: 'ISO 8601 형식의 시각이 필요합니다.'})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_float_param(params, name):
+    """쿼리 파라미터의 실수 파싱 (없으면 None)"""
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValidationError({name: '숫자가 필요합니다.'})
+
+def post_list_etag(request, *args, **kwargs):
+    """
+    게시글 목록 응답 ETag (If-None-Match가 같으면 304)
+    게시글 추가/수정/삭제 시 최신 updated_at 또는 게시글 수가 바뀜
+    같은 데이터라도 페이지/필드/호스트/Accept가 다르면 응답이 다르므로 요청 URL과 Accept 포함
+    """
+    return post_list_etag_for(Post.objects.aggregate(**POST_LIST_STATE), request)
+
+
+# 목록 ETag 계산에 쓰는 집계 (blog/async_views.py는 aaggregate로 같은 값 사용)
+POST_LIST_STATE = {'updated': Max('updated_at'), 'count': Count('pk')}
+
+
+def post_list_etag_for(state, request):
+    key = '|'.join((str(state['updated']), str(state['count']),
+                    request.build_absolute_uri(), request.META.get('HTTP_ACCEPT', '')))
+    return hashlib.md5(key.encode()).hexdigest()
+
 
 class blogImage(viewsets.ModelViewSet):
     """
     REST API ViewSet - Admin 권한 필요
     GET(목록/상세): Admin만 가능
     POST(생성): Admin만 가능
+
+    목록은 경량 표현(PostListSerializer: id, title, published_date, fall_score, thumbnail),
+    상세(api_root/Post/<id>/)는 전체 표현(PostSerializer)
+    ?fields=a,b,... 를 지정하면 목록도 전체 표현에서 요청한 필드만 반환
+    목록은 ETag를 붙여 변경이 없으면 304, 주기적 새로고침은 증분 동기화(sync) 사용
     """
     queryset = Post.objects.all().order_by('-published_date')
     serializer_class = PostSerializer
     permission_classes = [IsAdminUser]  # Admin만 접근 가능
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'sync'):
+            queryset = queryset.select_related('fall_event')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'sync') and 'fields' not in self.request.query_params:
+            return PostListSerializer
+        return PostSerializer
+
+    @method_decorator(condition(etag_func=post_list_etag))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """
+        증분 동기화 (GET api_root/Post/sync/?since=<이전 응답의 next_since>)
+
+        since 이후 생성/수정된 게시글(updated_at 오름차순)과 삭제된 게시글 ID를 반환
+        응답: {'reset', 'next_since', 'has_more', 'posts', 'deleted'}
+            - reset=true: since가 없거나 삭제 기록 보존 기간보다 오래됨 → 목록 API로 전체를 다시 받은 뒤
+              이 응답의 next_since부터 동기화
+            - has_more=true: 변경이 SYNC_MAX_CHANGES개를 넘음 → next_since로 바로 다시 요청
+            - next_since는 SYNC_OVERLAP_SECONDS만큼 겹치므로 같은 게시글을 다시 받을 수 있음 (id 기준으로 덮어쓰기)
+        ?fields= 는 목록과 동일하게 적용
+        """
+        now = timezone.now()
+        since = parse_datetime_param(request.query_params, 'since')
+        watermark = now - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+        horizon = now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if since is None or since < horizon:
+            return Response({'reset': True, 'next_since': timezone.localtime(watermark).isoformat(),
+                             'has_more': False, 'posts': [], 'deleted': []})
+
+        limit = settings.SYNC_MAX_CHANGES
+        changed = self.get_queryset().filter(updated_at__gt=since).order_by('updated_at', 'pk')
+        posts = list(changed[:limit + 1])
+        has_more = len(posts) > limit
+        if has_more:
+            # 같은 updated_at이 페이지 경계에 걸치면 다음 요청(updated_at > next_since)에서 빠지므로 함께 반환
+            posts = posts[:limit]
+            last = posts[-1]
+            posts += list(changed.filter(updated_at=last.updated_at, pk__gt=last.pk))
+            watermark = min(watermark, last.updated_at)
+        deleted = (PostTombstone.objects.filter(deleted_at__gt=since)
+                   .order_by('post_id').values_list('post_id', flat=True).distinct())
+
+        serializer = self.get_serializer(posts, many=True)
+        return Response({
+            'reset': False,
+            # 게시글 시각 필드(PostSerializer)와 같은 형식 (현지 시각, 마이크로초 유지)
+            'next_since': timezone.localtime(max(since, watermark)).isoformat(),
+            'has_more': has_more,
+            'posts': serializer.data,
+            'deleted': list(deleted),
+        })
+
+
+class MediaBlobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    업로드 미디어 존재 확인 API - Admin 권한 필요
+    HEAD/GET api_root/Media/<sha256>/ : 서버에 있으면 200, 없으면 404
+    (Edge는 200이면 파일 대신 image_sha256/video_sha256만 전송)
+    """
+    queryset = MediaBlob.objects.all()
+    serializer_class = MediaBlobSerializer
+    permission_classes = [IsAdminUser]
+    lookup_field = 'sha256'
+    lookup_value_regex = '[0-9a-fA-F]{64}'
+
+    def get_object(self):
+        blob = find_blob(self.kwargs['sha256'].lower())
+        if blob is None:
+            raise NotFound()
+        return blob
+
+
+class FallEventViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    낙상 이벤트 조회 API - Admin 권한 필요
+    필터: camera_id, min_score, max_score, since, until (detected_at 기준)
+    정렬: ordering=detected_at|-detected_at|fall_score|-fall_score
+    모든 필터/정렬 조합은 FallEvent.Meta.indexes 의 인덱스로 처리됨
+    """
+    queryset = FallEvent.objects.select_related('post')
+    serializer_class = FallEventSerializer
+    permission_classes = [IsAdminUser]
+
+    ORDERING_FIELDS = ('detected_at', '-detected_at', 'fall_score', '-fall_score')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+
+        camera_id = params.get('camera_id')
+        if camera_id:
+            queryset = queryset.filter(camera_id=camera_id)
+
+        min_score = parse_float_param(params, 'min_score')
+        if min_score is not None:
+            queryset = queryset.filter(fall_score__gte=min_score)
+        max_score = parse_float_param(params, 'max_score')
+        if max_score is not None:
+            queryset = queryset.filter(fall_score__lte=max_score)
+
+        since = parse_datetime_param(params, 'since')
+        if since is not None:
+            queryset = queryset.filter(detected_at__gte=since)
+        until = parse_datetime_param(params, 'until')
+        if until is not None:
+            queryset = queryset.filter(detected_at__lt=until)
+
+        ordering = params.get('ordering', '-detected_at')
+        if ordering not in self.ORDERING_FIELDS:
+            raise ValidationError({'ordering': f'허용 값: {", ".join(self.ORDERING_FIELDS)}'})
+        # 같은 값일 때 페이지 경계가 흔들리지 않도록 pk로 보조 정렬
+        return queryset.order_by(ordering, '-pk')
+
+class FallStatViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    낙상 통계 API (FallStatBucket 롤업 조회) - Admin 권한 필요
+    파라미터:
+        granularity=hour|day (기본 day)
+        camera_id, since, until (bucket_start 기준)
+        group_by=camera (기본, 카메라별 버킷) | time (전체 카메라 합산)
+    예) 일별 카메라별 낙상 수: ?granularity=day
+        시간대별 평균 낙상 점수: ?granularity=hour&group_by=time
+    """
+    queryset = FallStatBucket.objects.all()
+    serializer_class = FallStatBucketSerializer
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+
+        granularity = params.get('granularity', FallStatBucket.DAY)
+        if granularity not in (FallStatBucket.HOUR, FallStatBucket.DAY):
+            raise ValidationError({'granularity': '허용 값: hour, day'})
+        queryset = queryset.filter(granularity=granularity)
+
+        camera_id = params.get('camera_id')
+        if camera_id:
+            queryset = queryset.filter(camera_id=camera_id)
+
+        since = parse_datetime_param(params, 'since')
+        if since is not None:
+            queryset = queryset.filter(bucket_start__gte=FallStatBucket.bucket_start_for(granularity, since))
+        until = parse_datetime_param(params, 'until')
+        if until is not None:
+            queryset = queryset.filter(bucket_start__lt=until)
+
+        return queryset.order_by('-bucket_start', 'camera_id')
+
+    def list(self, request, *args, **kwargs):
+        group_by = request.query_params.get('group_by', 'camera')
+        if group_by == 'camera':
+            return super().list(request, *args, **kwargs)
+        if group_by != 'time':
+            raise ValidationError({'group_by': '허용 값: camera, time'})
+
+        # 카메라 합산: 버킷 행만 다시 집계하므로 여전히 O(buckets)
+        rows = (self.get_queryset()
+                .values('granularity', 'bucket_start')
+                .annotate(fall_count=Sum('fall_count'), score_sum=Sum('score_sum'),
+                          score_max=Max('score_max'))
+                .order_by('-bucket_start'))
+        page = self.paginate_queryset(rows)
+        data = [{
+            'granularity': row['granularity'],
+            'camera_id': None,
+            'bucket_start': timezone.localtime(row['bucket_start']).isoformat(),
+            'fall_count': row['fall_count'],
+            'score_avg': row['score_sum'] / row['fall_count'] if row['fall_count'] else 0.0,
+            'score_max': row['score_max'],
+        } for row in (page if page is not None else rows)]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+class TelemetryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Edge 텔레메트리 API - Admin 권한 필요
+    POST: {'device_id': ..., 'samples': [...]} 배치 수신 (1분 버킷으로 병합 저장)
+    GET: device_id, resolution(초), since, until 필터
+    GET devices/: 장치별 최신 버킷 (어느 장치가 뒤처지는지 확인용)
+    """
+    queryset = TelemetrySample.objects.all()
+    serializer_class = TelemetrySampleSerializer
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+
+        device_id = params.get('device_id')
+        if device_id:
+            queryset = queryset.filter(device_id=device_id)
+
+        resolution = params.get('resolution')
+        if resolution:
+            try:
+                queryset = queryset.filter(resolution=int(resolution))
+            except ValueError:
+                raise ValidationError({'resolution': '초 단위 정수가 필요합니다.'})
+
+        since = parse_datetime_param(params, 'since')
+        if since is not None:
+            queryset = queryset.filter(bucket_start__gte=since)
+        until = parse_datetime_param(params, 'until')
+        if until is not None:
+            queryset = queryset.filter(bucket_start__lt=until)
+
+        return queryset.order_by('-bucket_start', 'device_id')
+
+    def create(self, request, *args, **kwargs):
+        serializer = TelemetryBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        device_id = serializer.validated_data['device_id']
+
+        for sample in serializer.validated_data['samples']:
+            timestamp = sample.pop('timestamp')
+            TelemetrySample.ingest(device_id, timestamp, sample, settings.TELEMETRY_RAW_RESOLUTION)
+
+        return Response({'device_id': device_id, 'accepted': len(serializer.validated_data['samples'])},
+                        status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def devices(self, request):
+        """장치별 최신 버킷 1개 (같은 시각이면 해상도가 작은 버킷, 장치 수와 관계없이 쿼리 1회)"""
+        samples = (TelemetrySample.objects
+                   .annotate(rank=Window(RowNumber(), partition_by='device_id',
+                                         order_by=[F('bucket_start').desc(), F('resolution').asc()]))
+                   .filter(rank=1)
+                   .order_by('device_id'))
+        return Response(TelemetrySampleSerializer(samples, many=True).data)
+
+@require_safe
+def image_derivative(request, size, fmt, name):
+    """
+    Post 이미지 파생본 제공 (없으면 생성)
+    URL이 원본 파일명을 포함하므로 내용이 바뀌지 않음 → immutable 장기 캐시
+    원본 미디어와 같이 인증 없이 접근 가능
+    """
+    if (size not in settings.IMAGE_DERIVATIVES or fmt not in settings.IMAGE_DERIVATIVE_FORMATS
+            or not is_valid_source(name)):
+        raise Http404
+    try:
+        derivative = ensure_derivative(name, size, fmt)
+    except OSError:  # 원본 없음 또는 이미지가 아님
+        raise Http404
+
+    response = FileResponse(default_storage.open(derivative, 'rb'), content_type=FORMATS[fmt][1])
+    response['Cache-Control'] = f'public, max-age={settings.IMAGE_DERIVATIVE_MAX_AGE}, immutable'
+    return response
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def request_metrics(request):
+    """
+    요청 프로파일링 집계 (blog/profiling.py, REQUEST_PROFILING_SAMPLE_RATE > 0 일 때만 수집)
+    엔드포인트별 전체/DB/직렬화/렌더링/템플릿 시간 히스토그램과 최근 느린 요청(SQL 포함)
+    + 토큰 인증 캐시 적중률과 토큰별 요청 수 (blog/authentication.py, 항상 수집)
+    DELETE: 집계 초기화
+    """
+    if request.method == 'DELETE':
+        profiling.registry.reset()
+        token_cache.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response({**profiling.registry.snapshot(), 'auth_token_cache': token_cache.stats()})
+
 # Admin 권한 체크 함수
 def is_admin(user):
     return user.is_authenticated and user.is_staff
@@ -46,7 +46,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.profiling.RequestProfilingMiddleware',  # 다른 미들웨어 시간도 포함하도록 맨 앞 (샘플링 꺼지면 제외됨)
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.CompressionMiddleware',  # 응답 본문을 바꾸는 미들웨어보다 앞에 위치
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -59,7 +61,7 @@ ROOT_URLCONF = 'mysite.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'blog.profiling.ProfiledDjangoTemplates',  # DjangoTemplates + 렌더링 시간 측정
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -82,6 +84,12 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 동시 쓰기(Edge 알림 생성) 시 읽기→쓰기 잠금 승격 충돌로 즉시 'database is locked'가 나지 않도록
+        # 쓰기 트랜잭션은 시작할 때 잠금을 잡고, 잠금 대기는 최대 20초
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -133,9 +141,13 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'blog.authentication.CachedTokenAuthentication',  # TokenAuthentication + 토큰 조회 캐시
         'rest_framework.authentication.SessionAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'blog.renderers.FastJSONRenderer',  # orjson이 없으면 DRF 기본 JSON 렌더러와 동일
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
@@ -148,4 +160,55 @@ CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels.layers.InMemoryChannelLayer'
     }
-}
\ No newline at end of file
+}
+
+# Edge 텔레메트리 시계열 설정
+TELEMETRY_RAW_RESOLUTION = 60  # 수신 샘플을 병합하는 버킷 크기 (초)
+TELEMETRY_ROLLUP_RESOLUTION = 3600  # 오래된 버킷을 합치는 버킷 크기 (초)
+TELEMETRY_RAW_RETENTION_HOURS = 48  # 1분 버킷 보존 기간
+TELEMETRY_RETENTION_DAYS = 30  # 1시간 버킷 보존 기간
+TELEMETRY_MAX_BATCH = 500  # 요청 하나에 허용하는 최대 샘플 수
+
+# Post 이미지 파생본 (blog/derivatives.py)
+IMAGE_DERIVATIVES = {
+    'thumb': {'size': (320, 240), 'quality': 70},  # 앱 목록 썸네일
+    'detail': {'size': (960, 720), 'quality': 82},  # 상세 화면 (원본보다 크게 늘리지 않음)
+}
+IMAGE_DERIVATIVE_FORMATS = ('webp', 'jpeg')  # WebP를 못 읽는 클라이언트는 JPEG 사용
+IMAGE_DERIVATIVE_SOURCE_DIRS = ('blog_image/',)  # 파생본을 만들 수 있는 원본 디렉토리
+IMAGE_DERIVATIVES_ON_UPLOAD = ('thumb',)  # 업로드 직후 미리 만드는 크기 (나머지는 첫 요청 시 생성)
+IMAGE_DERIVATIVE_MAX_AGE = 365 * 24 * 3600  # 파생본 Cache-Control max-age (초)
+
+# 응답 압축 (blog/middleware.py)
+RESPONSE_COMPRESSION_MIN_SIZE = 512  # 이보다 작은 응답은 압축하지 않음 (바이트)
+RESPONSE_COMPRESSION_TYPES = ('application/json', 'text/html', 'text/plain', 'text/css',
+                              'text/javascript', 'application/javascript', 'image/svg+xml')
+RESPONSE_BROTLI_QUALITY = 5  # 동적 응답용 (11은 너무 느림)
+
+# 토큰 인증 캐시 (blog/authentication.py)
+AUTH_TOKEN_CACHE_TTL = 60  # 캐시 유지 시간 (초, 다른 워커의 토큰/사용자 변경이 반영되기까지 최대 지연)
+AUTH_TOKEN_CACHE_SIZE = 1024  # 최대 캐시 토큰 수 (LRU)
+AUTH_TOKEN_RATE_WARN = 600  # 토큰 하나의 분당 요청 수가 이 값에 도달하면 경고 출력
+
+# 앱 증분 동기화 (api_root/Post/sync/)
+SYNC_MAX_CHANGES = 200  # 응답 하나에 담는 최대 변경 게시글 수 (넘으면 has_more)
+SYNC_OVERLAP_SECONDS = 5  # 진행 중이던 트랜잭션을 놓치지 않도록 워터마크를 이만큼 겹쳐서 반환
+SYNC_TOMBSTONE_RETENTION_DAYS = 30  # 삭제 기록 보존 기간 (이보다 오래된 워터마크는 전체 재동기화)
+
+# 오래된 낙상 영상 보관 (archive_media 명령)
+MEDIA_ARCHIVE_AFTER_DAYS = 90  # 이보다 오래된 게시글 영상을 보관 대상으로 처리
+MEDIA_ARCHIVE_DIR = 'archive'  # MEDIA_ROOT 기준 보관 디렉토리 (저가/대용량 디스크를 여기에 마운트)
+MEDIA_ARCHIVE_COMPRESSLEVEL = 6  # 번들(zip) 압축 수준 (mp4는 이미 압축되어 있어 효과가 작음)
+
+# 업로드 파일 SHA-256 계산 (blog/blobs.py, 내용 주소 저장으로 중복 업로드 제거)
+FILE_UPLOAD_HANDLERS = [
+    'blog.blobs.SHA256UploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# 요청 프로파일링 (blog/profiling.py, 집계는 Admin 전용 api_root/metrics/)
+REQUEST_PROFILING_SAMPLE_RATE = 0.0  # 프로파일링할 요청 비율 (0: 끔, 미들웨어 제외 / 1: 전체 요청)
+REQUEST_PROFILING_SLOW_MS = 500  # 이보다 오래 걸린 요청은 실행한 SQL과 함께 출력
+REQUEST_PROFILING_MAX_QUERIES = 50  # 느린 요청 기록에 남기는 최대 SQL 수 (쿼리 수는 전부 집계)
+REQUEST_PROFILING_RECENT_SLOW = 20  # api_root/metrics/ 에 보관하는 최근 느린 요청 수
@@ -0,0 +1,20 @@
+"""
+부하 테스트용 설정 (Edge_System/loadtest.py가 daphne를 띄울 때 사용)
+
+운영 DB/미디어를 건드리지 않도록 LOADTEST_DIR 아래의 별도 SQLite DB와 MEDIA_ROOT 사용
+
+    LOADTEST_DIR=/tmp/lt DJANGO_SETTINGS_MODULE=mysite.settings_loadtest python manage.py migrate
+    LOADTEST_DIR=/tmp/lt DJANGO_SETTINGS_MODULE=mysite.settings_loadtest daphne mysite.asgi:application
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+LOADTEST_DIR = os.environ['LOADTEST_DIR']
+
+# DEBUG의 쿼리 기록/오류 페이지 비용이 측정에 섞이지 않도록 끔
+DEBUG = False
+
+DATABASES['default']['NAME'] = os.path.join(LOADTEST_DIR, 'db.sqlite3')
+MEDIA_ROOT = os.path.join(LOADTEST_DIR, 'media')